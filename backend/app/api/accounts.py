@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import Account, Audience, MetricSnapshot
+from app.models import Account, Audience, LatestAudienceMetric, MetricSnapshot
 from app.schemas import AccountResponse, AccountList
 from app.utils.cache import (
     cache_get, cache_set, PREFIX_ACCOUNTS, TTL_ACCOUNTS, _make_key,
@@ -63,9 +63,9 @@ def get_sync_status(account_id: str, db: Session = Depends(get_db)):
 
     # Count audiences that have at least one 7d snapshot (needed for generate)
     audiences_with_data = (
-        db.query(sa_func.count(sa_func.distinct(MetricSnapshot.audience_id)))
+        db.query(sa_func.count(LatestAudienceMetric.audience_id))
         .join(Audience)
-        .filter(Audience.account_id == account_id, MetricSnapshot.window_days == 7)
+        .filter(Audience.account_id == account_id, LatestAudienceMetric.window_days == 7)
         .scalar() or 0
     )
 
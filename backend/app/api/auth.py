@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from app.config import get_settings
 from app.database import get_db
 from app.models import Account
+from app.services.graph_http import await_on_graph_loop, graph_async_transport
 from app.utils.crypto import encrypt_token
 from app.utils.cache import cache_invalidate_prefix, PREFIX_ACCOUNTS
 
@@ -41,15 +42,9 @@ def meta_login():
     return RedirectResponse(url=url)
 
 
-@router.get("/meta/callback")
-async def meta_callback(code: str | None = None, error: str | None = None, db: Session = Depends(get_db)):
-    """Exchange code for access token, get long-lived token, store account."""
-    if error:
-        raise HTTPException(status_code=400, detail=f"Meta OAuth error: {error}")
-    if not code:
-        raise HTTPException(status_code=400, detail="Missing code")
-
-    async with httpx.AsyncClient() as client:
+async def _exchange_code(code: str) -> tuple[str, int | None, list[dict]]:
+    """Trade the OAuth code for a long-lived token and list its ad accounts."""
+    async with httpx.AsyncClient(transport=graph_async_transport()) as client:
         # Exchange code for short-lived token
         r = await client.get(
             META_TOKEN_URL,
@@ -105,7 +100,19 @@ async def meta_callback(code: str | None = None, error: str | None = None, db: S
                 status_code=400,
                 detail="No ad accounts found for this user. Ensure ads_read and ads_management are granted.",
             )
-    # End httpx
+    return long_lived_token, expires_in, ad_accounts
+
+
+@router.get("/meta/callback")
+async def meta_callback(code: str | None = None, error: str | None = None, db: Session = Depends(get_db)):
+    """Exchange code for access token, get long-lived token, store account."""
+    if error:
+        raise HTTPException(status_code=400, detail=f"Meta OAuth error: {error}")
+    if not code:
+        raise HTTPException(status_code=400, detail="Missing code")
+
+    # The exchange runs on the shared Graph loop so it reuses the app-wide pool
+    long_lived_token, expires_in, ad_accounts = await await_on_graph_loop(_exchange_code(code))
 
     from datetime import datetime, timezone, timedelta
     token_expires_at = None
@@ -6,37 +6,41 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Account
-from app.services.ingestion import sync_account as run_sync
-from app.utils.cache import (
-    cache_invalidate_prefix,
-    PREFIX_AUDIENCES, PREFIX_RECOMMENDATIONS, PREFIX_BENCHMARKS, PREFIX_METRICS,
-)
+from app.services.sync_jobs import get_job, submit_sync
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ingestion", tags=["ingestion"])
 
 
-@router.post("/sync/{account_id}")
-async def sync_account(
+@router.post("/sync/{account_id}", status_code=202)
+def sync_account(
     account_id: str,
     date_preset: str = Query("last_7d", description="Meta date preset: last_7d, last_14d, last_30d, etc."),
+    incremental: bool | None = Query(
+        None,
+        description="Fetch only days missing since the last sync (date_preset is then the backfill window). "
+        "Defaults to the incremental_sync setting.",
+    ),
     db: Session = Depends(get_db),
 ):
-    """Pull ad set data from Meta API and store."""
+    """Queue a sync of ad set data from the Meta API and return the job.
+
+    If a sync for the account is already queued or running, that job is returned
+    (attached=true) and the new parameters are ignored. Poll GET /ingestion/jobs/{id}
+    for progress and the summary.
+    """
     account = db.query(Account).filter(Account.id == account_id).first()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
-    result = run_sync(account_id, db, date_preset=date_preset)
-    if "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
-
-    # Invalidate all data caches after fresh sync
-    total = 0
-    total += cache_invalidate_prefix(PREFIX_AUDIENCES)
-    total += cache_invalidate_prefix(PREFIX_RECOMMENDATIONS)
-    total += cache_invalidate_prefix(PREFIX_BENCHMARKS)
-    total += cache_invalidate_prefix(PREFIX_METRICS)
-    logger.info("Post-sync cache invalidation: %d keys cleared", total)
-
-    return result
+    job, attached = submit_sync(account_id, date_preset=date_preset, incremental=incremental)
+    return {**job.as_dict(), "attached": attached}
+
+
+@router.get("/jobs/{job_id}")
+def get_sync_job(job_id: str):
+    """Status, stage, insight chunks done and Graph API calls used by a sync job."""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job.as_dict()
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models import Account, Audience, MetricSnapshot, Recommendation
+from app.models import Account, Audience, LatestAudienceMetric, Recommendation
 from app.schemas import RecommendationResponse
 from app.utils.cache import (
     cache_get, cache_set, cache_invalidate_prefix,
@@ -51,18 +51,22 @@ def list_recommendations(
 @router.post("/generate")
 async def generate_recommendations(
     account_id: str = Query(..., description="Account ID"),
+    full: bool = Query(False, description="Re-evaluate every audience, even if its inputs are unchanged"),
     db: Session = Depends(get_db),
 ):
-    """Trigger recommendation generation (rules -> Claude), then return new recommendations."""
+    """
+    Trigger recommendation generation (rules -> Claude), then return the recommendations.
+    Unless full, audiences unchanged since their last recommendation keep it (carried_forward).
+    """
     account = db.query(Account).filter(Account.id == account_id).first()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
     # Check if there's enough data to generate
     audiences_with_data = (
-        db.query(sa_func.count(sa_func.distinct(MetricSnapshot.audience_id)))
+        db.query(sa_func.count(LatestAudienceMetric.audience_id))
         .join(Audience)
-        .filter(Audience.account_id == account_id, MetricSnapshot.window_days == 7)
+        .filter(Audience.account_id == account_id, LatestAudienceMetric.window_days == 7)
         .scalar() or 0
     )
     if audiences_with_data == 0:
@@ -73,7 +77,7 @@ async def generate_recommendations(
 
     from app.services.claude_analyzer import generate_recommendations_for_account
     try:
-        results = generate_recommendations_for_account(db, account_id)
+        results = generate_recommendations_for_account(db, account_id, incremental=False if full else None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -82,4 +86,8 @@ async def generate_recommendations(
     cache_invalidate_prefix(PREFIX_BENCHMARKS)
     cache_invalidate_prefix(PREFIX_METRICS)
 
-    return {"recommendations": results, "count": len(results)}
+    return {
+        "recommendations": results,
+        "count": len(results),
+        "carried_forward": sum(1 for r in results if r["carried_forward"]),
+    }
@@ -9,6 +9,7 @@ from app.config import get_settings
 from app.database import get_db
 from app.models import SettingsOverride
 from app.schemas import SettingsResponse, SettingsUpdate
+from app.services.effective_settings import invalidate_effective_settings
 from app.utils.cache import cache_get, cache_set, cache_invalidate_prefix, PREFIX_SETTINGS, TTL_SETTINGS
 
 logger = logging.getLogger(__name__)
@@ -90,12 +91,14 @@ def update_settings(payload: SettingsUpdate, db: Session = Depends(get_db)):
 
     current.update(update_data)
     row.overrides_json = json.dumps(current)
+    row.version = (row.version or 0) + 1
     db.commit()
 
-    logger.info(f"Settings updated: {list(update_data.keys())}")
+    logger.info(f"Settings updated (version {row.version}): {list(update_data.keys())}")
 
     # Invalidate cache
     cache_invalidate_prefix(PREFIX_SETTINGS)
+    invalidate_effective_settings()
 
     return _build_settings_response(db)
 
@@ -106,9 +109,11 @@ def reset_settings(db: Session = Depends(get_db)):
     row = db.query(SettingsOverride).filter(SettingsOverride.id == "global").first()
     if row:
         row.overrides_json = "{}"
+        row.version = (row.version or 0) + 1
         db.commit()
 
     cache_invalidate_prefix(PREFIX_SETTINGS)
+    invalidate_effective_settings()
     logger.info("Settings reset to defaults")
 
     return _build_settings_response(db)
@@ -20,12 +20,41 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./roas.db"
+    settings_version_poll_seconds: float = 5.0  # how often a process checks for settings changed by another worker
 
     # Meta
     meta_app_id: str = ""
     meta_app_secret: str = ""
     meta_redirect_uri: str = "http://localhost:8000/api/auth/meta/callback"
 
+    # --- Meta sync ---
+    meta_graph_base_url: str = "https://graph.facebook.com/v18.0"  # point at tools/graph_emulator.py to sync offline
+    meta_rate_limit_backoff_seconds: float = 60.0  # first backoff after error 4/17/32, doubled per retry
+    meta_async_fetch: bool = True  # fetch insights with httpx.AsyncClient
+    meta_batch_concurrency: int = 4  # batch chunks in flight at once (scaled down by usage)
+    meta_rate_burst: int = 3  # calls an ad account may make back-to-back before spacing applies
+    meta_batch_min_size: int = 5  # adaptive batch sizing never goes below this many sub-requests per call
+    meta_batch_target_seconds: float = 20.0  # batches slower than this shrink the next ones; fast ones grow them
+    meta_batch_timeout_seconds: float = 60.0
+    meta_batch_split_days: int = 25  # heavy ad sets (paginated or timed-out sub-responses) are fetched in pieces this long
+    sync_priority_spend_days: int = 7  # batch fetches go in order of stored spend over this many days
+    sync_priority_high_spend_share: float = 0.8  # "high" tier: the ad sets making up this share of that spend
+    incremental_sync: bool = True  # fetch only days missing since the last sync (date_preset = backfill)
+    sync_restatement_days: int = 3  # already-synced days re-requested, since Meta revises recent attribution
+    insights_fetch_mode: str = "batch"  # "batch": per-ad-set batch sub-requests, "account": one level=adset query
+    async_report_min_days: int = 31  # account mode: periods this long use an async report run
+    async_report_poll_seconds: float = 5.0
+    async_report_timeout_seconds: int = 900
+    sync_pipeline_depth: int = 2  # fetched insight chunks queued for the DB writer
+    sync_job_workers: int = 2  # background sync jobs running at once
+    sync_job_retention_minutes: int = 60  # how long finished jobs stay readable
+    scheduled_sync_workers: int = 4  # accounts synced in parallel by the scheduler
+    meta_http_max_connections: int = 20  # shared Graph connection pool (all syncs + OAuth)
+    meta_http_max_keepalive: int = 10  # idle connections kept open for reuse
+    meta_http_keepalive_seconds: float = 60.0
+    meta_http2: bool = False  # multiplex Graph requests over HTTP/2 (needs the h2 package)
+    meta_http_slow_request_seconds: float = 10.0  # log Graph requests slower than this
+
     # Anthropic
     anthropic_api_key: str = ""
 
@@ -66,6 +95,10 @@ class Settings(BaseSettings):
     # Custom: lower scale cap
     custom_max_scale_pct: int = 15
 
+    # --- Recommendation generation ---
+    recommendations_incremental: bool = True  # re-evaluate only audiences whose inputs changed since their last recommendation
+    recommendation_benchmark_tolerance: float = 0.02  # relative benchmark drift that doesn't count as a change
+
 
 @lru_cache
 def get_settings() -> Settings:
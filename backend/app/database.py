@@ -10,6 +10,8 @@ settings = get_settings()
 connect_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args["check_same_thread"] = False
+    # Concurrent account syncs write from several threads; wait for the lock instead of failing
+    connect_args["timeout"] = 30
 
 engine = create_engine(
     settings.database_url,
@@ -34,24 +36,46 @@ def get_db():
 
 
 def init_db():
-    """Create all tables and run lightweight migrations for new columns."""
+    """
+    Create missing tables, then bring the schema to the latest Alembic revision.
+    A new database gets every table and index from the models and is stamped at
+    head; an existing one is upgraded (from the baseline revision if it predates
+    Alembic).
+    """
+    from sqlalchemy import inspect
+    existing = inspect(engine)
+    had_daily_insights = existing.has_table("daily_insights")
+    fresh = not existing.has_table("audiences")
     Base.metadata.create_all(bind=engine)
-    _run_migrations()
+    _run_migrations(fresh)
+    if not had_daily_insights:
+        _reset_incremental_sync_markers()
 
 
-def _run_migrations():
-    """Add new columns to existing tables if they don't exist (SQLite-safe)."""
-    import logging
+def _alembic_config():
+    from pathlib import Path
+    from alembic.config import Config
+    backend_dir = Path(__file__).resolve().parent.parent
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "migrations"))
+    return config
+
+
+def _run_migrations(fresh: bool):
+    """Apply pending Alembic migrations (backend/migrations), or stamp a new database."""
+    from alembic import command
+    config = _alembic_config()
+    if fresh:
+        command.stamp(config, "head")
+    else:
+        command.upgrade(config, "head")
+
+
+def _reset_incremental_sync_markers():
+    """
+    daily_insights was just created: clear insights_synced_through so every audience
+    is backfilled into the fact table on its next sync instead of fetching a few days.
+    """
     from sqlalchemy import text
-    logger = logging.getLogger(__name__)
-    migrations = [
-        ("accounts", "last_synced_at", "DATETIME"),
-    ]
-    for table, column, col_type in migrations:
-        try:
-            with engine.begin() as conn:
-                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}"))
-            logger.info(f"Migration: added {table}.{column}")
-        except Exception:
-            # Column already exists — ignore
-            pass
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE audiences SET insights_synced_through = NULL"))
@@ -14,10 +14,15 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    from app.services.graph_http import start_graph_http, stop_graph_http
+    start_graph_http()
     from app.services.scheduler import start_scheduler
     scheduler = start_scheduler()
     yield
     scheduler.shutdown(wait=False)
+    from app.services.sync_jobs import shutdown_sync_jobs
+    shutdown_sync_jobs()
+    stop_graph_http()
 
 
 app = FastAPI(
@@ -55,6 +60,13 @@ def get_cache_stats():
     return cache_stats()
 
 
+@app.get("/api/graph/stats", tags=["graph"])
+def get_graph_stats():
+    """Return the shared Graph connection pool settings and request timings."""
+    from app.services.graph_http import graph_http_stats
+    return graph_http_stats()
+
+
 @app.post("/api/cache/clear", tags=["cache"])
 def clear_cache():
     """Clear the entire in-memory cache."""
@@ -3,16 +3,24 @@ from app.database import Base
 from app.models.account import Account
 from app.models.audience import Audience
 from app.models.metric_snapshot import MetricSnapshot
+from app.models.latest_audience_metric import LatestAudienceMetric
+from app.models.daily_insight import DailyInsight
 from app.models.recommendation import Recommendation
 from app.models.action_log import ActionLog
 from app.models.settings_override import SettingsOverride
+from app.models.sync_run import SyncRun
+from app.models.sync_checkpoint import SyncCheckpoint
 
 __all__ = [
     "Base",
     "Account",
     "Audience",
     "MetricSnapshot",
+    "LatestAudienceMetric",
+    "DailyInsight",
     "Recommendation",
     "ActionLog",
     "SettingsOverride",
+    "SyncRun",
+    "SyncCheckpoint",
 ]
@@ -22,6 +22,7 @@ class Account(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     audiences: Mapped[list["Audience"]] = relationship("Audience", back_populates="account", cascade="all, delete-orphan")
+    sync_runs: Mapped[list["SyncRun"]] = relationship("SyncRun", back_populates="account", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         return f"<Account {self.account_name or self.meta_account_id}>"
@@ -1,9 +1,9 @@
 """Audience (ad set) metadata."""
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +11,8 @@ from app.database import Base
 
 if TYPE_CHECKING:
     from app.models.account import Account
+    from app.models.daily_insight import DailyInsight
+    from app.models.latest_audience_metric import LatestAudienceMetric
     from app.models.metric_snapshot import MetricSnapshot
     from app.models.recommendation import Recommendation
 
@@ -29,6 +31,13 @@ class Audience(Base):
     current_budget: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2), nullable=True)
     campaign_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     campaign_name: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # Meta's effective_status and updated_time, and a hash of the targeting spec, as of
+    # the last sync (unchanged ad sets are not rewritten)
+    meta_status: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    meta_updated_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    targeting_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Last complete day whose daily insights are merged into history (incremental sync)
+    insights_synced_through: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -36,6 +45,12 @@ class Audience(Base):
     metric_snapshots: Mapped[list["MetricSnapshot"]] = relationship(
         "MetricSnapshot", back_populates="audience", cascade="all, delete-orphan", order_by="MetricSnapshot.snapshot_date"
     )
+    latest_metrics: Mapped[list["LatestAudienceMetric"]] = relationship(
+        "LatestAudienceMetric", back_populates="audience", cascade="all, delete-orphan",
+    )
+    daily_insights: Mapped[list["DailyInsight"]] = relationship(
+        "DailyInsight", back_populates="audience", cascade="all, delete-orphan",
+    )
     recommendations: Mapped[list["Recommendation"]] = relationship(
         "Recommendation", back_populates="audience", cascade="all, delete-orphan",
         order_by="Recommendation.generated_at",
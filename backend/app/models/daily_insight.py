@@ -0,0 +1,31 @@
+"""Raw per-day delivery facts per audience (source of truth for metric windows)."""
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.audience import Audience
+
+
+class DailyInsight(Base):
+    __tablename__ = "daily_insights"
+
+    audience_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("audiences.id", ondelete="CASCADE"), primary_key=True
+    )
+    insight_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    spend: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0)
+    purchases: Mapped[int] = mapped_column(default=0)
+    clicks: Mapped[int] = mapped_column(default=0)
+    impressions: Mapped[int] = mapped_column(default=0)
+
+    audience: Mapped["Audience"] = relationship("Audience", back_populates="daily_insights")
+
+    def __repr__(self) -> str:
+        return f"<DailyInsight audience={self.audience_id} date={self.insight_date}>"
@@ -0,0 +1,42 @@
+"""Latest snapshot per audience and window, kept current by ingestion."""
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Date, ForeignKey, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.audience import Audience
+
+
+class LatestAudienceMetric(Base):
+    """
+    Copy of each audience's newest MetricSnapshot per window, so scoring and dashboard
+    reads cost one row per audience however much snapshot history is kept.
+    """
+    __tablename__ = "latest_audience_metrics"
+
+    audience_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("audiences.id", ondelete="CASCADE"), primary_key=True
+    )
+    window_days: Mapped[int] = mapped_column(primary_key=True)  # 1, 3, 7, 14 or 30
+    snapshot_id: Mapped[str] = mapped_column(String(36))  # MetricSnapshot copied
+    snapshot_date: Mapped[date] = mapped_column(Date)
+    spend: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0)
+    purchases: Mapped[int] = mapped_column(default=0)
+    impressions: Mapped[int] = mapped_column(default=0)
+    clicks: Mapped[int] = mapped_column(default=0)
+    ctr: Mapped[Optional[float]] = mapped_column(Numeric(8, 6), nullable=True)
+    cpc: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4), nullable=True)
+    roas: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4), nullable=True)
+    cpa: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2), nullable=True)
+    cvr: Mapped[Optional[float]] = mapped_column(Numeric(8, 6), nullable=True)
+
+    audience: Mapped["Audience"] = relationship("Audience", back_populates="latest_metrics")
+
+    def __repr__(self) -> str:
+        return f"<LatestAudienceMetric audience={self.audience_id} window={self.window_days}d date={self.snapshot_date}>"
@@ -3,7 +3,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -15,9 +15,15 @@ if TYPE_CHECKING:
 
 class MetricSnapshot(Base):
     __tablename__ = "metric_snapshots"
+    __table_args__ = (
+        # One row per audience, date and window — target of the ingestion upsert
+        Index("uq_metric_snapshots_audience_date_window", "audience_id", "snapshot_date", "window_days", unique=True),
+        # Latest snapshot of a window per audience: equality on both, newest date first
+        Index("ix_metric_snapshots_audience_window_date", "audience_id", "window_days", "snapshot_date"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    audience_id: Mapped[str] = mapped_column(String(36), ForeignKey("audiences.id", ondelete="CASCADE"), index=True)
+    audience_id: Mapped[str] = mapped_column(String(36), ForeignKey("audiences.id", ondelete="CASCADE"))
     snapshot_date: Mapped[date] = mapped_column(Date, index=True)
     window_days: Mapped[int] = mapped_column()  # 1, 3, or 7
     spend: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0)
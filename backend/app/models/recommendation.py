@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, Numeric, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -15,9 +15,14 @@ if TYPE_CHECKING:
 
 class Recommendation(Base):
     __tablename__ = "recommendations"
+    __table_args__ = (
+        # Latest recommendation per audience (priority ordering, SCALE cooldown) and the
+        # account list, which reads each audience's recommendations from it
+        Index("ix_recommendations_audience_generated", "audience_id", "generated_at"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    audience_id: Mapped[str] = mapped_column(String(36), ForeignKey("audiences.id", ondelete="CASCADE"), index=True)
+    audience_id: Mapped[str] = mapped_column(String(36), ForeignKey("audiences.id", ondelete="CASCADE"))
     action: Mapped[str] = mapped_column(String(32))  # SCALE, HOLD, PAUSE, RETEST
     scale_percentage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     confidence: Mapped[str] = mapped_column(String(16))  # HIGH, MEDIUM, LOW
@@ -27,6 +32,10 @@ class Recommendation(Base):
     reasons: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # list of strings
     risks: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)  # list of strings
     metrics_snapshot: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Change tracking (recommendation_changes): hash of the audience's inputs and the
+    # account benchmarks the recommendation was made with
+    input_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    benchmarks: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     generated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     audience: Mapped["Audience"] = relationship("Audience", back_populates="recommendations")
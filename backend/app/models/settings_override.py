@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -14,9 +14,11 @@ class SettingsOverride(Base):
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default="global")
     overrides_json: Mapped[str] = mapped_column(Text, default="{}")
+    # Bumped on every change, so each process knows when to reload its settings snapshot
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     def __repr__(self) -> str:
-        return f"<SettingsOverride updated_at={self.updated_at}>"
+        return f"<SettingsOverride v{self.version} updated_at={self.updated_at}>"
@@ -0,0 +1,27 @@
+"""Ad sets a sync run has merged (one row per committed chunk) or must retry."""
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.sync_run import SyncRun
+
+
+class SyncCheckpoint(Base):
+    __tablename__ = "sync_checkpoints"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    sync_run_id: Mapped[str] = mapped_column(String(36), ForeignKey("sync_runs.id", ondelete="CASCADE"), index=True)
+    kind: Mapped[str] = mapped_column(String(16))  # done, retry
+    ad_set_ids: Mapped[list] = mapped_column(JSON)  # Meta ad set IDs
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    sync_run: Mapped["SyncRun"] = relationship("SyncRun", back_populates="checkpoints")
+
+    def __repr__(self) -> str:
+        return f"<SyncCheckpoint run={self.sync_run_id} {self.kind} ({len(self.ad_set_ids)} ad sets)>"
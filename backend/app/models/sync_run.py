@@ -0,0 +1,40 @@
+"""One sync of an ad account, kept so an interrupted sync can resume where it stopped."""
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+if TYPE_CHECKING:
+    from app.models.account import Account
+    from app.models.sync_checkpoint import SyncCheckpoint
+
+
+class SyncRun(Base):
+    __tablename__ = "sync_runs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("accounts.id", ondelete="CASCADE"), index=True)
+    status: Mapped[str] = mapped_column(String(16))  # running, succeeded, partial, failed, abandoned
+    date_preset: Mapped[str] = mapped_column(String(32))
+    fetch_mode: Mapped[str] = mapped_column(String(16))  # batch, account
+    incremental: Mapped[bool] = mapped_column(Boolean, default=False)
+    fetch_until: Mapped[date] = mapped_column(Date)  # last complete day the run fetches up to
+    attempts: Mapped[int] = mapped_column(Integer, default=1)
+    ad_sets_planned: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_done: Mapped[int] = mapped_column(Integer, default=0)
+    summary: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    account: Mapped["Account"] = relationship("Account", back_populates="sync_runs")
+    checkpoints: Mapped[list["SyncCheckpoint"]] = relationship(
+        "SyncCheckpoint", back_populates="sync_run", cascade="all, delete-orphan",
+    )
+
+    def __repr__(self) -> str:
+        return f"<SyncRun {self.id} account={self.account_id} status={self.status}>"
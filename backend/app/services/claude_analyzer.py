@@ -1,5 +1,6 @@
 """Analysis layer: rule-based explanations (no AI needed), with optional Claude upgrade."""
 import json
+import logging
 import uuid
 from typing import Any, Optional
 
@@ -7,6 +8,13 @@ from app.config import get_settings
 from app.models import ActionLog, Audience, Recommendation
 from app.services.rules import run_rules_for_audience
 from app.services.effective_settings import get_effective_settings
+from app.services.recommendation_changes import (
+    audience_input_hashes,
+    benchmark_values,
+    unchanged_recommendations,
+)
+
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
@@ -232,18 +240,63 @@ def _analyze_with_claude(rule_output: dict, audience: Audience, age_days: int, s
         return None  # Fall back to rule-based
 
 
-def generate_recommendations_for_account(db, account_id: str) -> list[dict]:
+def _recommendation_dict(rec, audience: Audience, carried_forward: bool) -> dict:
+    return {
+        "id": rec.id,
+        "audience_id": rec.audience_id,
+        "audience_name": audience.name,
+        "audience_type": audience.audience_type,
+        "action": rec.action,
+        "scale_percentage": rec.scale_percentage,
+        "confidence": rec.confidence,
+        "performance_bucket": rec.performance_bucket,
+        "trend_state": rec.trend_state,
+        "composite_score": float(rec.composite_score) if rec.composite_score else None,
+        "reasons": rec.reasons,
+        "risks": rec.risks,
+        "metrics_snapshot": rec.metrics_snapshot,
+        "generated_at": rec.generated_at.isoformat() if rec.generated_at else None,
+        "carried_forward": carried_forward,
+    }
+
+
+def generate_recommendations_for_account(db, account_id: str, incremental: Optional[bool] = None) -> list[dict]:
     """
     Run rules for account, then Claude for each, save Recommendation rows, return list of recommendation dicts.
+    Incremental (recommendations_incremental unless given): audiences whose inputs,
+    benchmarks and time-based rule inputs are unchanged since their last
+    recommendation (recommendation_changes) are not re-evaluated; that recommendation is returned with carried_forward=True
+    and no new rows are written for it.
     """
-    from app.services.rules import run_rules_for_account
+    from app.services.metrics import get_account_benchmarks, get_account_time_based_metrics
+    from app.services.rules import RuleContext, run_rules_for_account
     from app.models import Recommendation as RecModel
 
-    rule_results = run_rules_for_account(db, account_id)
+    context = RuleContext.for_account(db, account_id)
+    settings = context.settings
+    if incremental is None:
+        incremental = settings.recommendations_incremental
+    audiences = context.audiences
+    benchmarks = get_account_benchmarks(db, account_id)
+    trends = get_account_time_based_metrics(db, account_id)
+    input_hashes = audience_input_hashes(db, audiences, settings, trends)
+    unchanged = {}
+    if incremental:
+        unchanged = unchanged_recommendations(db, context, input_hashes, benchmark_values(benchmarks))
+    rule_results = {
+        rr["audience_id"]: rr
+        for rr in run_rules_for_account(
+            db, account_id, audience_ids={a.id for a in audiences} - set(unchanged), account_benchmarks=benchmarks,
+            trends=trends,
+        )
+    }
     out = []
-    for rr in rule_results:
-        audience = db.query(Audience).filter(Audience.id == rr["audience_id"]).first()
-        if not audience:
+    for audience in audiences:
+        if audience.id in unchanged:
+            out.append(_recommendation_dict(unchanged[audience.id], audience, carried_forward=True))
+            continue
+        rr = rule_results.get(audience.id)
+        if not rr:
             continue
         claude_result = analyze_one(db, rr, audience)
         action = claude_result.get("action") or rr["action"]
@@ -258,9 +311,8 @@ def generate_recommendations_for_account(db, account_id: str) -> list[dict]:
             "clicks": metrics.get("clicks"),
             "impressions": metrics.get("impressions"),
         }
-        rec_id = str(uuid.uuid4())
         rec = RecModel(
-            id=rec_id,
+            id=str(uuid.uuid4()),
             audience_id=rr["audience_id"],
             action=action,
             scale_percentage=claude_result.get("scale_percentage") or rr.get("scale_percentage"),
@@ -271,6 +323,8 @@ def generate_recommendations_for_account(db, account_id: str) -> list[dict]:
             reasons=claude_result.get("reasons") or [],
             risks=claude_result.get("risks") or [],
             metrics_snapshot=metrics_snapshot,
+            input_hash=input_hashes[audience.id],
+            benchmarks=benchmark_values(benchmarks),
         )
         db.add(rec)
         action_log = ActionLog(
@@ -284,21 +338,10 @@ def generate_recommendations_for_account(db, account_id: str) -> list[dict]:
         )
         db.add(action_log)
         db.flush()
-        out.append({
-            "id": rec_id,
-            "audience_id": rr["audience_id"],
-            "audience_name": rr.get("audience_name"),
-            "audience_type": rr.get("audience_type"),
-            "action": action,
-            "scale_percentage": rec.scale_percentage,
-            "confidence": rec.confidence,
-            "performance_bucket": rec.performance_bucket,
-            "trend_state": rec.trend_state,
-            "composite_score": float(rec.composite_score) if rec.composite_score else None,
-            "reasons": rec.reasons,
-            "risks": rec.risks,
-            "metrics_snapshot": metrics_snapshot,
-            "generated_at": rec.generated_at.isoformat() if rec.generated_at else None,
-        })
+        out.append(_recommendation_dict(rec, audience, carried_forward=False))
     db.commit()
+    logger.info(
+        f"Recommendations for account {account_id}: {len(out) - len(unchanged)} generated, "
+        f"{len(unchanged)} carried forward"
+    )
     return out
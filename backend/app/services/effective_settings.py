@@ -1,6 +1,10 @@
 """Load effective settings (env defaults merged with DB overrides)."""
+import hashlib
 import json
 import logging
+import threading
+import time
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
@@ -22,32 +26,81 @@ _SETTINGS_FIELDS = [
 
 
 class EffectiveSettings:
-    """Settings object that behaves like config.Settings but with DB overrides applied."""
+    """
+    Immutable snapshot of config.Settings with DB overrides applied. Every value is
+    materialized as a plain attribute when the snapshot is built.
+    """
 
-    def __init__(self, base_settings, overrides: dict):
-        self._base = base_settings
-        self._overrides = overrides
+    def __init__(self, base_settings, overrides: dict, version: int = 0):
+        values = base_settings.model_dump()
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "version", version)
 
-    def __getattr__(self, name: str):
-        if name.startswith("_"):
-            return super().__getattribute__(name)
-        if name in self._overrides and self._overrides[name] is not None:
-            return self._overrides[name]
-        return getattr(self._base, name)
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("EffectiveSettings is read-only; change settings through the settings API")
 
 
-def get_effective_settings(db: Session) -> EffectiveSettings:
-    """Load env defaults merged with DB overrides. Use this in services instead of get_settings()."""
+# Process-wide snapshot. Settings changes bump settings_overrides.version: this process
+# drops its snapshot at once (invalidate_effective_settings), other worker processes
+# notice the new version within settings_version_poll_seconds.
+_lock = threading.Lock()
+_snapshot: Optional[EffectiveSettings] = None
+_checked_at = 0.0
+
+
+def _load(db: Session) -> EffectiveSettings:
     from app.models import SettingsOverride
 
     base = get_settings()
     try:
         row = db.query(SettingsOverride).filter(SettingsOverride.id == "global").first()
-        if row and row.overrides_json:
-            overrides = json.loads(row.overrides_json)
-        else:
-            overrides = {}
+        overrides = json.loads(row.overrides_json) if row and row.overrides_json else {}
+        version = (row.version or 0) if row else 0
     except Exception:
-        overrides = {}
+        overrides, version = {}, 0
+    return EffectiveSettings(base, overrides, version)
+
+
+def _stored_version(db: Session) -> Optional[int]:
+    from app.models import SettingsOverride
+
+    try:
+        return db.query(SettingsOverride.version).filter(SettingsOverride.id == "global").scalar() or 0
+    except Exception:
+        return None
+
+
+def get_effective_settings(db: Session) -> EffectiveSettings:
+    """
+    Env defaults merged with DB overrides. Use this in services instead of get_settings().
+    Returns the process-wide snapshot; the DB is only read to check its version, at
+    most every settings_version_poll_seconds, and to reload it after a change.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _checked_at < get_settings().settings_version_poll_seconds:
+        return snapshot
+    with _lock:
+        if _snapshot is not None and _stored_version(db) == _snapshot.version:
+            _checked_at = now
+            return _snapshot
+        _snapshot = _load(db)
+        _checked_at = now
+        return _snapshot
+
+
+def invalidate_effective_settings() -> None:
+    """Drop this process's snapshot (after changing overrides); the next call reloads it."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
 
-    return EffectiveSettings(base, overrides)
+def settings_fingerprint(settings) -> str:
+    """Hash of the configurable thresholds and whether Claude analysis is on."""
+    values = {name: getattr(settings, name) for name in _SETTINGS_FIELDS}
+    values["claude_analysis"] = bool(settings.anthropic_api_key)
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
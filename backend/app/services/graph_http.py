@@ -0,0 +1,233 @@
+"""App-scoped HTTP transports for Graph API traffic.
+
+start_graph_http() (FastAPI lifespan) opens one connection pool for blocking clients
+and one for async clients, sized by the meta_http_* settings. Every sync builds its
+httpx client on these shared transports, so scheduled and on-demand syncs reuse warm
+keep-alive connections instead of a TLS handshake and a cold pool per sync. An async
+pool belongs to the event loop that uses it, so async Graph work (async syncs, the
+OAuth callback) runs on one background loop owned by this module, via
+run_graph_coroutine() or await_on_graph_loop(). Only Graph I/O runs on that loop:
+coroutines hand blocking work (database stages) to asyncio.to_thread, so one sync
+waiting on a database lock does not stall every other sync's fetches.
+
+Each request's time to response headers is recorded per endpoint kind
+(graph_http_stats(), served at GET /api/graph/stats); requests slower than
+meta_http_slow_request_seconds are logged.
+
+Without start_graph_http() (CLI tools, scripts) the helpers fall back to what each
+caller did before: a client-owned pool, and asyncio.run() for async syncs.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Optional
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_transport: Optional[httpx.HTTPTransport] = None
+_async_transport: Optional[httpx.AsyncHTTPTransport] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+
+_timings_lock = threading.Lock()
+_timings: dict[str, dict] = {}
+
+
+# ── Per-request timing ───────────────────────────────────────────
+
+
+def _endpoint_kind(request: httpx.Request) -> str:
+    """Coarse endpoint label: batch, insights, adsets, access_token, ... or object."""
+    segments = [s for s in request.url.path.split("/") if s]
+    if segments and segments[0].startswith("v") and segments[0][1:2].isdigit():
+        segments = segments[1:]
+    if not segments:
+        return "batch" if request.method == "POST" else "root"
+    last = segments[-1]
+    if last.isdigit() or last.startswith("act_"):
+        return "object"
+    return last
+
+
+def _record(request: httpx.Request, seconds: float, failed: bool) -> None:
+    kind = _endpoint_kind(request)
+    with _timings_lock:
+        entry = _timings.get(kind)
+        if entry is None:
+            entry = _timings[kind] = {"count": 0, "failed": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        entry["count"] += 1
+        entry["failed"] += failed
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+    if seconds >= get_settings().meta_http_slow_request_seconds:
+        logger.warning(f"Slow Graph request: {request.method} {kind} took {seconds:.1f}s")
+
+
+def graph_http_stats() -> dict:
+    """Pool settings and request timings per endpoint kind since startup."""
+    settings = get_settings()
+    with _timings_lock:
+        endpoints = {
+            kind: {
+                "count": entry["count"],
+                "failed": entry["failed"],
+                "avg_ms": round(entry["total_seconds"] / entry["count"] * 1000, 1) if entry["count"] else None,
+                "max_ms": round(entry["max_seconds"] * 1000, 1),
+            }
+            for kind, entry in _timings.items()
+        }
+    return {
+        "shared_pool": _transport is not None,
+        "max_connections": settings.meta_http_max_connections,
+        "max_keepalive": settings.meta_http_max_keepalive,
+        "keepalive_seconds": settings.meta_http_keepalive_seconds,
+        "http2": _http2_enabled(log=False),
+        "endpoints": endpoints,
+    }
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Times requests on the shared pool. close() leaves the pool open for other clients."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self._transport.handle_request(request)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            _record(request, time.perf_counter() - start, failed)
+
+    def close(self) -> None:
+        pass
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async twin of _SharedTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = await self._transport.handle_async_request(request)
+            failed = response.status_code >= 400
+            return response
+        finally:
+            _record(request, time.perf_counter() - start, failed)
+
+    async def aclose(self) -> None:
+        pass
+
+
+# ── Lifecycle ────────────────────────────────────────────────────
+
+
+def _http2_enabled(log: bool = True) -> bool:
+    if not get_settings().meta_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if log:
+            logger.warning("meta_http2 is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def start_graph_http() -> None:
+    """Open the shared pools and the Graph event loop (idempotent)."""
+    global _transport, _async_transport, _loop, _loop_thread
+    with _lock:
+        if _transport is not None:
+            return
+        settings = get_settings()
+        limits = httpx.Limits(
+            max_connections=settings.meta_http_max_connections,
+            max_keepalive_connections=settings.meta_http_max_keepalive,
+            keepalive_expiry=settings.meta_http_keepalive_seconds,
+        )
+        http2 = _http2_enabled()
+        _transport = httpx.HTTPTransport(limits=limits, http2=http2)
+        _async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        _loop = asyncio.new_event_loop()
+        _loop_thread = threading.Thread(target=_loop.run_forever, name="graph-http", daemon=True)
+        _loop_thread.start()
+    logger.info(
+        f"Graph HTTP pool: {settings.meta_http_max_connections} connections, "
+        f"{settings.meta_http_max_keepalive} keep-alive ({settings.meta_http_keepalive_seconds:.0f}s), "
+        f"http2={http2}"
+    )
+
+
+def stop_graph_http() -> None:
+    """Close the shared pools and stop the Graph event loop."""
+    global _transport, _async_transport, _loop, _loop_thread
+    with _lock:
+        transport, async_transport, loop, thread = _transport, _async_transport, _loop, _loop_thread
+        _transport = _async_transport = _loop = _loop_thread = None
+    if transport is None:
+        return
+    transport.close()
+    try:
+        asyncio.run_coroutine_threadsafe(async_transport.aclose(), loop).result(timeout=10)
+    except Exception as e:
+        logger.warning(f"Closing the async Graph pool failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=10)
+    loop.close()
+
+
+# ── Access ───────────────────────────────────────────────────────
+
+
+def graph_transport() -> Optional[httpx.BaseTransport]:
+    """The shared blocking pool for a new httpx.Client, or None before startup."""
+    transport = _transport
+    return _SharedTransport(transport) if transport is not None else None
+
+
+def graph_async_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """The shared async pool for a new httpx.AsyncClient, when called on the Graph loop."""
+    transport, loop = _async_transport, _loop
+    if transport is None:
+        return None
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _SharedAsyncTransport(transport) if running is loop else None
+
+
+def run_graph_coroutine(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine on the Graph loop from a worker thread and wait for its result."""
+    loop = _loop
+    if loop is None:
+        return asyncio.run(coro)
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_graph_coroutine() would deadlock on the Graph loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def await_on_graph_loop(coro: Awaitable[Any]) -> Any:
+    """Await a coroutine on the Graph loop from another event loop (e.g. a request handler)."""
+    loop = _loop
+    if loop is None:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
@@ -1,23 +1,41 @@
 """Pull ad set data from Meta API and store in DB."""
+import asyncio
+import hashlib
+import json
 import logging
+import queue
+import threading
 import uuid
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from typing import Awaitable, Callable, Iterable, Optional
 
 import httpx
+import numpy as np
+from sqlalchemy import case, func, or_, select
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
-from app.models import Account, Audience, MetricSnapshot
+from app.config import get_settings
+from app.models import Account, Audience, DailyInsight, LatestAudienceMetric, MetricSnapshot, Recommendation
 from app.services.meta_client import (
     get_ad_sets,
+    get_ad_sets_async,
     _batch_insights,
-    aggregate_windows_from_rows,
+    _batch_insights_async,
+    get_account_insights,
+    get_account_insights_async,
+    preset_since,
     infer_audience_type,
     _ensure_act_prefix,
     get_sync_lock,
 )
+from app.services.graph_http import graph_async_transport, graph_transport, run_graph_coroutine
+from app.services.insight_columns import latest_by_day, metrics_from_sums, parse_insight_chunk
+from app.services.sync_progress import SyncProgress, client_event_hooks
+from app.services.sync_runs import add_checkpoint, begin_sync_run, end_sync_run
+from app.utils.bulk import upsert_from_select, upsert_rows
 from app.utils.crypto import decrypt_token
 
 # Valid Meta date presets
@@ -28,19 +46,45 @@ VALID_DATE_PRESETS = {
 }
 
 
-def _parse_launched_at(ad_set_data: dict) -> datetime | None:
-    ct = ad_set_data.get("created_time")
-    if not ct:
+def _parse_graph_time(value) -> datetime | None:
+    """Parse a Graph timestamp such as 2024-05-01T10:00:00+0000 (aware datetime)."""
+    if not value:
         return None
-    if isinstance(ct, datetime):
-        return ct.replace(tzinfo=timezone.utc) if ct.tzinfo is None else ct
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+    try:
+        # Graph's own format; dateutil (slow) only for anything else
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+    except (TypeError, ValueError):
+        pass
     from dateutil import parser
     try:
-        return parser.parse(ct)
+        return parser.parse(value)
     except Exception:
         return None
 
 
+def _parse_launched_at(ad_set_data: dict) -> datetime | None:
+    return _parse_graph_time(ad_set_data.get("created_time"))
+
+
+def _targeting_hash(ad_set_data: dict) -> str:
+    """Stable hash of the ad set's targeting spec (key order does not matter)."""
+    targeting = json.dumps(ad_set_data.get("targeting") or {}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(targeting.encode()).hexdigest()
+
+
+def _same_instant(a: datetime | None, b: datetime | None) -> bool:
+    """Compare timestamps whether or not the DB handed them back tz-aware (naive = UTC)."""
+    if a is None or b is None:
+        return a is b
+    if a.tzinfo is not None:
+        a = a.astimezone(timezone.utc).replace(tzinfo=None)
+    if b.tzinfo is not None:
+        b = b.astimezone(timezone.utc).replace(tzinfo=None)
+    return a == b
+
+
 def _budget_from_ad_set(ad_set_data: dict) -> Decimal | None:
     b = ad_set_data.get("daily_budget")
     if b is None:
@@ -51,16 +95,33 @@ def _budget_from_ad_set(ad_set_data: dict) -> Decimal | None:
         return None
 
 
-def sync_account(account_id: str, db: Session, date_preset: str = "last_7d") -> dict:
+def sync_account(
+    account_id: str,
+    db: Session,
+    date_preset: str = "last_7d",
+    incremental: Optional[bool] = None,
+    transport: Optional[httpx.BaseTransport] = None,
+    progress: Optional[SyncProgress] = None,
+) -> dict:
     """
     Sync ad sets and insights for an account.
-    Uses batch API to fetch insights for all ad sets in chunks of 50, then
-    aggregates into 1d/3d/7d windows locally.
-    date_preset: controls how far back to fetch (default last_7d).
+    Uses batch API to fetch daily insights for all ad sets in chunks of 50 (or one
+    level=adset account query with insights_fetch_mode="account"), upserts
+    them into daily_insights and derives 1/3/7/14/30-day window snapshots from it. With meta_async_fetch enabled the
+    chunks are dispatched concurrently over an httpx.AsyncClient.
+    date_preset: controls how far back to fetch (default last_7d). In incremental
+    mode (default: incremental_sync setting) it is only the backfill window for ad
+    sets with no merged history; the rest fetch just the days since their last sync.
+    transport: optional httpx transport for the Graph clients (e.g. the fixture
+    replay in tools/graph_fixtures.py).
+    progress: optional SyncProgress updated with the stage, insight chunks and Graph
+    calls as the sync runs (see sync_jobs.py).
     Returns summary dict.
     """
     if date_preset not in VALID_DATE_PRESETS:
         date_preset = "last_7d"
+    if incremental is None:
+        incremental = get_settings().incremental_sync
 
     # Prevent concurrent syncs on the same account
     lock = get_sync_lock(account_id)
@@ -69,25 +130,134 @@ def sync_account(account_id: str, db: Session, date_preset: str = "last_7d") ->
         return {"error": "Sync already in progress for this account. Please wait."}
 
     try:
-        return _do_sync(account_id, db, date_preset)
+        if get_settings().meta_async_fetch:
+            return run_graph_coroutine(_do_sync_async(account_id, db, date_preset, incremental, transport, progress))
+        return _do_sync(account_id, db, date_preset, incremental, transport, progress)
     finally:
         lock.release()
 
 
-def _do_sync(account_id: str, db: Session, date_preset: str) -> dict:
-    """Internal sync implementation."""
+def _new_summary(incremental: bool) -> dict:
+    return {
+        "mode": "incremental" if incremental else "full",
+        "audiences_created": 0,
+        "audiences_updated": 0,
+        "audiences_unchanged": 0,
+        "ad_sets_idle": 0,
+        "ad_sets_resumed": 0,
+        "priority_tiers": {},
+        "priority_tier_covered": None,
+        "snapshots_created": 0,
+        "days_merged": 0,
+        "errors": [],
+    }
+
+
+def _load_account(db: Session, account_id: str) -> Optional[tuple[Account, str, str]]:
+    """(account, access token, act_-prefixed Meta account ID), or None if unknown."""
     account = db.query(Account).filter(Account.id == account_id).first()
     if not account:
+        return None
+    return account, decrypt_token(account.access_token), _ensure_act_prefix(account.meta_account_id)
+
+
+def _plan_fetch(
+    db: Session,
+    account_id: str,
+    ad_sets_data: list[dict],
+    date_preset: str,
+    incremental: bool,
+    summary: dict,
+    progress: Optional[SyncProgress],
+) -> dict:
+    """
+    Steps 2-3 up to the insights fetch (DB work only): upsert audiences, pick the ad
+    sets that can have delivered in their range (idle ones are merged as "no
+    delivery"), order them by priority and open the sync run. Batch mode fetches
+    through Meta's Batch API (up to 50 ad sets per call); account mode pages one
+    level=adset query for the whole account.
+    """
+    _set_stage(progress, "saving_audiences")
+    ad_set_id_to_audience, audience_ids = _upsert_audiences(db, account_id, ad_sets_data, summary)
+
+    ad_set_ids = list(ad_set_id_to_audience.keys())
+    time_ranges = _incremental_time_ranges(ad_set_id_to_audience) if incremental else None
+    ad_set_ids, idle_ids = _split_idle_ad_sets(ad_sets_data, ad_set_ids, time_ranges, date_preset)
+    summary["ad_sets_idle"] = len(idle_ids)
+    fetch_mode = get_settings().insights_fetch_mode
+    ad_set_ids, tiers = _prioritize_ad_sets(db, ad_set_id_to_audience, ad_set_ids)
+    period = None
+    if fetch_mode == "account":
+        period, time_ranges = _account_fetch_period(ad_set_ids, date_preset, time_ranges)
+    run_id, ad_set_ids, resumed_ids = _begin_run(
+        db, account_id, date_preset, fetch_mode, incremental, ad_set_ids, summary,
+    )
+    _log_fetch(fetch_mode, ad_set_ids, idle_ids, date_preset, time_ranges)
+    merger = _DailyMerger(
+        db, audience_ids, time_ranges, date_preset, summary,
+        run_id=run_id if fetch_mode == "batch" else None, resumed_ids=resumed_ids,
+    )
+    return {
+        "fetch_mode": fetch_mode,
+        "ad_set_ids": ad_set_ids,
+        "idle_ids": idle_ids,
+        "time_ranges": time_ranges,
+        "period": period,
+        "tiers": tiers,
+        "run_id": run_id,
+        "merger": merger,
+    }
+
+
+def _fail_sync(db: Session, run_id: str, summary: dict, error: Exception) -> dict:
+    """Roll back the failed fetch's open chunk and close the run as failed."""
+    logger.error(f"Insights fetch failed: {error}", exc_info=error)
+    summary["errors"].append(f"Insights fetch: {error}")
+    db.rollback()
+    end_sync_run(db, run_id, "failed", summary=summary, error=str(error))
+    db.commit()
+    return summary
+
+
+def _complete_sync(db: Session, account: Account, plan: dict, summary: dict, progress: Optional[SyncProgress]) -> dict:
+    """Step 4: advance sync markers, then derive window snapshots from the facts."""
+    fetch_mode, ad_set_ids, merger = plan["fetch_mode"], plan["ad_set_ids"], plan["merger"]
+    unfetched = merger.unfetched(ad_set_ids) if fetch_mode == "batch" else []
+    _report_priority_coverage(plan["tiers"], unfetched, summary)
+    if fetch_mode == "batch":
+        _queue_retries(db, plan["run_id"], unfetched, summary)
+    merged_ids = merger.finish(plan["idle_ids"] + (ad_set_ids if fetch_mode == "account" else []))
+    _set_stage(progress, "deriving_snapshots")
+    _derive_window_snapshots(db, merged_ids, summary)
+    return _finish_sync(db, account, plan["run_id"], summary)
+
+
+def _do_sync(
+    account_id: str,
+    db: Session,
+    date_preset: str,
+    incremental: bool = False,
+    transport: Optional[httpx.BaseTransport] = None,
+    progress: Optional[SyncProgress] = None,
+) -> dict:
+    """
+    Internal sync implementation (blocking client, chunks sent one after another).
+    Insights are fetched on a separate thread; each chunk is persisted on this one
+    while the next is in flight.
+    """
+    loaded = _load_account(db, account_id)
+    if not loaded:
         return {"error": "Account not found"}
-    token = decrypt_token(account.access_token)
-    meta_id = _ensure_act_prefix(account.meta_account_id)
+    account, token, meta_id = loaded
     logger.info(f"Syncing account {account.account_name} ({meta_id}) with preset={date_preset}")
 
-    summary = {"audiences_created": 0, "audiences_updated": 0, "snapshots_created": 0, "errors": []}
+    summary = _new_summary(incremental)
 
-    # Use a single httpx.Client for the entire sync (connection reuse)
-    with httpx.Client(http2=False) as client:
+    # One httpx.Client for the whole sync, on the app-wide Graph pool when it is running
+    hooks = client_event_hooks(progress)
+    with httpx.Client(transport=transport or graph_transport(), event_hooks=hooks) as client:
         # Step 1: Fetch all ad sets (1 API call + pagination)
+        _set_stage(progress, "fetching_ad_sets")
         try:
             ad_sets_data = get_ad_sets(client, token, meta_id)
             logger.info(f"Fetched {len(ad_sets_data)} ad sets from Meta")
@@ -96,134 +266,776 @@ def _do_sync(account_id: str, db: Session, date_preset: str) -> dict:
             summary["errors"].append(str(e))
             return summary
 
-        # Step 2: Upsert audiences in DB and collect ad set IDs
-        ad_set_id_to_audience: dict[str, Audience] = {}
-        for ad_set_data in ad_sets_data:
-            meta_ad_set_id = ad_set_data.get("id")
-            if not meta_ad_set_id:
-                continue
-            name = ad_set_data.get("name") or meta_ad_set_id
-            audience_type = infer_audience_type(ad_set_data)
-            launched_at = _parse_launched_at(ad_set_data)
-            current_budget = _budget_from_ad_set(ad_set_data)
-            campaign_id = ad_set_data.get("campaign_id")
-            campaign_name = None
-            if isinstance(ad_set_data.get("campaign"), dict):
-                campaign_name = ad_set_data["campaign"].get("name")
-
-            audience = db.query(Audience).filter(Audience.meta_ad_set_id == meta_ad_set_id).first()
-            if not audience:
-                audience = Audience(
-                    id=str(uuid.uuid4()),
-                    account_id=account_id,
-                    meta_ad_set_id=meta_ad_set_id,
-                    name=name,
-                    audience_type=audience_type,
-                    launched_at=launched_at,
-                    current_budget=current_budget,
-                    campaign_id=campaign_id,
-                    campaign_name=campaign_name,
+        # Steps 2-3: upsert audiences, then fetch insights, merging each chunk into
+        # daily facts as it arrives
+        plan = _plan_fetch(db, account_id, ad_sets_data, date_preset, incremental, summary, progress)
+
+        def fetch(on_chunk) -> None:
+            if plan["fetch_mode"] == "account":
+                get_account_insights(
+                    client, token, meta_id, plan["ad_set_ids"], date_preset, time_range=plan["period"],
+                    progress=progress, on_chunk=on_chunk,
                 )
-                db.add(audience)
-                db.flush()
-                summary["audiences_created"] += 1
             else:
-                audience.name = name
-                audience.audience_type = audience_type
-                audience.launched_at = launched_at
-                audience.current_budget = current_budget
-                audience.campaign_id = campaign_id
-                audience.campaign_name = campaign_name
-                summary["audiences_updated"] += 1
+                _batch_insights(
+                    client, token, plan["ad_set_ids"], date_preset, account_id=meta_id,
+                    time_ranges=plan["time_ranges"], progress=progress, on_chunk=on_chunk,
+                )
+
+        _set_stage(progress, "fetching_insights")
+        try:
+            _run_pipeline(fetch, plan["merger"].add)
+        except Exception as e:
+            return _fail_sync(db, plan["run_id"], summary, e)
+
+    # Step 4: Advance sync markers, then derive window snapshots from the facts
+    return _complete_sync(db, account, plan, summary, progress)
 
-            ad_set_id_to_audience[meta_ad_set_id] = audience
 
-        # Step 3: Batch-fetch insights for ALL ad sets
-        # This uses Meta's Batch API: up to 50 ad sets per call
-        ad_set_ids = list(ad_set_id_to_audience.keys())
-        logger.info(f"Batch-fetching insights for {len(ad_set_ids)} ad sets (preset={date_preset})")
+async def _do_sync_async(
+    account_id: str,
+    db: Session,
+    date_preset: str,
+    incremental: bool = False,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+    progress: Optional[SyncProgress] = None,
+) -> dict:
+    """
+    Internal sync implementation (AsyncClient, batch chunks dispatched concurrently).
+    Runs on the shared Graph loop, so only Graph I/O happens on it: every DB stage
+    (which may wait on SQLite's busy timeout) runs in a worker thread via
+    asyncio.to_thread, one at a time, and chunks are persisted the same way while
+    the loop keeps fetching.
+    """
+    loaded = await asyncio.to_thread(_load_account, db, account_id)
+    if not loaded:
+        return {"error": "Account not found"}
+    account, token, meta_id = loaded
+    logger.info(f"Syncing account {account.account_name} ({meta_id}) with preset={date_preset} (async)")
 
+    summary = _new_summary(incremental)
+
+    hooks = client_event_hooks(progress, is_async=True)
+    async with httpx.AsyncClient(transport=transport or graph_async_transport(), event_hooks=hooks) as client:
+        _set_stage(progress, "fetching_ad_sets")
         try:
-            all_daily_rows = _batch_insights(client, token, ad_set_ids, date_preset)
+            ad_sets_data = await get_ad_sets_async(client, token, meta_id)
+            logger.info(f"Fetched {len(ad_sets_data)} ad sets from Meta")
         except Exception as e:
-            logger.error(f"Batch insights failed: {e}", exc_info=True)
-            summary["errors"].append(f"Batch insights: {e}")
-            db.commit()
+            logger.error(f"Failed to fetch ad sets: {e}", exc_info=True)
+            summary["errors"].append(str(e))
             return summary
 
-        # Step 4: Aggregate and store snapshots
-        today = date.today()
-        for meta_ad_set_id, daily_rows in all_daily_rows.items():
-            audience = ad_set_id_to_audience.get(meta_ad_set_id)
-            if not audience:
+        plan = await asyncio.to_thread(
+            _plan_fetch, db, account_id, ad_sets_data, date_preset, incremental, summary, progress,
+        )
+
+        async def fetch(on_chunk) -> None:
+            if plan["fetch_mode"] == "account":
+                await get_account_insights_async(
+                    client, token, meta_id, plan["ad_set_ids"], date_preset, time_range=plan["period"],
+                    progress=progress, on_chunk=on_chunk,
+                )
+            else:
+                await _batch_insights_async(
+                    client, token, plan["ad_set_ids"], date_preset, account_id=meta_id,
+                    time_ranges=plan["time_ranges"], progress=progress, on_chunk=on_chunk,
+                )
+
+        _set_stage(progress, "fetching_insights")
+        try:
+            await _run_pipeline_async(fetch, plan["merger"].add)
+        except Exception as e:
+            return await asyncio.to_thread(_fail_sync, db, plan["run_id"], summary, e)
+
+    return await asyncio.to_thread(_complete_sync, db, account, plan, summary, progress)
+
+
+# ── Fetch/persist pipeline ───────────────────────────────────────
+# The fetch side hands over each chunk of {ad_set_id: [rows]} through a queue of at
+# most sync_pipeline_depth chunks, and the persist side writes it while the next one
+# is in flight. Memory stays proportional to a few chunks, and network and DB time
+# overlap.
+
+_PIPELINE_DONE = object()
+
+
+def _run_pipeline(fetch: Callable[[Callable], None], persist: Callable[[dict], None]) -> None:
+    """
+    Run fetch(on_chunk) on a separate thread while persist() writes each chunk on the
+    calling thread (which owns the Session). A full queue blocks the fetch thread. A
+    persist error stops the fetch at its next chunk; a fetch error is raised after the
+    chunks already queued have been persisted.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=max(1, get_settings().sync_pipeline_depth))
+    stopped = threading.Event()
+    fetch_errors: list[BaseException] = []
+
+    def on_chunk(chunk: dict) -> None:
+        if stopped.is_set():
+            raise RuntimeError("Persisting insights failed, fetch stopped")
+        chunks.put(chunk)
+
+    def run_fetch() -> None:
+        try:
+            fetch(on_chunk)
+        except BaseException as e:
+            fetch_errors.append(e)
+        finally:
+            chunks.put(_PIPELINE_DONE)
+
+    fetcher = threading.Thread(target=run_fetch, name="sync-fetch", daemon=True)
+    fetcher.start()
+    try:
+        while (chunk := chunks.get()) is not _PIPELINE_DONE:
+            persist(chunk)
+    except BaseException:
+        stopped.set()
+        # Keep draining so a fetch thread blocked on a full queue can finish
+        while fetcher.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise
+    fetcher.join()
+    if fetch_errors:
+        raise fetch_errors[0]
+
+
+async def _run_pipeline_async(fetch: Callable[[Callable], Awaitable[None]], persist: Callable[[dict], None]) -> None:
+    """
+    Async counterpart of _run_pipeline: fetch(on_chunk) runs on the event loop and
+    persist() runs in a worker thread (asyncio.to_thread), one chunk at a time, so
+    only that thread touches the Session while the pipeline runs.
+    """
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=max(1, get_settings().sync_pipeline_depth))
+
+    async def on_chunk(chunk: dict) -> None:
+        await chunks.put(chunk)
+
+    async def run_persist() -> None:
+        while (chunk := await chunks.get()) is not _PIPELINE_DONE:
+            await asyncio.to_thread(persist, chunk)
+
+    persister = asyncio.create_task(run_persist())
+    fetcher = asyncio.create_task(fetch(on_chunk))
+    await asyncio.wait({persister, fetcher}, return_when=asyncio.FIRST_COMPLETED)
+    if persister.done():
+        # The persister only stops early by failing
+        fetcher.cancel()
+        await asyncio.gather(fetcher, return_exceptions=True)
+        persister.result()
+        return
+    # Fetch finished or failed: persist what is already queued, then surface its error
+    await chunks.put(_PIPELINE_DONE)
+    await persister
+    fetcher.result()
+
+
+def _set_stage(progress: Optional[SyncProgress], stage: str) -> None:
+    if progress:
+        progress.set_stage(stage)
+
+
+def _log_fetch(
+    fetch_mode: str,
+    ad_set_ids: list[str],
+    idle_ids: list[str],
+    date_preset: str,
+    time_ranges: Optional[dict[str, tuple[date, date]]],
+) -> None:
+    logger.info(
+        f"Fetching insights for {len(ad_set_ids)} ad sets, skipping {len(idle_ids)} idle "
+        f"(mode={fetch_mode}, preset={date_preset}, "
+        f"incremental={len(time_ranges) if time_ranges is not None else 'off'})"
+    )
+
+
+def _begin_run(
+    db: Session,
+    account_id: str,
+    date_preset: str,
+    fetch_mode: str,
+    incremental: bool,
+    ad_set_ids: list[str],
+    summary: dict,
+) -> tuple[str, list[str], set[str]]:
+    """
+    Open (or resume) the SyncRun for this fetch. Returns (run ID, ad sets still to
+    fetch, ad sets the resumed run already merged).
+    """
+    run_id, done = begin_sync_run(
+        db, account_id, date_preset, fetch_mode, incremental, _last_complete_day(), len(ad_set_ids),
+    )
+    resumed_ids = done.intersection(ad_set_ids)
+    summary["sync_run_id"] = run_id
+    summary["ad_sets_resumed"] = len(resumed_ids)
+    if resumed_ids:
+        ad_set_ids = [ad_set_id for ad_set_id in ad_set_ids if ad_set_id not in resumed_ids]
+    return run_id, ad_set_ids, resumed_ids
+
+
+def _queue_retries(db: Session, run_id: str, unfetched: list[str], summary: dict) -> None:
+    """Record ad sets the batch fetch gave up on, so the next sync fetches just those."""
+    if not unfetched:
+        return
+    add_checkpoint(db, run_id, "retry", unfetched)
+    db.commit()
+    summary["errors"].append(
+        f"{len(unfetched)} ad sets not fetched (rate limited or failed); the next sync retries just those"
+    )
+    logger.warning(f"Sync run {run_id}: {len(unfetched)} ad sets queued for retry")
+
+
+# ── Fetch priority ───────────────────────────────────────────────
+# Ad sets are fetched in priority order, so a sync cut short by throttling has already
+# refreshed the audiences that matter most: recent spend in the stored daily facts
+# first, then active ad sets, then the longest since their last recommendation (or
+# never recommended). Tiers group them by spend: "high" makes up
+# sync_priority_high_spend_share of the recent spend, "medium" is the rest with any
+# spend, "low" has none.
+
+PRIORITY_TIERS = ("high", "medium", "low")
+
+
+def _prioritize_ad_sets(
+    db: Session,
+    ad_set_id_to_audience: dict[str, Audience],
+    ad_set_ids: list[str],
+) -> tuple[list[str], dict[str, str]]:
+    """
+    Order ad sets by fetch priority. Returns (ordered IDs, {ad_set_id: tier}). Spend
+    and the latest recommendation are read with one grouped query per 500 audiences.
+    """
+    settings = get_settings()
+    since = _last_complete_day() - timedelta(days=max(1, settings.sync_priority_spend_days) - 1)
+    audience_ids = {meta_id: ad_set_id_to_audience[meta_id].id for meta_id in ad_set_ids}
+    ids = list(audience_ids.values())
+    spend: dict[str, float] = {}
+    recommended_at: dict[str, datetime] = {}
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i : i + _IN_CHUNK]
+        for audience_id, total in (
+            db.query(DailyInsight.audience_id, func.sum(DailyInsight.spend))
+            .filter(DailyInsight.audience_id.in_(chunk), DailyInsight.insight_date >= since)
+            .group_by(DailyInsight.audience_id)
+        ):
+            spend[audience_id] = float(total or 0)
+        for audience_id, generated_at in (
+            db.query(Recommendation.audience_id, func.max(Recommendation.generated_at))
+            .filter(Recommendation.audience_id.in_(chunk))
+            .group_by(Recommendation.audience_id)
+        ):
+            recommended_at[audience_id] = generated_at
+
+    def priority(meta_id: str) -> tuple:
+        audience_id = audience_ids[meta_id]
+        last = recommended_at.get(audience_id)
+        return (
+            -spend.get(audience_id, 0.0),
+            ad_set_id_to_audience[meta_id].meta_status != "ACTIVE",
+            last is not None,
+            last.replace(tzinfo=None) if last else datetime.min,
+        )
+
+    ordered = sorted(ad_set_ids, key=priority)
+    high_spend = sum(spend.values()) * settings.sync_priority_high_spend_share
+    tiers: dict[str, str] = {}
+    cumulative = 0.0
+    for meta_id in ordered:
+        ad_set_spend = spend.get(audience_ids[meta_id], 0.0)
+        if ad_set_spend <= 0:
+            tiers[meta_id] = "low"
+        elif cumulative < high_spend:
+            tiers[meta_id] = "high"
+        else:
+            tiers[meta_id] = "medium"
+        cumulative += ad_set_spend
+    return ordered, tiers
+
+
+def _report_priority_coverage(tiers: dict[str, str], unfetched: list[str], summary: dict) -> None:
+    """
+    Per-tier counts of ad sets planned and fetched, and the lowest tier down to which
+    every ad set was fetched (None when even "high" is incomplete).
+    """
+    missing = set(unfetched)
+    counts = {tier: {"ad_sets": 0, "fetched": 0} for tier in PRIORITY_TIERS}
+    for ad_set_id, tier in tiers.items():
+        counts[tier]["ad_sets"] += 1
+        counts[tier]["fetched"] += ad_set_id not in missing
+    summary["priority_tiers"] = counts
+    covered = None
+    for tier in PRIORITY_TIERS:
+        if counts[tier]["fetched"] < counts[tier]["ad_sets"]:
+            break
+        covered = tier
+    summary["priority_tier_covered"] = covered
+    if missing:
+        logger.info(
+            "Priority coverage: "
+            + ", ".join(f"{tier} {c['fetched']}/{c['ad_sets']}" for tier, c in counts.items())
+        )
+
+
+# Statuses set on the ad set itself, so its updated_time is no earlier than the moment
+# it stopped delivering. Inherited ones (CAMPAIGN_PAUSED, ...) leave updated_time alone.
+IDLE_STATUSES = frozenset({"PAUSED", "ARCHIVED", "DELETED"})
+
+
+def _split_idle_ad_sets(
+    ad_sets_data: list[dict],
+    ad_set_ids: list[str],
+    time_ranges: Optional[dict[str, tuple[date, date]]],
+    date_preset: str,
+) -> tuple[list[str], list[str]]:
+    """
+    Split ad sets into (to fetch, idle). An ad set is idle when it was paused, archived
+    or deleted before the first day it would be fetched for (its incremental range, or
+    the preset's start), so it cannot have delivered since. Calendar presets with no
+    fixed start fetch everything. One day of slack covers the ad account's time zone.
+    """
+    backfill_since = preset_since(date_preset)
+    stopped: dict[str, date] = {}
+    for ad_set_data in ad_sets_data:
+        if ad_set_data.get("effective_status") in IDLE_STATUSES:
+            updated = _parse_graph_time(ad_set_data.get("updated_time"))
+            if updated:
+                stopped[ad_set_data.get("id")] = updated.astimezone(timezone.utc).date()
+
+    to_fetch, idle = [], []
+    for ad_set_id in ad_set_ids:
+        since = time_ranges[ad_set_id][0] if time_ranges and ad_set_id in time_ranges else backfill_since
+        stopped_on = stopped.get(ad_set_id)
+        if stopped_on is not None and since is not None and stopped_on + timedelta(days=1) < since:
+            idle.append(ad_set_id)
+        else:
+            to_fetch.append(ad_set_id)
+    return to_fetch, idle
+
+
+def _account_fetch_period(
+    ad_set_ids: list[str],
+    date_preset: str,
+    time_ranges: Optional[dict[str, tuple[date, date]]],
+) -> tuple[Optional[tuple[date, date]], Optional[dict[str, tuple[date, date]]]]:
+    """
+    Account mode fetches one period for every ad set. Returns (time_range, ranges to
+    merge with): the span of all incremental ranges, widened to the preset's start
+    for ad sets with no history yet (or for all of them in full mode). Streamed pages
+    can split an ad set's rows, so the merge needs explicit ranges; only when the
+    preset has no fixed start (this_month, maximum, ...) is it used as is, with spans
+    derived from the rows.
+    """
+    if not ad_set_ids:
+        return None, None
+    time_ranges = time_ranges or {}
+    sinces = [since for since, _ in time_ranges.values()]
+    if any(ad_set_id not in time_ranges for ad_set_id in ad_set_ids):
+        backfill_since = preset_since(date_preset)
+        if backfill_since is None:
+            return None, None
+        sinces.append(backfill_since)
+    period = (min(sinces), _last_complete_day())
+    return period, {ad_set_id: period for ad_set_id in ad_set_ids}
+
+
+# Rows per IN (...) list when prefetching / reloading by key
+_IN_CHUNK = 500
+
+AUDIENCE_SYNC_COLUMNS = (
+    "name", "audience_type", "launched_at", "current_budget", "campaign_id", "campaign_name",
+    "meta_status", "meta_updated_time", "targeting_hash",
+)
+
+
+def _upsert_audiences(
+    db: Session,
+    account_id: str,
+    ad_sets_data: list[dict],
+    summary: dict,
+) -> tuple[dict[str, Audience], dict[str, str]]:
+    """
+    Create or update one Audience per ad set with a bulk upsert on meta_ad_set_id.
+    Existing IDs are prefetched in one query per 500 ad sets and the rows are reloaded
+    the same way afterwards. Ad sets whose updated_time, effective_status and targeting
+    hash all match the stored ones are unchanged and not written (Meta bumps
+    updated_time on any edit). The upsert is committed before the reload, so no write
+    transaction stays open while insights are fetched (other accounts' syncs can write
+    meanwhile). Returns ({meta_ad_set_id: Audience}, {meta_ad_set_id: audience ID}).
+    The ID map is plain strings: later commits (the sync run, each chunk) expire the
+    Audience objects, and reading .id from an expired one reloads its row.
+    """
+    rows_by_ad_set: dict[str, dict] = {}
+    for ad_set_data in ad_sets_data:
+        meta_ad_set_id = ad_set_data.get("id")
+        if not meta_ad_set_id:
+            continue
+        campaign_name = None
+        if isinstance(ad_set_data.get("campaign"), dict):
+            campaign_name = ad_set_data["campaign"].get("name")
+        rows_by_ad_set[meta_ad_set_id] = {
+            "meta_ad_set_id": meta_ad_set_id,
+            "name": ad_set_data.get("name") or meta_ad_set_id,
+            "audience_type": infer_audience_type(ad_set_data),
+            "launched_at": _parse_launched_at(ad_set_data),
+            "current_budget": _budget_from_ad_set(ad_set_data),
+            "campaign_id": ad_set_data.get("campaign_id"),
+            "campaign_name": campaign_name,
+            "meta_status": ad_set_data.get("effective_status"),
+            "meta_updated_time": _parse_graph_time(ad_set_data.get("updated_time")),
+            "targeting_hash": _targeting_hash(ad_set_data),
+        }
+    ad_set_ids = list(rows_by_ad_set)
+
+    existing: dict[str, tuple] = {}
+    for i in range(0, len(ad_set_ids), _IN_CHUNK):
+        for meta_ad_set_id, *stored in (
+            db.query(
+                Audience.meta_ad_set_id, Audience.id, Audience.meta_status,
+                Audience.meta_updated_time, Audience.targeting_hash,
+            )
+            .filter(Audience.meta_ad_set_id.in_(ad_set_ids[i : i + _IN_CHUNK]))
+        ):
+            existing[meta_ad_set_id] = tuple(stored)
+
+    rows = []
+    unchanged = 0
+    for meta_ad_set_id, row in rows_by_ad_set.items():
+        if meta_ad_set_id in existing:
+            audience_id, meta_status, meta_updated_time, targeting_hash = existing[meta_ad_set_id]
+            if (
+                row["meta_updated_time"] is not None
+                and _same_instant(row["meta_updated_time"], meta_updated_time)
+                and row["meta_status"] == meta_status
+                and row["targeting_hash"] == targeting_hash
+            ):
+                unchanged += 1
                 continue
+            row["id"] = audience_id
+        else:
+            row["id"] = str(uuid.uuid4())
+        row["account_id"] = account_id
+        rows.append(row)
+    upsert_rows(db, Audience, rows, ["meta_ad_set_id"], AUDIENCE_SYNC_COLUMNS, touch_updated_at=True)
+    summary["audiences_created"] += len(rows_by_ad_set) - len(existing)
+    summary["audiences_updated"] += len(existing) - unchanged
+    summary["audiences_unchanged"] += unchanged
+    db.commit()
+
+    ad_set_id_to_audience: dict[str, Audience] = {}
+    for i in range(0, len(ad_set_ids), _IN_CHUNK):
+        for audience in (
+            db.query(Audience)
+            .filter(Audience.meta_ad_set_id.in_(ad_set_ids[i : i + _IN_CHUNK]))
+            .populate_existing()
+        ):
+            ad_set_id_to_audience[audience.meta_ad_set_id] = audience
+    audience_ids = {meta_id: audience.id for meta_id, audience in ad_set_id_to_audience.items()}
+    return ad_set_id_to_audience, audience_ids
+
+
+SNAPSHOT_VALUE_COLUMNS = (
+    "spend", "revenue", "purchases", "impressions", "clicks", "ctr", "cpc", "roas", "cpa", "cvr",
+)
 
-            if not daily_rows:
-                # No data for this ad set — not an error, just no impressions
+
+def _snapshot_values(ins: dict) -> dict:
+    """Convert an aggregated metrics dict into MetricSnapshot column values."""
+    return {
+        "spend": Decimal(str(ins["spend"])),
+        "revenue": Decimal(str(ins["revenue"])),
+        "purchases": int(ins["purchases"]),
+        "impressions": int(ins["impressions"]),
+        "clicks": int(ins["clicks"]),
+        "ctr": ins.get("ctr"),
+        "cpc": Decimal(str(ins["cpc"])) if ins.get("cpc") is not None else None,
+        "roas": Decimal(str(ins["roas"])) if ins.get("roas") is not None else None,
+        "cpa": Decimal(str(ins["cpa"])) if ins.get("cpa") is not None else None,
+        "cvr": ins.get("cvr"),
+    }
+
+
+def _upsert_snapshots(db: Session, snapshot_date: date, windows: dict[str, dict[int, dict]], summary: dict) -> None:
+    """
+    Bulk-upsert {audience_id: {window_days: metrics}} as snapshots for snapshot_date,
+    then copy them to latest_audience_metrics in the same transaction.
+    The (audience, date) pairs that already exist are prefetched in one query per 500
+    audiences, only to report how many snapshots were created.
+    """
+    audience_ids = list(windows)
+    existing = 0
+    for i in range(0, len(audience_ids), _IN_CHUNK):
+        existing += (
+            db.query(func.count(MetricSnapshot.id))
+            .filter(
+                MetricSnapshot.audience_id.in_(audience_ids[i : i + _IN_CHUNK]),
+                MetricSnapshot.snapshot_date == snapshot_date,
+            )
+            .scalar() or 0
+        )
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "audience_id": audience_id,
+            "snapshot_date": snapshot_date,
+            "window_days": window_days,
+            **_snapshot_values(ins),
+        }
+        for audience_id, by_window in windows.items()
+        for window_days, ins in by_window.items()
+    ]
+    upsert_rows(
+        db, MetricSnapshot, rows, ["audience_id", "snapshot_date", "window_days"],
+        SNAPSHOT_VALUE_COLUMNS,
+    )
+    _refresh_latest_metrics(db, audience_ids, snapshot_date)
+    summary["snapshots_created"] += max(0, len(rows) - existing)
+
+
+LATEST_METRIC_COLUMNS = ("audience_id", "window_days", "snapshot_id", "snapshot_date", *SNAPSHOT_VALUE_COLUMNS)
+
+
+def _refresh_latest_metrics(db: Session, audience_ids: list[str], snapshot_date: date) -> None:
+    """
+    Copy the audiences' snapshots for snapshot_date into latest_audience_metrics with
+    one INSERT ... SELECT per 500 audiences. A latest row with a newer date is kept.
+    """
+    for i in range(0, len(audience_ids), _IN_CHUNK):
+        upsert_from_select(
+            db, LatestAudienceMetric, list(LATEST_METRIC_COLUMNS),
+            select(
+                MetricSnapshot.audience_id,
+                MetricSnapshot.window_days,
+                MetricSnapshot.id,
+                MetricSnapshot.snapshot_date,
+                *(getattr(MetricSnapshot, column) for column in SNAPSHOT_VALUE_COLUMNS),
+            ).where(
+                MetricSnapshot.audience_id.in_(audience_ids[i : i + _IN_CHUNK]),
+                MetricSnapshot.snapshot_date == snapshot_date,
+            ),
+            ["audience_id", "window_days"],
+            update_where=lambda excluded: LatestAudienceMetric.snapshot_date <= excluded.snapshot_date,
+        )
+
+
+# ── Daily facts and derived windows ──────────────────────────────
+# Every fetched day is upserted into daily_insights, the source of truth for metrics.
+# Today's window snapshots are then derived from the facts in one SQL aggregate.
+# In incremental mode each sync re-requests only the days after
+# insights_synced_through plus sync_restatement_days already-synced days.
+
+SNAPSHOT_WINDOWS = (1, 3, 7, 14, 30)
+
+# Presets whose range stops before yesterday, so they don't advance insights_synced_through
+_PRESETS_ENDING_EARLY = {"last_month", "last_quarter", "last_year"}
+
+
+def _last_complete_day() -> date:
+    return date.today() - timedelta(days=1)
+
+
+def _incremental_time_ranges(ad_set_id_to_audience: dict[str, Audience]) -> dict[str, tuple[date, date]]:
+    """
+    (since, until) per ad set with merged history. Ad sets without history are left
+    out, so they are backfilled with the sync's date_preset.
+    """
+    until = _last_complete_day()
+    lookback = timedelta(days=max(0, get_settings().sync_restatement_days))
+    ranges = {}
+    for meta_ad_set_id, audience in ad_set_id_to_audience.items():
+        through = audience.insights_synced_through
+        if through is None:
+            continue
+        since = min(through, until) + timedelta(days=1) - lookback
+        ranges[meta_ad_set_id] = (min(since, until), until)
+    return ranges
+
+
+class _DailyMerger:
+    """
+    Persist side of the fetch pipeline. Each chunk of {ad_set_id: [rows]} is merged
+    and committed as it arrives: the first time an ad set is seen, its fetched date
+    range is cleared (Meta may have restated or zeroed any day in it), then its rows
+    are upserted. insights_synced_through only advances in finish(), once the whole
+    fetch succeeded, so a failed sync is simply fetched again next time. Ad sets
+    missing from every chunk were not fetched and keep their facts and through-date.
+    With run_id, each chunk also commits a "done" checkpoint for its ad sets;
+    resumed_ids (merged by an earlier attempt of the run) count as already seen.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        audience_ids: dict[str, str],
+        time_ranges: Optional[dict[str, tuple[date, date]]],
+        date_preset: str,
+        summary: dict,
+        run_id: Optional[str] = None,
+        resumed_ids: Iterable[str] = (),
+    ):
+        self.db = db
+        self.summary = summary
+        self.run_id = run_id
+        self.time_ranges = time_ranges or {}
+        self.until = _last_complete_day()
+        self.covers_yesterday = date_preset not in _PRESETS_ENDING_EARLY
+        # {meta_ad_set_id: audience ID}: plain IDs, ORM objects expire at each commit
+        self.audience_ids = audience_ids
+        self.seen: list[str] = [ad_set_id for ad_set_id in resumed_ids if ad_set_id in self.audience_ids]
+        self._seen_set: set[str] = set(self.seen)
+
+    def add(self, chunk_rows: dict[str, list[dict]]) -> None:
+        replace_ranges: dict[tuple[date, date], list[str]] = {}
+        facts = []
+        # One pass over the whole chunk into columns, then per-ad-set slices
+        ad_set_ids, offsets, columns = parse_insight_chunk(chunk_rows)
+        until = np.datetime64(self.until, "D")
+        for i, meta_ad_set_id in enumerate(ad_set_ids):
+            audience_id = self.audience_ids.get(meta_ad_set_id)
+            if not audience_id:
                 continue
+            # Dated rows up to yesterday (today is still incomplete), one per day
+            days = latest_by_day(columns.take(slice(offsets[i], offsets[i + 1])), until)
+            day_list = days.dates.astype(date).tolist()
 
-            windows = aggregate_windows_from_rows(daily_rows)
-
-            for window_days, ins in windows.items():
-                existing = (
-                    db.query(MetricSnapshot)
-                    .filter(
-                        MetricSnapshot.audience_id == audience.id,
-                        MetricSnapshot.snapshot_date == today,
-                        MetricSnapshot.window_days == window_days,
-                    )
-                    .first()
-                )
-                spend = Decimal(str(ins["spend"]))
-                revenue = Decimal(str(ins["revenue"]))
-                purchases = int(ins["purchases"])
-                impressions = int(ins["impressions"])
-                clicks = int(ins["clicks"])
-                ctr = ins.get("ctr")
-                cpc = Decimal(str(ins["cpc"])) if ins.get("cpc") is not None else None
-                roas = Decimal(str(ins["roas"])) if ins.get("roas") is not None else None
-                cpa = Decimal(str(ins["cpa"])) if ins.get("cpa") is not None else None
-                cvr = ins.get("cvr")
-
-                if existing:
-                    existing.spend = spend
-                    existing.revenue = revenue
-                    existing.purchases = purchases
-                    existing.impressions = impressions
-                    existing.clicks = clicks
-                    existing.ctr = ctr
-                    existing.cpc = cpc
-                    existing.roas = roas
-                    existing.cpa = cpa
-                    existing.cvr = cvr
+            if meta_ad_set_id not in self._seen_set:
+                self._seen_set.add(meta_ad_set_id)
+                self.seen.append(meta_ad_set_id)
+                if meta_ad_set_id in self.time_ranges:
+                    span = self.time_ranges[meta_ad_set_id]
+                elif day_list:
+                    span = (day_list[0], self.until if self.covers_yesterday else day_list[-1])
                 else:
-                    snap = MetricSnapshot(
-                        id=str(uuid.uuid4()),
-                        audience_id=audience.id,
-                        snapshot_date=today,
-                        window_days=window_days,
-                        spend=spend,
-                        revenue=revenue,
-                        purchases=purchases,
-                        impressions=impressions,
-                        clicks=clicks,
-                        ctr=ctr,
-                        cpc=cpc,
-                        roas=roas,
-                        cpa=cpa,
-                        cvr=cvr,
-                    )
-                    db.add(snap)
-                    summary["snapshots_created"] += 1
-
-        # Update last_synced_at on the account
-        account.last_synced_at = datetime.now(timezone.utc)
-        db.commit()
+                    span = None
+                if span:
+                    replace_ranges.setdefault(span, []).append(audience_id)
+
+            for day, spend, revenue, purchases, clicks, impressions in zip(
+                day_list,
+                days.spend.tolist(),
+                days.revenue.tolist(),
+                days.purchases.tolist(),
+                days.clicks.tolist(),
+                days.impressions.tolist(),
+            ):
+                facts.append({
+                    "audience_id": audience_id,
+                    "insight_date": day,
+                    "spend": Decimal(str(spend)),
+                    "revenue": Decimal(str(revenue)),
+                    "purchases": purchases,
+                    "clicks": clicks,
+                    "impressions": impressions,
+                })
+            self.summary["days_merged"] += len(day_list)
+
+        # Set-based replace: one DELETE per distinct range, then a batched upsert
+        for (since, span_until), audience_ids in replace_ranges.items():
+            for i in range(0, len(audience_ids), _IN_CHUNK):
+                self.db.query(DailyInsight).filter(
+                    DailyInsight.audience_id.in_(audience_ids[i : i + _IN_CHUNK]),
+                    DailyInsight.insight_date >= since,
+                    DailyInsight.insight_date <= span_until,
+                ).delete(synchronize_session=False)
+        upsert_rows(self.db, DailyInsight, facts, ["audience_id", "insight_date"])
+        if self.run_id:
+            add_checkpoint(self.db, self.run_id, "done", [i for i in ad_set_ids if i in self.audience_ids])
+        self.db.commit()
+
+    def unfetched(self, ad_set_ids: list[str]) -> list[str]:
+        """The given ad sets that no chunk has delivered."""
+        return [ad_set_id for ad_set_id in ad_set_ids if ad_set_id not in self._seen_set]
+
+    def finish(self, no_delivery_ids: Optional[list[str]] = None) -> list[str]:
+        """
+        Close the merge after a successful fetch. no_delivery_ids: ad sets the fetch
+        covered even if no chunk mentioned them (account mode), whose range is cleared.
+        Advances insights_synced_through and returns the merged audience IDs.
+        """
+        if no_delivery_ids:
+            self.add({ad_set_id: [] for ad_set_id in no_delivery_ids if ad_set_id not in self._seen_set})
+        advance = [
+            self.audience_ids[meta_ad_set_id]
+            for meta_ad_set_id in self.seen
+            if meta_ad_set_id in self.time_ranges or self.covers_yesterday
+        ]
+        for i in range(0, len(advance), _IN_CHUNK):
+            self.db.query(Audience).filter(
+                Audience.id.in_(advance[i : i + _IN_CHUNK]),
+                or_(Audience.insights_synced_through.is_(None), Audience.insights_synced_through < self.until),
+            ).update({Audience.insights_synced_through: self.until}, synchronize_session=False)
+        return [self.audience_ids[meta_ad_set_id] for meta_ad_set_id in self.seen]
+
+
+def _derive_window_snapshots(db: Session, audience_ids: list[str], summary: dict) -> None:
+    """
+    Derive today's 1/3/7/14/30-day snapshots from daily_insights with one conditional
+    SUM per (window, measure), windows ending at the last complete day. A window with
+    no spend and no impressions gets no snapshot (its previous one stays latest), so
+    an audience idle for the last days is not scored as a 0-spend audience.
+    """
+    if not audience_ids:
+        return
+    db.flush()
+    until = _last_complete_day()
+    today = date.today()
+    measures = ("spend", "revenue", "purchases", "clicks", "impressions")
+    columns = []
+    for window_days in SNAPSHOT_WINDOWS:
+        start = until - timedelta(days=window_days - 1)
+        for measure in measures:
+            columns.append(
+                func.sum(
+                    case((DailyInsight.insight_date >= start, getattr(DailyInsight, measure)), else_=0)
+                ).label(f"{measure}_{window_days}")
+            )
+    oldest = until - timedelta(days=max(SNAPSHOT_WINDOWS) - 1)
+    windows: dict[str, dict[int, dict]] = {}
+    for i in range(0, len(audience_ids), _IN_CHUNK):
+        rows = (
+            db.query(DailyInsight.audience_id, *columns)
+            .filter(
+                DailyInsight.audience_id.in_(audience_ids[i : i + _IN_CHUNK]),
+                DailyInsight.insight_date >= oldest,
+                DailyInsight.insight_date <= until,
+            )
+            .group_by(DailyInsight.audience_id)
+            .all()
+        )
+        for row in rows:
+            values = row._mapping
+            by_window = {
+                window_days: metrics_from_sums(
+                    float(values[f"spend_{window_days}"] or 0),
+                    float(values[f"revenue_{window_days}"] or 0),
+                    int(values[f"purchases_{window_days}"] or 0),
+                    int(values[f"clicks_{window_days}"] or 0),
+                    int(values[f"impressions_{window_days}"] or 0),
+                )
+                for window_days in SNAPSHOT_WINDOWS
+                if values[f"spend_{window_days}"] or values[f"impressions_{window_days}"]
+            }
+            if by_window:
+                windows[row.audience_id] = by_window
+    _upsert_snapshots(db, today, windows, summary)
+
+
+def _finish_sync(db: Session, account: Account, run_id: str, summary: dict) -> dict:
+    """Stamp last_synced_at, close the sync run, commit, and log the summary."""
+    account.last_synced_at = datetime.now(timezone.utc)
+    end_sync_run(db, run_id, "partial" if summary["errors"] else "succeeded", summary=summary)
+    db.commit()
 
     logger.info(
-        f"Sync complete: {summary['audiences_created']} created, "
+        f"Sync complete ({summary['mode']}): {summary['audiences_created']} created, "
         f"{summary['audiences_updated']} updated, "
+        f"{summary['audiences_unchanged']} unchanged, "
+        f"{summary['ad_sets_idle']} idle, "
+        f"{summary['ad_sets_resumed']} resumed, "
         f"{summary['snapshots_created']} snapshots, "
+        f"{summary['days_merged']} days merged, "
         f"{len(summary['errors'])} errors"
     )
     if summary["errors"]:
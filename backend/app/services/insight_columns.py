@@ -0,0 +1,191 @@
+"""Columnar parsing of Graph insight rows, with window sums from cumulative sums.
+
+parse_insight_rows makes one pass over the rows (and one over each row's actions /
+action_values lists) into NumPy columns. Any trailing window is then two lookups in
+a cumulative sum, so aggregating several windows costs O(rows) in total.
+"""
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Action types counted as purchases (and their values as revenue)
+PURCHASE_ACTION_TYPES = frozenset({"purchase", "omni_purchase"})
+
+MEASURES = ("spend", "revenue", "purchases", "clicks", "impressions")
+
+NAT = np.datetime64("NaT", "D")
+
+
+class InsightColumns:
+    """Parallel arrays, one entry per insight row. Missing dates are NaT, missing ctr/cpc NaN."""
+
+    __slots__ = ("dates", "spend", "revenue", "purchases", "clicks", "impressions", "ctr", "cpc")
+
+    def __init__(self, dates, spend, revenue, purchases, clicks, impressions, ctr, cpc):
+        self.dates = dates
+        self.spend = spend
+        self.revenue = revenue
+        self.purchases = purchases
+        self.clicks = clicks
+        self.impressions = impressions
+        self.ctr = ctr
+        self.cpc = cpc
+
+    def __len__(self) -> int:
+        return len(self.spend)
+
+    def take(self, index) -> "InsightColumns":
+        """Rows at a slice, boolean mask or index array."""
+        return InsightColumns(*(getattr(self, name)[index] for name in self.__slots__))
+
+
+def _purchase_totals(row: dict) -> tuple[int, float]:
+    """Purchases and purchase revenue of one row, one pass over each list."""
+    purchases = 0
+    for action in row.get("actions") or ():
+        if isinstance(action, dict) and action.get("action_type") in PURCHASE_ACTION_TYPES:
+            purchases += int(action.get("value", 0) or 0)
+    revenue = 0.0
+    for value in row.get("action_values") or ():
+        if isinstance(value, dict) and value.get("action_type") in PURCHASE_ACTION_TYPES:
+            revenue += float(value.get("value", 0) or 0)
+    return purchases, revenue
+
+
+def _optional_float(value) -> float:
+    return float(value) if value else np.nan
+
+
+def _parse_days(day_strings: list) -> np.ndarray:
+    """ISO dates to datetime64[D] in one conversion; unparseable entries become NaT."""
+    try:
+        return np.array(day_strings, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        days = []
+        for value in day_strings:
+            try:
+                days.append(np.datetime64(date.fromisoformat(value), "D"))
+            except (TypeError, ValueError):
+                days.append(NAT)
+        return np.array(days, dtype="datetime64[D]")
+
+
+def parse_insight_rows(rows: Iterable[dict]) -> InsightColumns:
+    """One pass over daily insight rows into columns (row order is kept)."""
+    dates, spend, revenue, purchases, clicks, impressions, ctr, cpc = [], [], [], [], [], [], [], []
+    for row in rows:
+        row_purchases, row_revenue = _purchase_totals(row)
+        dates.append(row.get("date_start") or "NaT")
+        spend.append(float(row.get("spend") or 0))
+        revenue.append(row_revenue)
+        purchases.append(row_purchases)
+        clicks.append(int(row.get("clicks") or 0))
+        impressions.append(int(row.get("impressions") or 0))
+        ctr.append(_optional_float(row.get("ctr")))
+        cpc.append(_optional_float(row.get("cpc")))
+    return InsightColumns(
+        _parse_days(dates),
+        np.array(spend, dtype=np.float64),
+        np.array(revenue, dtype=np.float64),
+        np.array(purchases, dtype=np.int64),
+        np.array(clicks, dtype=np.int64),
+        np.array(impressions, dtype=np.int64),
+        np.array(ctr, dtype=np.float64),
+        np.array(cpc, dtype=np.float64),
+    )
+
+
+def parse_insight_chunk(chunk_rows: dict[str, list[dict]]) -> tuple[list[str], np.ndarray, InsightColumns]:
+    """
+    Parse a whole fetched chunk {ad_set_id: [rows]} in one pass. Returns (ad set IDs,
+    offsets, columns): ad set i owns rows offsets[i]:offsets[i + 1].
+    """
+    ad_set_ids = list(chunk_rows)
+    offsets = np.zeros(len(ad_set_ids) + 1, dtype=np.int64)
+    np.cumsum([len(chunk_rows[ad_set_id]) for ad_set_id in ad_set_ids], out=offsets[1:])
+    columns = parse_insight_rows(row for ad_set_id in ad_set_ids for row in chunk_rows[ad_set_id])
+    return ad_set_ids, offsets, columns
+
+
+def metrics_from_sums(spend: float, revenue: float, purchases: int, clicks: int, impressions: int) -> dict:
+    """Standard metrics dict from summed measures (ratios are None when undefined)."""
+    return {
+        "spend": spend,
+        "revenue": revenue,
+        "purchases": purchases,
+        "impressions": impressions,
+        "clicks": clicks,
+        "ctr": (clicks / impressions * 100) if impressions > 0 else None,
+        "cpc": (spend / clicks) if clicks > 0 else None,
+        "roas": (revenue / spend) if spend > 0 else None,
+        "cpa": (spend / purchases) if purchases > 0 else None,
+        "cvr": (purchases / clicks) if clicks > 0 else None,
+    }
+
+
+def total_metrics(columns: InsightColumns) -> dict:
+    """Metrics over all rows."""
+    return metrics_from_sums(
+        float(columns.spend.sum()),
+        float(columns.revenue.sum()),
+        int(columns.purchases.sum()),
+        int(columns.clicks.sum()),
+        int(columns.impressions.sum()),
+    )
+
+
+def row_metrics(columns: InsightColumns, i: int) -> dict:
+    """Metrics of a single row, keeping Meta's own ctr / cpc for it."""
+    metrics = metrics_from_sums(
+        float(columns.spend[i]),
+        float(columns.revenue[i]),
+        int(columns.purchases[i]),
+        int(columns.clicks[i]),
+        int(columns.impressions[i]),
+    )
+    metrics["ctr"] = None if np.isnan(columns.ctr[i]) else float(columns.ctr[i])
+    metrics["cpc"] = None if np.isnan(columns.cpc[i]) else float(columns.cpc[i])
+    return metrics
+
+
+def trailing_window_metrics(columns: InsightColumns, windows: Iterable[int]) -> dict[int, dict]:
+    """
+    Metrics over the last N rows for each window N (clamped to the rows available),
+    from one cumulative sum per measure. Rows must be sorted by date.
+    """
+    n = len(columns)
+    if n == 0:
+        return {}
+    cumulative = {}
+    for measure in MEASURES:
+        values = getattr(columns, measure)
+        cumulative[measure] = np.concatenate((np.zeros(1, dtype=values.dtype), np.cumsum(values)))
+    result = {}
+    for window in windows:
+        start = n - min(window, n)
+        sums = {measure: cumulative[measure][n] - cumulative[measure][start] for measure in MEASURES}
+        result[window] = metrics_from_sums(
+            float(sums["spend"]),
+            float(sums["revenue"]),
+            int(sums["purchases"]),
+            int(sums["clicks"]),
+            int(sums["impressions"]),
+        )
+    return result
+
+
+def latest_by_day(columns: InsightColumns, until: Optional[np.datetime64] = None) -> InsightColumns:
+    """
+    Dated rows on or before until, one per day (the last row wins), sorted by day.
+    """
+    keep = ~np.isnat(columns.dates)
+    if until is not None:
+        keep &= columns.dates <= until
+    columns = columns.take(keep)
+    if len(columns) == 0:
+        return columns
+    # Reverse so np.unique's first occurrence is the last row for each day
+    reversed_dates = columns.dates[::-1]
+    _, first = np.unique(reversed_dates, return_index=True)
+    return columns.take(len(columns) - 1 - first)
@@ -1,39 +1,36 @@
 """Meta Marketing API wrapper using direct Graph API calls with connection reuse,
 adaptive rate limiting, and batch support."""
+import asyncio
 import json
 import logging
-import time
 import threading
-from typing import Any, Optional
+import time
+from collections import deque
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import quote
 
 import httpx
 
 from app.config import get_settings
+from app.services.insight_columns import parse_insight_rows, row_metrics, total_metrics, trailing_window_metrics
+from app.services.rate_governor import get_governor
+from app.services.sync_progress import SyncProgress
 from app.utils.crypto import decrypt_token
 
 logger = logging.getLogger(__name__)
 
-GRAPH_BASE = "https://graph.facebook.com/v18.0"
+GRAPH_BASE = get_settings().meta_graph_base_url.rstrip("/")
 
 # Fields we request
-AD_SET_FIELDS = "id,name,campaign_id,daily_budget,created_time,targeting"
+AD_SET_FIELDS = "id,name,campaign_id,daily_budget,created_time,targeting,effective_status,updated_time"
 INSIGHT_FIELDS = "spend,impressions,clicks,ctr,cpc,actions,action_values"
+ACCOUNT_INSIGHT_FIELDS = f"adset_id,{INSIGHT_FIELDS}"
+AD_SET_PARAMS = {"fields": AD_SET_FIELDS, "limit": 200}
 
-# ── Adaptive rate-limit state ────────────────────────────────────
-_rate_lock = threading.Lock()
-_usage_pct: float = 0.0          # last known API usage percentage (0-100)
-_last_call_ts: float = 0.0       # timestamp of last API call
-_rate_limited_until: float = 0.0  # don't make any calls before this time
-_consecutive_rate_limits: int = 0  # track consecutive rate limits for global backoff
-
-# Delay thresholds based on usage %
-_DELAY_MAP = [
-    (80, 15.0),   # >=80% usage → 15s between calls
-    (60, 8.0),    # >=60% → 8s
-    (40, 4.0),    # >=40% → 4s
-    (20, 2.0),    # >=20% → 2s
-    (0, 0.5),     # <20%  → 0.5s
-]
+# ── Adaptive rate limiting ───────────────────────────────────────
+# State lives in the per-ad-account RateGovernor (see rate_governor.py). The helpers
+# below keep the old call sites; account_id=None means "app-level only".
 
 # ── Sync lock per account ────────────────────────────────────────
 _sync_locks: dict[str, threading.Lock] = {}
@@ -48,96 +45,34 @@ def get_sync_lock(account_id: str) -> threading.Lock:
         return _sync_locks[account_id]
 
 
-def _get_adaptive_delay() -> float:
+def _get_adaptive_delay(account_id: Optional[str] = None) -> float:
     """Return the appropriate delay based on current API usage percentage."""
-    with _rate_lock:
-        for threshold, delay in _DELAY_MAP:
-            if _usage_pct >= threshold:
-                return delay
-    return 0.5
-
-
-def _mark_rate_limited(backoff_seconds: float) -> None:
-    """Mark that we've been rate limited — all subsequent calls must wait."""
-    global _usage_pct, _rate_limited_until, _consecutive_rate_limits
-    with _rate_lock:
-        _usage_pct = 100.0  # Force max delay for future calls
-        _rate_limited_until = time.time() + backoff_seconds
-        _consecutive_rate_limits += 1
-    logger.info(
-        f"Rate limit flagged: no API calls for {backoff_seconds:.0f}s "
-        f"(consecutive: {_consecutive_rate_limits})"
-    )
+    return get_governor().delay_for(account_id)
+
+
+def _mark_rate_limited(backoff_seconds: float, account_id: Optional[str] = None, code: Optional[int] = None) -> None:
+    """Start a cooldown for the account (or the whole app for app-level codes)."""
+    get_governor().mark_rate_limited(backoff_seconds, account_id, code)
 
 
-def _clear_rate_limit() -> None:
+def _clear_rate_limit(account_id: Optional[str] = None) -> None:
     """Clear rate limit flag after a successful call."""
-    global _consecutive_rate_limits
-    with _rate_lock:
-        _consecutive_rate_limits = 0
+    get_governor().clear_rate_limit(account_id)
 
 
 def _update_usage_from_headers(headers: httpx.Headers) -> None:
     """Parse Meta's x-business-use-case-usage or x-app-usage headers to track API usage %."""
-    global _usage_pct
+    get_governor().record_usage(headers)
 
-    # x-business-use-case-usage: {"<ad_account_id>":[{"call_count":X,"total_cputime":Y,...}]}
-    biz_usage = headers.get("x-business-use-case-usage")
-    if biz_usage:
-        try:
-            data = json.loads(biz_usage)
-            max_pct = 0.0
-            for account_id, entries in data.items():
-                for entry in entries:
-                    for key in ("call_count", "total_cputime", "total_time"):
-                        val = entry.get(key, 0)
-                        if val > max_pct:
-                            max_pct = val
-            with _rate_lock:
-                _usage_pct = max(max_pct, _usage_pct * 0.8)  # decay slowly
-            if max_pct >= 40:
-                logger.info(f"Meta API usage: {max_pct:.0f}% (delay: {_get_adaptive_delay():.1f}s)")
-            return
-        except (json.JSONDecodeError, TypeError):
-            pass
 
-    # Fallback: x-app-usage: {"call_count":X,"total_cputime":Y,"total_time":Z}
-    app_usage = headers.get("x-app-usage")
-    if app_usage:
-        try:
-            data = json.loads(app_usage)
-            max_pct = max(
-                data.get("call_count", 0),
-                data.get("total_cputime", 0),
-                data.get("total_time", 0),
-            )
-            with _rate_lock:
-                _usage_pct = max(max_pct, _usage_pct * 0.8)
-            if max_pct >= 40:
-                logger.info(f"Meta API usage (app): {max_pct:.0f}%")
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-
-def _adaptive_wait() -> None:
-    """Wait the appropriate amount based on current rate limit state."""
-    global _last_call_ts
-
-    # First: respect any hard rate-limit cooldown
-    with _rate_lock:
-        now = time.time()
-        if _rate_limited_until > now:
-            wait_for = _rate_limited_until - now
-            logger.info(f"Global rate-limit cooldown: waiting {wait_for:.0f}s")
-            time.sleep(wait_for)
-
-    # Then: apply adaptive delay between calls
-    delay = _get_adaptive_delay()
-    with _rate_lock:
-        elapsed = time.time() - _last_call_ts
-        if elapsed < delay:
-            time.sleep(delay - elapsed)
-        _last_call_ts = time.time()
+def _rate_limit_backoff(attempt: int) -> float:
+    """Cooldown after the attempt-th consecutive rate-limit error, doubling each time."""
+    return get_settings().meta_rate_limit_backoff_seconds * (2 ** attempt)
+
+
+def _adaptive_wait(account_id: Optional[str] = None) -> None:
+    """Wait for the account's next call slot. Only the calling thread sleeps."""
+    get_governor().wait(account_id)
 
 
 def _ensure_act_prefix(account_id: str) -> str:
@@ -146,136 +81,107 @@ def _ensure_act_prefix(account_id: str) -> str:
     return account_id
 
 
-def _graph_get(
-    client: httpx.Client,
-    access_token: str,
-    path: str,
-    params: dict | None = None,
-    retries: int = 3,
-) -> dict:
-    """Make a GET request to the Graph API with global backoff on rate limit."""
-    params = params or {}
-    params["access_token"] = access_token
-    url = f"{GRAPH_BASE}/{path}" if not path.startswith("http") else path
+# Error codes Meta uses for rate limits: 17 (user/account), 32 (page), 4 (app)
+RATE_LIMIT_CODES = (17, 32, 4)
 
-    for attempt in range(retries + 1):
-        _adaptive_wait()
-        resp = client.get(url, params=params, timeout=30)
 
-        # Always update usage tracking from response headers
-        _update_usage_from_headers(resp.headers)
+def _back_off(attempt: int, retries: int, account_id: Optional[str], reason: str, code: Optional[int] = None) -> None:
+    """
+    Start the cooldown for the attempt-th rate-limit error in a row (60s, 120s, 240s
+    by default) — the next _adaptive_wait() sits it out, account-wide or app-wide
+    for code 4.
+    """
+    wait = _rate_limit_backoff(attempt)
+    _mark_rate_limited(wait, account_id, code)
+    logger.warning(f"{reason}, backoff {wait:g}s — retry {attempt + 1}/{retries}")
 
-        data = resp.json()
 
-        if resp.status_code == 200:
-            _clear_rate_limit()
-            return data
+def _graph_url(access_token: str, path: str, params: dict | None = None) -> tuple[str, Optional[dict]]:
+    """URL and query params for a GET of path, which may be a full paging URL."""
+    if path.startswith("http"):
+        # paging.next URLs already carry the full query (cursor and token); httpx
+        # would replace that query with params, so send them as is
+        return path, None
+    return f"{GRAPH_BASE}/{path}", {**(params or {}), "access_token": access_token}
 
-        error = data.get("error", {})
-        code = error.get("code")
 
-        if code in (17, 32, 4) and attempt < retries:
-            # Exponential backoff: 60s, 120s, 240s — and block ALL calls globally
-            wait = 60 * (2 ** attempt)
-            _mark_rate_limited(wait)
-            logger.warning(
-                f"Rate limited (code {code}), "
-                f"global backoff {wait}s — retry {attempt + 1}/{retries}"
-            )
-            time.sleep(wait)
-            continue
+def _graph_response(resp: httpx.Response, attempt: int, retries: int, account_id: Optional[str]) -> Optional[dict]:
+    """
+    Handle one Graph API response: record its usage headers, then return the body of
+    a success (clearing the account's cooldown), or None after starting a backoff
+    when the call was rate limited and has retries left. Raises for other errors.
+    """
+    _update_usage_from_headers(resp.headers)
+    data = resp.json()
+    if resp.status_code == 200:
+        _clear_rate_limit(account_id)
+        return data
+
+    error = data.get("error", {})
+    code = error.get("code")
+    if code in RATE_LIMIT_CODES and attempt < retries:
+        _back_off(attempt, retries, account_id, f"Rate limited (code {code})", code)
+        return None
+
+    raise Exception(
+        f"Graph API error: {error.get('message', resp.text)} "
+        f"(code={code}, status={resp.status_code})"
+    )
 
-        raise Exception(
-            f"Graph API error: {error.get('message', resp.text)} "
-            f"(code={code}, status={resp.status_code})"
-        )
+
+def _graph_call(send: Callable[[], httpx.Response], retries: int, account_id: Optional[str]) -> dict:
+    """Make a Graph API call with send(), waiting for the account's slot before each attempt."""
+    for attempt in range(retries + 1):
+        _adaptive_wait(account_id)
+        data = _graph_response(send(), attempt, retries, account_id)
+        if data is not None:
+            return data
     # All retries exhausted without success or explicit error
     raise Exception("Graph API call failed after all retries")
 
 
-def _parse_actions(insight: dict, action_type: str) -> int:
-    actions = insight.get("actions") or []
-    total = 0
-    for a in actions:
-        if isinstance(a, dict) and a.get("action_type") == action_type:
-            total += int(a.get("value", 0) or 0)
-    return total
+def _graph_get(
+    client: httpx.Client,
+    access_token: str,
+    path: str,
+    params: dict | None = None,
+    retries: int = 3,
+    account_id: Optional[str] = None,
+) -> dict:
+    """Make a GET request to the Graph API with per-account backoff on rate limit."""
+    url, params = _graph_url(access_token, path, params)
+    return _graph_call(lambda: client.get(url, params=params, timeout=30), retries, account_id)
 
 
-def _parse_action_values(insight: dict, action_type: str) -> float:
-    values = insight.get("action_values") or []
-    total = 0.0
-    for v in values:
-        if isinstance(v, dict) and v.get("action_type") == action_type:
-            total += float(v.get("value", 0) or 0)
-    return total
+def _graph_post(
+    client: httpx.Client,
+    access_token: str,
+    path: str,
+    data: dict | None = None,
+    retries: int = 3,
+    account_id: Optional[str] = None,
+) -> dict:
+    """POST to the Graph API with the same rate-limit handling as _graph_get."""
+    data = {**(data or {}), "access_token": access_token}
+    return _graph_call(lambda: client.post(f"{GRAPH_BASE}/{path}", data=data, timeout=30), retries, account_id)
 
 
 def _compute_metrics_from_row(d: dict) -> dict:
     """Parse a single insight row into our standard metrics dict."""
-    spend = float(d.get("spend") or 0)
-    purchases = _parse_actions(d, "purchase") + _parse_actions(d, "omni_purchase")
-    revenue = _parse_action_values(d, "purchase") + _parse_action_values(d, "omni_purchase")
-    clicks = int(d.get("clicks") or 0)
-    impressions = int(d.get("impressions") or 0)
-    ctr = float(d.get("ctr") or 0) if d.get("ctr") else None
-    cpc = float(d.get("cpc") or 0) if d.get("cpc") else None
-    roas = (revenue / spend) if spend > 0 else None
-    cpa = (spend / purchases) if purchases > 0 else None
-    cvr = (purchases / clicks) if clicks > 0 else None
-    return {
-        "spend": spend,
-        "revenue": revenue,
-        "purchases": purchases,
-        "impressions": impressions,
-        "clicks": clicks,
-        "ctr": ctr,
-        "cpc": cpc,
-        "roas": roas,
-        "cpa": cpa,
-        "cvr": cvr,
-    }
+    return row_metrics(parse_insight_rows([d]), 0)
 
 
 def _aggregate_daily_rows(rows: list[dict]) -> dict:
     """Sum daily insight rows into one aggregate."""
-    spend = sum(float(r.get("spend") or 0) for r in rows)
-    clicks = sum(int(r.get("clicks") or 0) for r in rows)
-    impressions = sum(int(r.get("impressions") or 0) for r in rows)
-    purchases = sum(_parse_actions(r, "purchase") + _parse_actions(r, "omni_purchase") for r in rows)
-    revenue = sum(_parse_action_values(r, "purchase") + _parse_action_values(r, "omni_purchase") for r in rows)
-    ctr = (clicks / impressions * 100) if impressions > 0 else None
-    cpc = (spend / clicks) if clicks > 0 else None
-    roas = (revenue / spend) if spend > 0 else None
-    cpa = (spend / purchases) if purchases > 0 else None
-    cvr = (purchases / clicks) if clicks > 0 else None
-    return {
-        "spend": spend,
-        "revenue": revenue,
-        "purchases": purchases,
-        "impressions": impressions,
-        "clicks": clicks,
-        "ctr": ctr,
-        "cpc": cpc,
-        "roas": roas,
-        "cpa": cpa,
-        "cvr": cvr,
-    }
+    return total_metrics(parse_insight_rows(rows))
 
 
 def get_ad_sets(client: httpx.Client, access_token: str, account_id: str) -> list[dict]:
     """Fetch all ad sets for the account via Graph API."""
     account_id = _ensure_act_prefix(account_id)
     logger.info(f"Fetching ad sets for {account_id}")
-    data = _graph_get(client, access_token, f"{account_id}/adsets", {
-        "fields": AD_SET_FIELDS,
-        "limit": 200,
-    })
-    ad_sets = data.get("data", [])
+    ad_sets = _get_all_pages(client, access_token, f"{account_id}/adsets", AD_SET_PARAMS, account_id=account_id)
     logger.info(f"Got {len(ad_sets)} ad sets")
-    while data.get("paging", {}).get("next"):
-        data = _graph_get(client, access_token, data["paging"]["next"])
-        ad_sets.extend(data.get("data", []))
     return ad_sets
 
 
@@ -286,103 +192,224 @@ BATCH_SIZE = 50  # Meta allows max 50 per batch
 
 BATCH_RETRIES = 3
 
+# Adaptive batch sizing (additive increase, multiplicative decrease): a full batch that
+# came back in under half of meta_batch_target_seconds with low total_cputime usage
+# grows the next ones by BATCH_GROW_STEP sub-requests; a slow or timed-out batch, null
+# (unfinished) sub-responses or high total_cputime halve them. Growth stops short of
+# the last size that had to shrink, and that ceiling rises by one per fast batch.
+BATCH_GROW_STEP = 5
+CPUTIME_HIGH_PCT = 50.0
+CPUTIME_LOW_PCT = 25.0
+
+
+# {ad_set_id: (since, until)} — per-ad-set date ranges used instead of date_preset
+TimeRanges = dict[str, tuple[date, date]]
+
+# One batch sub-request: (ad_set_id, (since, until)), or (ad_set_id, None) for date_preset
+BatchItem = tuple[str, Optional[tuple[date, date]]]
+
+# Receives each fetched chunk of {ad_set_id: [daily_rows]} as soon as it arrives
+ChunkHandler = Callable[[dict[str, list[dict]]], None]
+AsyncChunkHandler = Callable[[dict[str, list[dict]]], Awaitable[None]]
+
+
+def _time_range_param(since: date, until: date) -> str:
+    """URL-encoded Graph time_range value."""
+    return quote(json.dumps({"since": since.isoformat(), "until": until.isoformat()}, separators=(",", ":")))
+
+
+def _build_batch_requests(items: list[BatchItem], date_preset: str) -> list[dict]:
+    """One daily-breakdown insights sub-request per item (its time range, else date_preset)."""
+    batch_requests = []
+    for ad_set_id, period in items:
+        if period:
+            period_param = f"time_range={_time_range_param(*period)}"
+        else:
+            period_param = f"date_preset={date_preset}"
+        relative_url = (
+            f"{ad_set_id}/insights?"
+            f"fields={INSIGHT_FIELDS}&"
+            f"{period_param}&"
+            f"time_increment=1"
+        )
+        batch_requests.append({"method": "GET", "relative_url": relative_url})
+    return batch_requests
 
-def _batch_insights(
-    client: httpx.Client,
-    access_token: str,
-    ad_set_ids: list[str],
-    date_preset: str,
-) -> dict[str, list[dict]]:
+
+def _batch_error(resp: httpx.Response) -> dict:
+    """Extract the Graph error object from a failed batch POST."""
+    try:
+        return resp.json().get("error", {})
+    except Exception:
+        return {}
+
+
+# ── Batch sizing and heavy ad sets ───────────────────────────────
+
+
+class _BatchSizer:
     """
-    Fetch daily insight breakdowns for multiple ad sets in a single batch API call.
-    Returns {ad_set_id: [daily_rows]} for each ad set.
-    Meta Batch API: POST / with batch=[{method,relative_url},...] (max 50 per call).
-    On rate limit, retries the same batch with exponential backoff (never falls back
-    to individual calls, which would make the rate limit worse).
+    Sub-requests per batch call for one ad account, learned from how its batches
+    respond, and the ad sets known to be heavy (paginated or unfinished
+    sub-responses), whose periods are requested in pieces of meta_batch_split_days.
+    Kept for the life of the process, so the account's next sync starts from it.
     """
-    result: dict[str, list[dict]] = {}
 
-    for i in range(0, len(ad_set_ids), BATCH_SIZE):
-        chunk = ad_set_ids[i : i + BATCH_SIZE]
-        batch_requests = []
-        for ad_set_id in chunk:
-            relative_url = (
-                f"{ad_set_id}/insights?"
-                f"fields={INSIGHT_FIELDS}&"
-                f"date_preset={date_preset}&"
-                f"time_increment=1"
-            )
-            batch_requests.append({"method": "GET", "relative_url": relative_url})
+    def __init__(self, account_id: Optional[str]):
+        settings = get_settings()
+        self.account_id = account_id
+        self.min_size = max(1, min(settings.meta_batch_min_size, BATCH_SIZE))
+        self.target_seconds = settings.meta_batch_target_seconds
+        self.size = BATCH_SIZE
+        self.ceiling = BATCH_SIZE
+        self.heavy: set[str] = set()
+
+    def record(self, items: int, seconds: float, cputime_pct: float) -> None:
+        """Adjust the size after a batch of `items` sub-requests answered in `seconds`."""
+        if seconds >= self.target_seconds:
+            self.shrink(items, f"{items} sub-requests took {seconds:.1f}s")
+        elif cputime_pct >= CPUTIME_HIGH_PCT:
+            self.shrink(items, f"total_cputime usage at {cputime_pct:.0f}%")
+        elif items >= self.size and seconds < self.target_seconds / 2 and cputime_pct < CPUTIME_LOW_PCT:
+            if self.size >= self.ceiling:
+                self.ceiling = min(BATCH_SIZE, self.ceiling + 1)
+            self.size = min(self.ceiling, self.size + BATCH_GROW_STEP)
+
+    def shrink(self, items: int, reason: str) -> None:
+        """Halve the size, unless the call of `items` sub-requests predates the last shrink."""
+        if items > self.size:
+            # Sent in parallel before the size came down: the same overload, already acted on
+            return
+        size = max(self.min_size, self.size // 2)
+        self.ceiling = max(self.min_size, self.size - 1)
+        if size < self.size:
+            logger.info(f"Batch size for {self.account_id or 'app'}: {self.size} → {size} ({reason})")
+        self.size = size
 
-        chunk_result = _send_batch_with_retry(client, access_token, chunk, batch_requests, date_preset)
-        result.update(chunk_result)
 
-    return result
+_batch_sizers: dict[str, _BatchSizer] = {}
+_batch_sizers_lock = threading.Lock()
 
 
-def _send_batch_with_retry(
-    client: httpx.Client,
-    access_token: str,
-    chunk: list[str],
-    batch_requests: list[dict],
-    date_preset: str = "last_7d",
-) -> dict[str, list[dict]]:
-    """Send a batch request with retries on rate limit. Returns {ad_set_id: [rows]}."""
-    result: dict[str, list[dict]] = {}
+def _batch_sizer(account_id: Optional[str] = None) -> _BatchSizer:
+    """The account's batch sizer (created at full size on first use)."""
+    key = account_id or ""
+    with _batch_sizers_lock:
+        sizer = _batch_sizers.get(key)
+        if sizer is None:
+            sizer = _batch_sizers[key] = _BatchSizer(account_id)
+        return sizer
 
-    for attempt in range(BATCH_RETRIES + 1):
-        _adaptive_wait()
-        resp = client.post(
-            GRAPH_BASE,
-            data={
-                "access_token": access_token,
-                "batch": json.dumps(batch_requests),
-            },
-            timeout=60,
-        )
 
-        _update_usage_from_headers(resp.headers)
+def _preset_period(date_preset: str) -> Optional[tuple[date, date]]:
+    """(since, until) of a rolling preset, which ends yesterday; None for calendar presets."""
+    since = preset_since(date_preset)
+    return (since, date.today() - timedelta(days=1)) if since else None
+
+
+def _split_period(period: tuple[date, date], days: int) -> list[tuple[date, date]]:
+    """Consecutive pieces of at most `days` days covering period."""
+    since, until = period
+    pieces = []
+    while since <= until:
+        end = min(until, since + timedelta(days=days - 1))
+        pieces.append((since, end))
+        since = end + timedelta(days=1)
+    return pieces
+
+
+def _split_item(item: BatchItem, date_preset: str, days: Optional[int] = None) -> Optional[list[BatchItem]]:
+    """
+    The item's period in pieces of at most `days` days (never more than BATCH_SIZE
+    pieces); without days, in pieces of meta_batch_split_days, or halves if it is no
+    longer than that. None when the item stays whole: a calendar preset, a single
+    day, or a period within `days`.
+    """
+    ad_set_id, period = item
+    period = period or _preset_period(date_preset)
+    if period is None:
+        return None
+    total = (period[1] - period[0]).days + 1
+    if days is None:
+        days = min(get_settings().meta_batch_split_days, -(-total // 2))
+    days = max(1, days, -(-total // BATCH_SIZE))
+    if days >= total:
+        return None
+    return [(ad_set_id, piece) for piece in _split_period(period, days)]
+
+
+def _plan_items(
+    ad_set_id: str,
+    date_preset: str,
+    time_ranges: Optional[TimeRanges],
+    heavy: set[str],
+) -> list[BatchItem]:
+    """Sub-requests for one ad set: its whole period, or pieces of it if it is heavy."""
+    item = (ad_set_id, time_ranges.get(ad_set_id) if time_ranges else None)
+    if ad_set_id not in heavy:
+        return [item]
+    return _split_item(item, date_preset, get_settings().meta_batch_split_days) or [item]
 
-        if resp.status_code != 200:
-            error_data = {}
-            try:
-                error_data = resp.json()
-            except Exception:
-                pass
-            error = error_data.get("error", {})
-            code = error.get("code")
-
-            if code in (17, 32, 4) and attempt < BATCH_RETRIES:
-                # Exponential backoff: 60s, 120s, 240s — and block all calls globally
-                wait = 60 * (2 ** attempt)
-                _mark_rate_limited(wait)
-                logger.warning(
-                    f"Batch rate limited (code {code}), "
-                    f"global backoff {wait}s — retry {attempt + 1}/{BATCH_RETRIES}"
-                )
-                time.sleep(wait)
-                continue
 
-            # Out of retries — mark all ad sets in chunk as empty
-            logger.error(f"Batch failed after {BATCH_RETRIES} retries: {error.get('message', resp.text)}")
-            for ad_set_id in chunk:
-                result[ad_set_id] = []
-            return result
-
-        _clear_rate_limit()
-
-        # Parse batch responses
-        batch_responses = resp.json()
-        if not isinstance(batch_responses, list):
-            logger.error(f"Unexpected batch response type: {type(batch_responses)}")
-            for ad_set_id in chunk:
-                result[ad_set_id] = []
-            return result
-
-        # Check if any individual items in the batch were rate-limited
-        rate_limited_ids = []
-        for j, batch_resp in enumerate(batch_responses):
-            ad_set_id = chunk[j]
+class _ChunkFetch:
+    """
+    Pending sub-requests of one chunk of ad sets and the rows fetched so far. An ad
+    set is only in result() once every piece of its period has been fetched, so all
+    of its rows reach on_chunk together; failed ad sets are left out.
+    """
+
+    def __init__(self, ad_set_ids: list[str], items: list[BatchItem], date_preset: str, sizer: _BatchSizer):
+        self.ad_set_ids = ad_set_ids
+        self.pending = items
+        self.date_preset = date_preset
+        self.sizer = sizer
+        self.rows: dict[str, list[dict]] = {ad_set_id: [] for ad_set_id in ad_set_ids}
+        self.outstanding: dict[str, int] = {ad_set_id: 0 for ad_set_id in ad_set_ids}
+        for ad_set_id, _ in items:
+            self.outstanding[ad_set_id] += 1
+        self.failed: set[str] = set()
+        self.follow: list[tuple[str, str]] = []  # (ad_set_id, paging.next) of unsplittable items
+
+    def fail(self, items: list[BatchItem]) -> None:
+        """Give up on items at the head of pending, and on their ad sets' other pieces."""
+        self.failed.update(ad_set_id for ad_set_id, _ in items)
+        self.pending = [item for item in self.pending[len(items):] if item[0] not in self.failed]
+
+    def split(self, items: list[BatchItem], reason: str) -> list[BatchItem]:
+        """
+        Mark the items' ad sets heavy and replace each splittable item with its pieces,
+        at the front of pending. Returns the items that could not be split.
+        """
+        unsplit, pieces = [], []
+        for item in items:
+            self.sizer.heavy.add(item[0])
+            item_pieces = _split_item(item, self.date_preset)
+            if item_pieces is None:
+                unsplit.append(item)
+                continue
+            self.outstanding[item[0]] += len(item_pieces) - 1
+            pieces.extend(item_pieces)
+        if pieces:
+            logger.info(f"Splitting {len(items) - len(unsplit)} heavy ad sets into {len(pieces)} date ranges ({reason})")
+            self.pending = pieces + self.pending
+        return unsplit
+
+    def parse(self, items: list[BatchItem], batch_responses: list) -> tuple[list[BatchItem], list[BatchItem]]:
+        """
+        Apply the sub-responses for items (the head of pending): store rows and split
+        paginated and unfinished (null) items. Returns the items to send again:
+        (rate-limited, unfinished but not splittable). Other failures drop their ad
+        set, so callers can tell "no delivery" ([]) from "not fetched" (missing).
+        """
+        self.pending = self.pending[len(items):]
+        rate_limited, paginated, unfinished = [], [], []
+        for j, item in enumerate(items):
+            ad_set_id = item[0]
+            batch_resp = batch_responses[j] if j < len(batch_responses) else None
+            if batch_resp is None:
+                # Meta answers null for sub-requests it did not finish in time
+                unfinished.append(item)
+                continue
             status = batch_resp.get("code", 0)
             body_str = batch_resp.get("body", "{}")
             try:
@@ -391,53 +418,729 @@ def _send_batch_with_retry(
                 body = {}
 
             if status == 200:
-                rows = body.get("data", [])
-                rows.sort(key=lambda r: r.get("date_start", ""))
-                result[ad_set_id] = rows
+                next_url = body.get("paging", {}).get("next")
+                if next_url and _split_item(item, self.date_preset) is None:
+                    self.rows[ad_set_id].extend(body.get("data", []))
+                    self.sizer.heavy.add(ad_set_id)
+                    self.follow.append((ad_set_id, next_url))
+                elif next_url:
+                    paginated.append(item)
+                else:
+                    self.rows[ad_set_id].extend(body.get("data", []))
+                    self.outstanding[ad_set_id] -= 1
             else:
                 error = body.get("error", {})
                 err_code = error.get("code")
-                if err_code in (17, 32, 4):
-                    rate_limited_ids.append(ad_set_id)
+                if err_code in RATE_LIMIT_CODES:
+                    rate_limited.append(item)
                 else:
+                    self.failed.add(ad_set_id)
                     logger.warning(
                         f"Batch item {ad_set_id} failed: "
                         f"{error.get('message', f'status {status}')}"
                     )
-                    result[ad_set_id] = []
+        if unfinished:
+            self.sizer.shrink(len(items), f"{len(unfinished)} unfinished sub-responses")
+            unfinished = self.split(unfinished, "unfinished sub-responses")
+        if paginated:
+            self.split(paginated, "paginated sub-responses")
+        if self.failed:
+            self.pending = [item for item in self.pending if item[0] not in self.failed]
+        return rate_limited, unfinished
+
+    def add_pages(self, ad_set_id: str, rows: list[dict]) -> None:
+        self.rows[ad_set_id].extend(rows)
+        self.outstanding[ad_set_id] -= 1
+
+    def paging_failed(self, ad_set_id: str, error: Exception) -> None:
+        logger.warning(f"Paging insights of {ad_set_id} failed: {error}")
+        self.failed.add(ad_set_id)
+
+    def result(self) -> dict[str, list[dict]]:
+        """{ad_set_id: rows sorted by date} for every fully fetched ad set."""
+        result = {}
+        for ad_set_id in self.ad_set_ids:
+            if ad_set_id in self.failed or self.outstanding[ad_set_id] > 0:
+                continue
+            rows = self.rows[ad_set_id]
+            rows.sort(key=lambda r: r.get("date_start", ""))
+            result[ad_set_id] = rows
+        return result
+
+
+class _ChunkQueue:
+    """
+    Ad sets waiting to be fetched, handed out as _ChunkFetch chunks of about
+    sizer.size sub-requests (whole ad sets only). Keeps progress.chunks_total at
+    chunks taken plus the estimate for what is left at the current size.
+    """
+
+    def __init__(
+        self,
+        ad_set_ids: list[str],
+        date_preset: str,
+        time_ranges: Optional[TimeRanges],
+        sizer: _BatchSizer,
+        progress: Optional[SyncProgress] = None,
+    ):
+        self._pending = deque(ad_set_ids)
+        self._date_preset = date_preset
+        self._time_ranges = time_ranges
+        self._sizer = sizer
+        self._progress = progress
+        self._remaining = len(ad_set_ids) + sum(
+            len(_plan_items(a, date_preset, time_ranges, sizer.heavy)) - 1 for a in sizer.heavy.intersection(ad_set_ids)
+        )
+        self._taken = 0
+        self._announced = 0
+        self._announce()
+
+    def __bool__(self) -> bool:
+        return bool(self._pending)
+
+    def take(self) -> _ChunkFetch:
+        size = self._sizer.size
+        chunk: list[str] = []
+        items: list[BatchItem] = []
+        while self._pending:
+            planned = _plan_items(self._pending[0], self._date_preset, self._time_ranges, self._sizer.heavy)
+            if chunk and len(items) + len(planned) > size:
+                break
+            chunk.append(self._pending.popleft())
+            items.extend(planned)
+        self._remaining = max(0, self._remaining - len(items)) if self._pending else 0
+        self._taken += 1
+        self._announce()
+        return _ChunkFetch(chunk, items, self._date_preset, self._sizer)
+
+    def done(self) -> None:
+        if self._progress:
+            self._progress.chunk_done()
+
+    def _announce(self) -> None:
+        if not self._progress:
+            return
+        total = self._taken + -(-self._remaining // self._sizer.size)
+        if total != self._announced:
+            self._progress.add_chunks(total - self._announced)
+            self._announced = total
+
+
+def _batch_insights(
+    client: httpx.Client,
+    access_token: str,
+    ad_set_ids: list[str],
+    date_preset: str,
+    account_id: Optional[str] = None,
+    time_ranges: Optional[TimeRanges] = None,
+    progress: Optional[SyncProgress] = None,
+    on_chunk: Optional[ChunkHandler] = None,
+) -> dict[str, list[dict]]:
+    """
+    Fetch daily insight breakdowns for multiple ad sets in a single batch API call.
+    Returns {ad_set_id: [daily_rows]} for each ad set that was fetched; ad sets whose
+    requests failed are left out. Ad sets in time_ranges are fetched for that range
+    instead of date_preset. With on_chunk, each chunk's result is handed to it as
+    soon as it arrives instead (and {} is returned), so callers can persist while
+    the next chunk is fetched.
+    Meta Batch API: POST / with batch=[{method,relative_url},...] (max 50 per call).
+    Chunks are sized by the account's _BatchSizer, and heavy ad sets are requested
+    in date-range pieces. On rate limit, retries the same batch with exponential
+    backoff (never falls back to individual calls, which would make the rate limit
+    worse).
+    """
+    sizer = _batch_sizer(account_id)
+    queue = _ChunkQueue(ad_set_ids, date_preset, time_ranges, sizer, progress)
+    result: dict[str, list[dict]] = {}
+
+    while queue:
+        fetch = queue.take()
+        _send_batch_with_retry(client, access_token, fetch, account_id=account_id)
+        chunk_result = fetch.result()
+        if on_chunk:
+            on_chunk(chunk_result)
+        else:
+            result.update(chunk_result)
+        queue.done()
+
+    return result
+
+
+def _send_batch_with_retry(
+    client: httpx.Client,
+    access_token: str,
+    fetch: _ChunkFetch,
+    account_id: Optional[str] = None,
+) -> None:
+    """
+    Send the chunk's sub-requests, at most sizer.size per call, until each one is
+    fetched or given up on. Rate-limited calls and items are retried with exponential
+    backoff, timed-out calls with smaller batches; paginated sub-responses are asked
+    again in smaller date ranges (or paged through when they cannot be split).
+    """
+    sizer = fetch.sizer
+    attempt = 0
+    while fetch.pending:
+        items = fetch.pending[:sizer.size]
+        _adaptive_wait(account_id)
+        start = time.perf_counter()
+        try:
+            resp = client.post(GRAPH_BASE, data=_batch_post_data(access_token, fetch, items),
+                               timeout=get_settings().meta_batch_timeout_seconds)
+        except httpx.TimeoutException:
+            attempt += _on_batch_timeout(fetch, items, attempt)
+            continue
+        attempt += _on_batch_response(fetch, items, resp, time.perf_counter() - start, account_id, attempt)
+
+        for ad_set_id, next_url in fetch.follow:
+            try:
+                fetch.add_pages(ad_set_id, _get_all_pages(client, access_token, next_url, None, account_id=account_id))
+            except Exception as e:
+                fetch.paging_failed(ad_set_id, e)
+        fetch.follow = []
+
 
-        if rate_limited_ids and attempt < BATCH_RETRIES:
+def _batch_post_data(access_token: str, fetch: _ChunkFetch, items: list[BatchItem]) -> dict:
+    """Form data of the batch call for items."""
+    return {
+        "access_token": access_token,
+        "batch": json.dumps(_build_batch_requests(items, fetch.date_preset)),
+    }
+
+
+def _on_batch_timeout(fetch: _ChunkFetch, items: list[BatchItem], attempt: int) -> int:
+    """
+    Shrink the batch size after a timed-out call. Returns the retries it used: none
+    while batches can still get smaller, else 1 (and the items are split).
+    """
+    sizer = fetch.sizer
+    if len(items) > sizer.min_size:
+        sizer.shrink(len(items), "timed out")
+        logger.warning(f"Batch of {len(items)} sub-requests timed out — resending in batches of {sizer.size}")
+        return 0
+    if attempt >= BATCH_RETRIES:
+        logger.error(f"Batch of {len(items)} sub-requests timed out after {BATCH_RETRIES} retries")
+        fetch.fail(items)
+        return 0
+    # Already as small as batches get: split what is left instead
+    logger.warning(f"Batch of {len(items)} sub-requests timed out — retry {attempt + 1}/{BATCH_RETRIES}")
+    fetch.pending = fetch.pending[len(items):]
+    fetch.pending = fetch.split(items, "timed out") + fetch.pending
+    return 1
+
+
+def _on_batch_response(
+    fetch: _ChunkFetch,
+    items: list[BatchItem],
+    resp: httpx.Response,
+    seconds: float,
+    account_id: Optional[str],
+    attempt: int,
+) -> int:
+    """
+    Apply one batch response to the chunk and feed the account's sizer. Returns the
+    retries it used (1 when the call or some of its items will be sent again after a
+    rate-limit backoff, else 0).
+    """
+    _update_usage_from_headers(resp.headers)
+
+    if resp.status_code != 200:
+        error = _batch_error(resp)
+        code = error.get("code")
+
+        if code in RATE_LIMIT_CODES and attempt < BATCH_RETRIES:
+            _back_off(attempt, BATCH_RETRIES, account_id, f"Batch rate limited (code {code})", code)
+            return 1
+
+        # Out of retries — these ad sets stay out of the result
+        logger.error(f"Batch failed after {BATCH_RETRIES} retries: {error.get('message', resp.text)}")
+        fetch.fail(items)
+        return 0
+
+    _clear_rate_limit(account_id)
+    fetch.sizer.record(len(items), seconds, get_governor().cputime_pct(account_id))
+
+    batch_responses = resp.json()
+    if not isinstance(batch_responses, list):
+        logger.error(f"Unexpected batch response type: {type(batch_responses)}")
+        fetch.fail(items)
+        return 0
+
+    # Check if any individual items in the batch were rate-limited (or left unfinished)
+    rate_limited, unfinished = fetch.parse(items, batch_responses)
+    retry = rate_limited + unfinished
+    if retry and attempt < BATCH_RETRIES:
+        if rate_limited:
             # Some items rate-limited — wait and retry just those
-            wait = 60 * (2 ** attempt)
-            _mark_rate_limited(wait)
-            logger.warning(
-                f"{len(rate_limited_ids)} batch items rate-limited, "
-                f"global backoff {wait}s — retry {attempt + 1}/{BATCH_RETRIES}"
+            _back_off(attempt, BATCH_RETRIES, account_id, f"{len(rate_limited)} batch items rate-limited")
+        fetch.pending = retry + fetch.pending
+        return 1
+    if retry:
+        # Out of retries, the remaining ad sets stay out of the result
+        logger.error(f"{len(retry)} batch items still rate-limited or unfinished after {BATCH_RETRIES} retries")
+        fetch.pending = retry + fetch.pending
+        fetch.fail(retry)
+    return 0
+
+
+# ── Account-level insights ───────────────────────────────────────
+# One act_<id>/insights?level=adset&time_increment=1 query returns a row per
+# (ad set, day) with delivery, paged by cursor, instead of one batch sub-request per
+# ad set. Idle ad sets cost nothing. Long ranges go through Meta's async report
+# runs (POST, poll async_status, then page the run's insights).
+
+ACCOUNT_INSIGHTS_PAGE_SIZE = 500
+
+# Approximate day counts, used to decide when a preset needs an async report run
+PRESET_DAYS = {
+    "yesterday": 1, "last_3d": 3, "last_7d": 7, "last_14d": 14, "last_28d": 28,
+    "last_30d": 30, "last_90d": 90, "this_month": 31, "last_month": 31,
+    "this_quarter": 92, "last_quarter": 92, "this_year": 366, "last_year": 366,
+    "maximum": 1131, "data_maximum": 1131,
+}
+
+# Presets covering the N days before today
+ROLLING_PRESETS = {"yesterday", "last_3d", "last_7d", "last_14d", "last_28d", "last_30d", "last_90d"}
+
+REPORT_DONE = "Job Completed"
+REPORT_FAILED = ("Job Failed", "Job Skipped")
+REPORT_STATUS_PARAMS = {"fields": "async_status,async_percent_completion"}
+REPORT_PAGE_PARAMS = {"limit": ACCOUNT_INSIGHTS_PAGE_SIZE}
+
+
+def preset_since(date_preset: str) -> Optional[date]:
+    """First day covered by a rolling last_Nd / yesterday preset (None for calendar presets)."""
+    if date_preset not in ROLLING_PRESETS:
+        return None
+    return date.today() - timedelta(days=PRESET_DAYS[date_preset])
+
+
+def _account_insight_params(
+    date_preset: str,
+    time_range: Optional[tuple[date, date]] = None,
+) -> dict:
+    params = {
+        "level": "adset",
+        "fields": ACCOUNT_INSIGHT_FIELDS,
+        "time_increment": 1,
+        "limit": ACCOUNT_INSIGHTS_PAGE_SIZE,
+    }
+    if time_range:
+        since, until = time_range
+        params["time_range"] = json.dumps({"since": since.isoformat(), "until": until.isoformat()})
+    else:
+        params["date_preset"] = date_preset
+    return params
+
+
+def _use_report_run(date_preset: str, time_range: Optional[tuple[date, date]] = None) -> bool:
+    """Whether the period is long enough for an async report run."""
+    if time_range:
+        days = (time_range[1] - time_range[0]).days + 1
+    else:
+        days = PRESET_DAYS.get(date_preset, 0)
+    return days >= get_settings().async_report_min_days
+
+
+def _split_by_ad_set(
+    rows: list[dict],
+    ad_set_ids: list[str],
+    include_empty: bool = True,
+) -> dict[str, list[dict]]:
+    """
+    {ad_set_id: [daily_rows sorted by date]} for the requested ad sets. With
+    include_empty (the whole account query succeeded), ad sets without rows had no
+    delivery and map to []; for a single page they are left out. Rows for ad sets
+    not requested are dropped.
+    """
+    wanted = set(ad_set_ids)
+    result: dict[str, list[dict]] = {ad_set_id: [] for ad_set_id in ad_set_ids} if include_empty else {}
+    for row in rows:
+        ad_set_id = str(row.get("adset_id"))
+        if ad_set_id in wanted:
+            result.setdefault(ad_set_id, []).append(row)
+    for bucket in result.values():
+        bucket.sort(key=lambda r: r.get("date_start", ""))
+    return result
+
+
+def _page(data: dict) -> tuple[list[dict], Optional[str]]:
+    """Rows of one page of a Graph edge, and the paging.next URL (None on the last page)."""
+    return data.get("data", []), data.get("paging", {}).get("next")
+
+
+def _report_run_id(run: dict, account_id: str) -> str:
+    """report_run_id of a just-started report run; raises if Meta did not start one."""
+    report_run_id = run.get("report_run_id")
+    if not report_run_id:
+        raise Exception(f"Async report for {account_id} returned no report_run_id")
+    logger.info(f"Started async insights report {report_run_id} for {account_id}")
+    return report_run_id
+
+
+def _report_done(data: dict, report_run_id: str, deadline: float) -> bool:
+    """
+    Whether a polled report run has completed. Raises if Meta gave up on it or it is
+    still running past the deadline (a time.monotonic() value).
+    """
+    status = data.get("async_status", "")
+    if status in REPORT_FAILED:
+        raise Exception(f"Async report {report_run_id} ended with status '{status}'")
+    if status == REPORT_DONE:
+        return True
+    if time.monotonic() > deadline:
+        raise Exception(f"Async report {report_run_id} timed out at {data.get('async_percent_completion', 0)}%")
+    return False
+
+
+def _account_page_handler(on_chunk: Optional[Callable[[dict], Any]], ad_set_ids: list[str]) -> Optional[Callable]:
+    """
+    on_page for an account insights query: splits each page and hands it to on_chunk,
+    returning what on_chunk returns (so the async variant can await it).
+    """
+    if not on_chunk:
+        return None
+    return lambda page: on_chunk(_split_by_ad_set(page, ad_set_ids, include_empty=False))
+
+
+def _account_insights_result(rows: list[dict], ad_set_ids: list[str], account_id: str, streamed: bool) -> dict:
+    """What get_account_insights returns once its rows are in ({} when they were streamed)."""
+    if streamed:
+        return {}
+    logger.info(f"Got {len(rows)} ad set-day insight rows for {account_id}")
+    return _split_by_ad_set(rows, ad_set_ids)
+
+
+def _get_all_pages(
+    client: httpx.Client,
+    access_token: str,
+    path: str,
+    params: Optional[dict],
+    account_id: Optional[str] = None,
+    progress: Optional[SyncProgress] = None,
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+) -> list[dict]:
+    """
+    GET a Graph edge and follow paging.next until the cursor runs out (one progress
+    chunk per page). With on_page, each page's rows are handed to it instead of
+    collected, and [] is returned.
+    """
+    rows: list[dict] = []
+    next_path, next_params = path, params
+    while next_path:
+        if progress:
+            progress.add_chunks()
+        page, next_path = _page(_graph_get(client, access_token, next_path, next_params, account_id=account_id))
+        if on_page:
+            on_page(page)
+        else:
+            rows.extend(page)
+        if progress:
+            progress.chunk_done()
+        next_params = None
+    return rows
+
+
+def _run_report(
+    client: httpx.Client,
+    access_token: str,
+    account_id: str,
+    params: dict,
+    progress: Optional[SyncProgress] = None,
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+) -> list[dict]:
+    """Start an async insights report run, poll it to completion and page its rows."""
+    settings = get_settings()
+    run = _graph_post(client, access_token, f"{account_id}/insights", params, account_id=account_id)
+    report_run_id = _report_run_id(run, account_id)
+
+    deadline = time.monotonic() + settings.async_report_timeout_seconds
+    while not _report_done(
+        _graph_get(client, access_token, report_run_id, REPORT_STATUS_PARAMS, account_id=account_id),
+        report_run_id, deadline,
+    ):
+        time.sleep(settings.async_report_poll_seconds)
+
+    return _get_all_pages(client, access_token, f"{report_run_id}/insights", REPORT_PAGE_PARAMS,
+                          account_id=account_id, progress=progress, on_page=on_page)
+
+
+def get_account_insights(
+    client: httpx.Client,
+    access_token: str,
+    account_id: str,
+    ad_set_ids: list[str],
+    date_preset: str,
+    time_range: Optional[tuple[date, date]] = None,
+    progress: Optional[SyncProgress] = None,
+    on_chunk: Optional[ChunkHandler] = None,
+) -> dict[str, list[dict]]:
+    """
+    Daily insights for every ad set in the account from one level=adset query
+    (time_range wins over date_preset). Returns {ad_set_id: [daily_rows]} for all of
+    ad_set_ids, the same shape as _batch_insights. Raises if the query fails.
+    With on_chunk, each result page is split and handed to it instead (and {} is
+    returned). An ad set's rows can span pages, and ad sets without delivery never
+    appear in a chunk.
+    """
+    account_id = _ensure_act_prefix(account_id)
+    params = _account_insight_params(date_preset, time_range)
+    on_page = _account_page_handler(on_chunk, ad_set_ids)
+    if _use_report_run(date_preset, time_range):
+        rows = _run_report(client, access_token, account_id, params, progress=progress, on_page=on_page)
+    else:
+        rows = _get_all_pages(
+            client, access_token, f"{account_id}/insights", params, account_id=account_id,
+            progress=progress, on_page=on_page,
+        )
+    return _account_insights_result(rows, ad_set_ids, account_id, streamed=on_chunk is not None)
+
+
+# ── Async client ─────────────────────────────────────────────────
+# The blocking functions above with awaited transport calls and sleeps: response
+# handling, retries and paging go through the same helpers, but several batch chunks
+# can be in flight at once. Calls still take slots from the account's rate governor,
+# so request starts stay spaced by its token bucket and the number of chunks in
+# flight shrinks as Meta reports higher usage.
+
+
+def _max_in_flight(concurrency: int, account_id: Optional[str] = None) -> int:
+    """Number of batch chunks allowed in flight at the account's current usage level."""
+    usage = get_governor().usage_pct(account_id)
+    if usage >= 60:
+        return 1
+    if usage >= 40:
+        return max(1, concurrency // 2)
+    return max(1, concurrency)
+
+
+class _InFlightLimiter:
+    """Semaphore whose capacity follows _max_in_flight() as usage changes."""
+
+    def __init__(self, concurrency: int, account_id: Optional[str] = None):
+        self._concurrency = concurrency
+        self._account_id = account_id
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self._in_flight < _max_in_flight(self._concurrency, self._account_id)
             )
-            time.sleep(wait)
-            # Rebuild batch for only the failed items
-            chunk = rate_limited_ids
-            batch_requests = []
-            for ad_set_id in chunk:
-                relative_url = (
-                    f"{ad_set_id}/insights?"
-                    f"fields={INSIGHT_FIELDS}&"
-                    f"date_preset={date_preset}&"
-                    f"time_increment=1"
-                )
-                batch_requests.append({"method": "GET", "relative_url": relative_url})
-            continue
-        elif rate_limited_ids:
-            # Out of retries, mark remaining as empty
-            for ad_set_id in rate_limited_ids:
-                result[ad_set_id] = []
+            self._in_flight += 1
 
-        # All done for this chunk
-        return result
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
 
+
+async def _adaptive_wait_async(account_id: Optional[str] = None) -> None:
+    """Async counterpart of _adaptive_wait: reserves the account's next slot, then awaits it."""
+    await get_governor().wait_async(account_id)
+
+
+async def _graph_call_async(
+    send: Callable[[], Awaitable[httpx.Response]],
+    retries: int,
+    account_id: Optional[str],
+) -> dict:
+    """Async counterpart of _graph_call."""
+    for attempt in range(retries + 1):
+        await _adaptive_wait_async(account_id)
+        data = _graph_response(await send(), attempt, retries, account_id)
+        if data is not None:
+            return data
+    raise Exception("Graph API call failed after all retries")
+
+
+async def _graph_get_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    path: str,
+    params: dict | None = None,
+    retries: int = 3,
+    account_id: Optional[str] = None,
+) -> dict:
+    """Async counterpart of _graph_get."""
+    url, params = _graph_url(access_token, path, params)
+    return await _graph_call_async(lambda: client.get(url, params=params, timeout=30), retries, account_id)
+
+
+async def _graph_post_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    path: str,
+    data: dict | None = None,
+    retries: int = 3,
+    account_id: Optional[str] = None,
+) -> dict:
+    """Async counterpart of _graph_post."""
+    data = {**(data or {}), "access_token": access_token}
+    return await _graph_call_async(
+        lambda: client.post(f"{GRAPH_BASE}/{path}", data=data, timeout=30), retries, account_id,
+    )
+
+
+async def get_ad_sets_async(client: httpx.AsyncClient, access_token: str, account_id: str) -> list[dict]:
+    """Async counterpart of get_ad_sets (pages are still fetched in order)."""
+    account_id = _ensure_act_prefix(account_id)
+    logger.info(f"Fetching ad sets for {account_id}")
+    ad_sets = await _get_all_pages_async(
+        client, access_token, f"{account_id}/adsets", AD_SET_PARAMS, account_id=account_id,
+    )
+    logger.info(f"Got {len(ad_sets)} ad sets")
+    return ad_sets
+
+
+async def _batch_insights_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    ad_set_ids: list[str],
+    date_preset: str,
+    concurrency: Optional[int] = None,
+    account_id: Optional[str] = None,
+    time_ranges: Optional[TimeRanges] = None,
+    progress: Optional[SyncProgress] = None,
+    on_chunk: Optional[AsyncChunkHandler] = None,
+) -> dict[str, list[dict]]:
+    """
+    Async counterpart of _batch_insights: keeps up to `concurrency` chunks in flight
+    at once (default: meta_batch_concurrency setting). Each chunk is taken once it has
+    a slot, so it is sized by what the batches before it taught the sizer.
+    Returns {ad_set_id: [daily_rows]} for each ad set that was fetched. on_chunk is
+    awaited while the chunk still holds its in-flight slot, so a slow consumer
+    throttles fetching and at most `concurrency` fetched chunks wait in memory.
+    """
+    concurrency = concurrency or get_settings().meta_batch_concurrency
+    limiter = _InFlightLimiter(concurrency, account_id)
+    sizer = _batch_sizer(account_id)
+    queue = _ChunkQueue(ad_set_ids, date_preset, time_ranges, sizer, progress)
+    result: dict[str, list[dict]] = {}
+
+    async def _worker() -> None:
+        while queue:
+            async with limiter:
+                if not queue:
+                    return
+                fetch = queue.take()
+                await _send_batch_with_retry_async(client, access_token, fetch, account_id=account_id)
+                chunk_result = fetch.result()
+                if on_chunk:
+                    await on_chunk(chunk_result)
+                else:
+                    result.update(chunk_result)
+            queue.done()
+
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
     return result
 
 
+async def _send_batch_with_retry_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    fetch: _ChunkFetch,
+    account_id: Optional[str] = None,
+) -> None:
+    """Async counterpart of _send_batch_with_retry."""
+    sizer = fetch.sizer
+    attempt = 0
+    while fetch.pending:
+        items = fetch.pending[:sizer.size]
+        await _adaptive_wait_async(account_id)
+        start = time.perf_counter()
+        try:
+            resp = await client.post(GRAPH_BASE, data=_batch_post_data(access_token, fetch, items),
+                                     timeout=get_settings().meta_batch_timeout_seconds)
+        except httpx.TimeoutException:
+            attempt += _on_batch_timeout(fetch, items, attempt)
+            continue
+        attempt += _on_batch_response(fetch, items, resp, time.perf_counter() - start, account_id, attempt)
+
+        for ad_set_id, next_url in fetch.follow:
+            try:
+                rows = await _get_all_pages_async(client, access_token, next_url, None, account_id=account_id)
+                fetch.add_pages(ad_set_id, rows)
+            except Exception as e:
+                fetch.paging_failed(ad_set_id, e)
+        fetch.follow = []
+
+
+async def _get_all_pages_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    path: str,
+    params: Optional[dict],
+    account_id: Optional[str] = None,
+    progress: Optional[SyncProgress] = None,
+    on_page: Optional[Callable[[list[dict]], Awaitable[None]]] = None,
+) -> list[dict]:
+    """Async counterpart of _get_all_pages."""
+    rows: list[dict] = []
+    next_path, next_params = path, params
+    while next_path:
+        if progress:
+            progress.add_chunks()
+        page, next_path = _page(await _graph_get_async(client, access_token, next_path, next_params, account_id=account_id))
+        if on_page:
+            await on_page(page)
+        else:
+            rows.extend(page)
+        if progress:
+            progress.chunk_done()
+        next_params = None
+    return rows
+
+
+async def _run_report_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    account_id: str,
+    params: dict,
+    progress: Optional[SyncProgress] = None,
+    on_page: Optional[Callable[[list[dict]], Awaitable[None]]] = None,
+) -> list[dict]:
+    """Async counterpart of _run_report."""
+    settings = get_settings()
+    run = await _graph_post_async(client, access_token, f"{account_id}/insights", params, account_id=account_id)
+    report_run_id = _report_run_id(run, account_id)
+
+    deadline = time.monotonic() + settings.async_report_timeout_seconds
+    while not _report_done(
+        await _graph_get_async(client, access_token, report_run_id, REPORT_STATUS_PARAMS, account_id=account_id),
+        report_run_id, deadline,
+    ):
+        await asyncio.sleep(settings.async_report_poll_seconds)
+
+    return await _get_all_pages_async(client, access_token, f"{report_run_id}/insights", REPORT_PAGE_PARAMS,
+                                      account_id=account_id, progress=progress, on_page=on_page)
+
+
+async def get_account_insights_async(
+    client: httpx.AsyncClient,
+    access_token: str,
+    account_id: str,
+    ad_set_ids: list[str],
+    date_preset: str,
+    time_range: Optional[tuple[date, date]] = None,
+    progress: Optional[SyncProgress] = None,
+    on_chunk: Optional[AsyncChunkHandler] = None,
+) -> dict[str, list[dict]]:
+    """Async counterpart of get_account_insights."""
+    account_id = _ensure_act_prefix(account_id)
+    params = _account_insight_params(date_preset, time_range)
+    on_page = _account_page_handler(on_chunk, ad_set_ids)
+    if _use_report_run(date_preset, time_range):
+        rows = await _run_report_async(client, access_token, account_id, params, progress=progress, on_page=on_page)
+    else:
+        rows = await _get_all_pages_async(
+            client, access_token, f"{account_id}/insights", params, account_id=account_id,
+            progress=progress, on_page=on_page,
+        )
+    return _account_insights_result(rows, ad_set_ids, account_id, streamed=on_chunk is not None)
+
+
 def get_insights_daily(
     client: httpx.Client,
     access_token: str,
@@ -460,23 +1163,15 @@ def get_insights_daily(
 
 def aggregate_windows_from_rows(rows: list[dict]) -> dict[int, dict]:
     """
-    Aggregate daily rows into 1d, 3d, 7d windows.
+    Aggregate daily rows into 1d, 3d, 7d windows (the last N rows, or all of them if
+    fewer). Rows are parsed once and the windows come from cumulative sums.
     Returns {1: {...}, 3: {...}, 7: {...}} with metrics for each window.
     """
     if not rows:
         return {}
-    result = {}
-    n = len(rows)
-    if n >= 1:
-        result[1] = _compute_metrics_from_row(rows[-1])
-    if n >= 3:
-        result[3] = _aggregate_daily_rows(rows[-3:])
-    elif n >= 1:
-        result[3] = _aggregate_daily_rows(rows)
-    if n >= 7:
-        result[7] = _aggregate_daily_rows(rows[-7:])
-    elif n >= 1:
-        result[7] = _aggregate_daily_rows(rows)
+    columns = parse_insight_rows(rows[-7:])
+    result = {1: row_metrics(columns, len(columns) - 1)}
+    result.update(trailing_window_metrics(columns, (3, 7)))
     return result
 
 
@@ -1,14 +1,15 @@
 """Metrics normalization and composite scoring."""
 from datetime import date, timedelta
 from decimal import Decimal
-from statistics import median
 from typing import Optional
 
+import numpy as np
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.services.effective_settings import get_effective_settings
-from app.models import Audience, MetricSnapshot
+from app.models import Audience, DailyInsight, LatestAudienceMetric
 from app.utils.cache import (
     cache_get, cache_set, _make_key,
     PREFIX_BENCHMARKS, TTL_BENCHMARKS,
@@ -16,24 +17,104 @@ from app.utils.cache import (
 )
 
 
-def _get_latest_snapshot(db: Session, audience_id: str, window_days: int = 7) -> Optional[MetricSnapshot]:
-    today = date.today()
+def _get_latest_snapshot(db: Session, audience_id: str, window_days: int = 7) -> Optional[LatestAudienceMetric]:
+    """The audience's latest snapshot for the window (up to today), from latest_audience_metrics."""
     return (
-        db.query(MetricSnapshot)
+        db.query(LatestAudienceMetric)
         .filter(
-            MetricSnapshot.audience_id == audience_id,
-            MetricSnapshot.window_days == window_days,
-            MetricSnapshot.snapshot_date <= today,
+            LatestAudienceMetric.audience_id == audience_id,
+            LatestAudienceMetric.window_days == window_days,
+            LatestAudienceMetric.snapshot_date <= date.today(),
         )
-        .order_by(MetricSnapshot.snapshot_date.desc())
         .first()
     )
 
 
+def _latest_account_snapshots(account_id: str, window_days: int = 7):
+    """
+    Subquery: each of the account's audiences' latest snapshot for the window (up to
+    today), one latest_audience_metrics row per audience. id is the snapshot's ID.
+    """
+    return (
+        select(
+            LatestAudienceMetric.snapshot_id.label("id"),
+            LatestAudienceMetric.audience_id,
+            LatestAudienceMetric.snapshot_date,
+            LatestAudienceMetric.spend,
+            LatestAudienceMetric.revenue,
+            LatestAudienceMetric.purchases,
+            LatestAudienceMetric.roas,
+            LatestAudienceMetric.cpa,
+            LatestAudienceMetric.cvr,
+            LatestAudienceMetric.clicks,
+            LatestAudienceMetric.impressions,
+        )
+        .join(Audience, Audience.id == LatestAudienceMetric.audience_id)
+        .where(
+            Audience.account_id == account_id,
+            LatestAudienceMetric.window_days == window_days,
+            LatestAudienceMetric.snapshot_date <= date.today(),
+        )
+        .subquery()
+    )
+
+
+def _benchmark_statement(db: Session, account_id: str, min_spend: float):
+    """
+    One SELECT over the account's latest 7d snapshots of (audiences with spend >=
+    min_spend, their avg ROAS, median spend and avg CVR, median purchases of all
+    audiences). ROAS and CVR average their positive values. PostgreSQL takes the
+    medians with percentile_cont; elsewhere (SQLite) a median is the mean of the
+    middle row(s) by ROW_NUMBER().
+    """
+    latest = _latest_account_snapshots(account_id, 7)
+    spend = func.coalesce(latest.c.spend, 0)
+    purchases = func.coalesce(latest.c.purchases, 0)
+    qualifying = spend >= min_spend
+
+    if db.get_bind().dialect.name == "postgresql":
+        return select(
+            func.count().filter(qualifying),
+            func.avg(case((qualifying & (latest.c.roas > 0), latest.c.roas))),
+            func.percentile_cont(0.5).within_group(spend).filter(qualifying),
+            func.avg(case((qualifying & (latest.c.cvr > 0), latest.c.cvr))),
+            func.percentile_cont(0.5).within_group(purchases),
+        )
+
+    ordered = (
+        select(
+            spend.label("spend"),
+            latest.c.roas,
+            latest.c.cvr,
+            purchases.label("purchases"),
+            qualifying.label("qualifying"),
+            func.row_number().over(partition_by=qualifying, order_by=spend).label("spend_position"),
+            func.count().over(partition_by=qualifying).label("spend_total"),
+            func.row_number().over(order_by=purchases).label("purchases_position"),
+            func.count().over().label("total"),
+        )
+        .subquery()
+    )
+
+    def middle(position, total):
+        return position.in_([(total + 1) // 2, (total + 2) // 2])
+
+    q = ordered.c.qualifying
+    return select(
+        func.count(case((q, 1))),
+        func.avg(case((q & (ordered.c.roas > 0), ordered.c.roas))),
+        func.avg(case((q & middle(ordered.c.spend_position, ordered.c.spend_total), ordered.c.spend))),
+        func.avg(case((q & (ordered.c.cvr > 0), ordered.c.cvr))),
+        func.avg(case((middle(ordered.c.purchases_position, ordered.c.total), ordered.c.purchases))),
+    )
+
+
 def get_account_benchmarks(db: Session, account_id: str) -> dict:
     """
-    Compute account-level benchmarks from audiences with 7d snapshots above MIN_SPEND.
-    Returns: account_avg_roas, median_spend, account_avg_cvr, target_cpa (from config).
+    Compute account-level benchmarks from audiences with 7d snapshots above MIN_SPEND,
+    in one statement (see _benchmark_statement).
+    Returns: account_avg_roas, median_spend, account_avg_cvr, target_cpa (from config),
+    median_purchases (latest 7d snapshot of every audience, for purchase volume scores).
     """
     cache_key = PREFIX_BENCHMARKS + _make_key("account", account_id)
     cached = cache_get(cache_key)
@@ -42,22 +123,12 @@ def get_account_benchmarks(db: Session, account_id: str) -> dict:
 
     settings = get_effective_settings(db)
     min_spend = float(settings.min_spend)
-    audiences = db.query(Audience).filter(Audience.account_id == account_id).all()
-    roas_list = []
-    spend_list = []
-    cvr_list = []
-    for a in audiences:
-        snap = _get_latest_snapshot(db, a.id, 7)
-        if not snap or float(snap.spend or 0) < min_spend:
-            continue
-        if snap.roas is not None and float(snap.roas) > 0:
-            roas_list.append(float(snap.roas))
-        spend_list.append(float(snap.spend or 0))
-        if snap.cvr is not None and float(snap.cvr) > 0:
-            cvr_list.append(float(snap.cvr))
-    account_avg_roas = sum(roas_list) / len(roas_list) if roas_list else 1.0
-    median_spend = median(spend_list) if spend_list else min_spend
-    account_avg_cvr = sum(cvr_list) / len(cvr_list) if cvr_list else 0.01
+    qualifying, avg_roas, median_spend, avg_cvr, median_purchases = db.execute(
+        _benchmark_statement(db, account_id, min_spend)
+    ).one()
+    account_avg_roas = float(avg_roas) if avg_roas is not None else 1.0
+    median_spend = float(median_spend) if qualifying else min_spend
+    account_avg_cvr = float(avg_cvr) if avg_cvr is not None else 0.01
     # target_cpa: derive from median spend and median purchases
     target_cpa = (median_spend / 2) if median_spend > 0 else float(settings.min_spend)
     result = {
@@ -65,6 +136,7 @@ def get_account_benchmarks(db: Session, account_id: str) -> dict:
         "median_spend": median_spend,
         "account_avg_cvr": account_avg_cvr,
         "target_cpa": target_cpa,
+        "median_purchases": float(median_purchases) if median_purchases is not None else 1,
     }
     cache_set(cache_key, result, TTL_BENCHMARKS)
     return result
@@ -120,15 +192,7 @@ def compute_audience_metrics(
     normalized_spend = (spend / median_spend) if median_spend else 0
     normalized_cvr = (cvr / account_avg_cvr) if (cvr and account_avg_cvr) else 0
     # Purchase volume score: cap at 2x median purchase count for 7d
-    acc_id = account_id
-    all_purchases = []
-    if acc_id:
-        snaps = db.query(MetricSnapshot).join(Audience).filter(
-            Audience.account_id == acc_id,
-            MetricSnapshot.window_days == 7,
-        ).all()
-        all_purchases = [int(s.purchases or 0) for s in snaps]
-    median_purchases = median(all_purchases) if all_purchases else 1
+    median_purchases = account_benchmarks.get("median_purchases", 1)
     purchase_volume_score = min(2.0, (purchases / median_purchases) if median_purchases else 0)
 
     settings = get_effective_settings(db)
@@ -141,7 +205,7 @@ def compute_audience_metrics(
 
     result = {
         "audience_id": audience_id,
-        "snapshot_id": snap.id,
+        "snapshot_id": snap.snapshot_id,
         "snapshot_date": snap.snapshot_date,
         "window_days": 7,
         "spend": spend,
@@ -164,9 +228,112 @@ def compute_audience_metrics(
     return result
 
 
+def _floats(values) -> np.ndarray:
+    """Numeric column values as float64, NULL as NaN."""
+    return np.array([float(v) if v is not None else np.nan for v in values], dtype=np.float64)
+
+
+def compute_account_metrics(
+    db: Session,
+    account_id: str,
+    account_benchmarks: Optional[dict] = None,
+) -> dict[str, dict]:
+    """
+    compute_audience_metrics for every audience of the account at once: the latest 7d
+    snapshots are loaded in one query and normalized and scored as NumPy arrays.
+    Returns {audience_id: metrics dict}; audiences without a 7d snapshot are left out.
+    Cached per account and benchmark values, so scores for other benchmarks are not
+    served from the cache.
+    """
+    account_benchmarks = account_benchmarks or get_account_benchmarks(db, account_id)
+    scored_by = ("account_avg_roas", "median_spend", "account_avg_cvr", "median_purchases")
+    cache_key = PREFIX_METRICS + _make_key(
+        "account", account_id, [account_benchmarks.get(key) for key in scored_by],
+    )
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    latest = _latest_account_snapshots(account_id, 7)
+    rows = db.execute(select(latest)).all()
+    if not rows:
+        return {}
+    (
+        snapshot_ids, audience_ids, snapshot_dates, spend_col, revenue_col, purchases_col,
+        roas_col, cpa_col, cvr_col, clicks_col, impressions_col,
+    ) = zip(*rows)
+
+    account_avg_roas = account_benchmarks["account_avg_roas"]
+    median_spend = account_benchmarks["median_spend"]
+    account_avg_cvr = account_benchmarks["account_avg_cvr"]
+    median_purchases = account_benchmarks.get("median_purchases", 1)
+
+    roas = np.nan_to_num(_floats(roas_col), nan=0.0)
+    spend = np.nan_to_num(_floats(spend_col), nan=0.0)
+    cvr = np.nan_to_num(_floats(cvr_col), nan=0.0)
+    purchases = np.array([int(v or 0) for v in purchases_col], dtype=np.float64)
+    zeros = np.zeros(len(rows))
+
+    normalized_roas = (
+        np.where(roas != 0, roas / account_avg_roas, 0.0) if account_avg_roas else zeros
+    )
+    normalized_spend = spend / median_spend if median_spend else zeros
+    normalized_cvr = np.where(cvr != 0, cvr / account_avg_cvr, 0.0) if account_avg_cvr else zeros
+    # Purchase volume score: cap at 2x median purchase count for 7d
+    purchase_volume_score = np.minimum(2.0, purchases / median_purchases) if median_purchases else zeros
+
+    settings = get_effective_settings(db)
+    composite = (
+        normalized_roas * settings.roas_weight
+        + normalized_spend * settings.spend_weight
+        + normalized_cvr * settings.cvr_weight
+        + purchase_volume_score * settings.volume_weight
+    )
+
+    columns = zip(
+        audience_ids, snapshot_ids, snapshot_dates, spend.tolist(), revenue_col, purchases_col, roas_col,
+        cpa_col, cvr.tolist(), clicks_col, impressions_col, normalized_roas.tolist(), normalized_spend.tolist(),
+        normalized_cvr.tolist(), purchase_volume_score.tolist(), composite.tolist(),
+    )
+    result = {}
+    for (
+        audience_id, snapshot_id, snapshot_date, spend_i, revenue_i, purchases_i, roas_i, cpa_i, cvr_i,
+        clicks_i, impressions_i, normalized_roas_i, normalized_spend_i, normalized_cvr_i, volume_i, composite_i,
+    ) in columns:
+        result[audience_id] = {
+            "audience_id": audience_id,
+            "snapshot_id": snapshot_id,
+            "snapshot_date": snapshot_date,
+            "window_days": 7,
+            "spend": spend_i,
+            "revenue": _float_or_none(revenue_i),
+            "purchases": int(purchases_i or 0),
+            "roas": _float_or_none(roas_i),
+            "cpa": _float_or_none(cpa_i),
+            "cvr": cvr_i,
+            "clicks": int(clicks_i or 0),
+            "impressions": int(impressions_i or 0),
+            "normalized_roas": normalized_roas_i,
+            "normalized_spend": normalized_spend_i,
+            "normalized_cvr": normalized_cvr_i,
+            "purchase_volume_score": volume_i,
+            "composite_score": round(composite_i, 4),
+            "account_avg_roas": account_avg_roas,
+            "median_spend": median_spend,
+        }
+    cache_set(cache_key, result, TTL_METRICS)
+    return result
+
+
+def _no_trend_metrics() -> dict:
+    """Time-based metrics of an audience with fewer than 2 days of facts."""
+    return {"roas_slope": 0, "cpa_volatility": 0, "spend_acceleration": 1.0, "dod_roas_change": 0}
+
+
 def get_time_based_metrics(db: Session, audience_id: str) -> dict:
     """
-    Compute ROAS slope, CPA volatility, spend acceleration from daily snapshots (window_days=1).
+    Compute ROAS slope, CPA volatility, spend acceleration from the last 14 days of
+    daily facts (daily_insights).
     """
     cache_key = PREFIX_METRICS + _make_key("timebased", audience_id)
     cached = cache_get(cache_key)
@@ -174,23 +341,29 @@ def get_time_based_metrics(db: Session, audience_id: str) -> dict:
         return cached
 
     today = date.today()
-    snapshots = (
-        db.query(MetricSnapshot)
+    days = (
+        db.query(DailyInsight)
         .filter(
-            MetricSnapshot.audience_id == audience_id,
-            MetricSnapshot.window_days == 1,
-            MetricSnapshot.snapshot_date <= today,
-            MetricSnapshot.snapshot_date >= today - timedelta(days=14),
+            DailyInsight.audience_id == audience_id,
+            DailyInsight.insight_date <= today,
+            DailyInsight.insight_date >= today - timedelta(days=14),
         )
-        .order_by(MetricSnapshot.snapshot_date.asc())
+        .order_by(DailyInsight.insight_date.asc())
         .all()
     )
-    if len(snapshots) < 2:
-        return {"roas_slope": 0, "cpa_volatility": 0, "spend_acceleration": 1.0, "dod_roas_change": 0}
+    if len(days) < 2:
+        return _no_trend_metrics()
 
-    roas_series = [_float_or_none(s.roas) or 0 for s in snapshots]
-    cpa_series = [_float_or_none(s.cpa) or 0 for s in snapshots if _float_or_none(s.cpa)]
-    spend_series = [_float_or_none(s.spend) or 0 for s in snapshots]
+    spend_series = [_float_or_none(d.spend) or 0 for d in days]
+    roas_series = [
+        (float(d.revenue or 0) / spend) if spend > 0 else 0
+        for d, spend in zip(days, spend_series)
+    ]
+    cpa_series = [
+        spend / d.purchases
+        for d, spend in zip(days, spend_series)
+        if d.purchases and spend > 0
+    ]
 
     # Linear regression slope for ROAS
     n = len(roas_series)
@@ -225,3 +398,87 @@ def get_time_based_metrics(db: Session, audience_id: str) -> dict:
     }
     cache_set(cache_key, result, TTL_METRICS)
     return result
+
+
+def get_account_time_based_metrics(db: Session, account_id: str) -> dict[str, dict]:
+    """
+    get_time_based_metrics for every audience of the account with daily facts: the
+    same 14 days are loaded in one query ordered by audience and date, and reduced
+    per audience with np.bincount over each row's audience index. Every result is
+    also stored in its audience's get_time_based_metrics cache entry.
+    """
+    today = date.today()
+    rows = db.execute(
+        select(DailyInsight.audience_id, DailyInsight.spend, DailyInsight.revenue, DailyInsight.purchases)
+        .join(Audience, Audience.id == DailyInsight.audience_id)
+        .where(
+            Audience.account_id == account_id,
+            DailyInsight.insight_date <= today,
+            DailyInsight.insight_date >= today - timedelta(days=14),
+        )
+        .order_by(DailyInsight.audience_id, DailyInsight.insight_date)
+    ).all()
+    if not rows:
+        return {}
+    audience_ids, spend_col, revenue_col, purchases_col = zip(*rows)
+
+    # Row i belongs to audience group[i] and is day position[i] of its series
+    ids = np.array(audience_ids, dtype=object)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    lengths = np.diff(np.r_[starts, len(ids)])
+    groups = len(starts)
+    group = np.repeat(np.arange(groups), lengths)
+    position = np.arange(len(ids)) - starts[group]
+    count = lengths.astype(np.float64)
+
+    spend = np.nan_to_num(_floats(spend_col), nan=0.0)
+    revenue = np.nan_to_num(_floats(revenue_col), nan=0.0)
+    purchases = np.array([v or 0 for v in purchases_col], dtype=np.float64)
+    roas = np.divide(revenue, spend, out=np.zeros_like(spend), where=spend > 0)
+
+    # Linear regression slope for ROAS
+    x_mean = (count - 1) / 2
+    y_mean = np.bincount(group, roas, groups) / count
+    dx = position - x_mean[group]
+    num = np.bincount(group, dx * (roas - y_mean[group]), groups)
+    den = np.bincount(group, dx * dx, groups)
+    roas_slope = np.divide(num, den, out=np.zeros(groups), where=den != 0)
+
+    # CPA sample std dev over days with purchases, relative to the mean CPA
+    has_cpa = (purchases > 0) & (spend > 0)
+    cpa = np.divide(spend, purchases, out=np.zeros_like(spend), where=has_cpa)
+    cpa_days = np.bincount(group, has_cpa, groups)
+    cpa_mean = np.bincount(group, cpa, groups) / np.maximum(cpa_days, 1)
+    cpa_sq = np.bincount(group, np.where(has_cpa, (cpa - cpa_mean[group]) ** 2, 0.0), groups)
+    cpa_std = np.sqrt(cpa_sq / np.maximum(cpa_days - 1, 1))
+    cpa_volatility = np.where(cpa_days >= 2, cpa_std / np.where(cpa_mean != 0, cpa_mean, 1.0), 0.0)
+
+    # Spend acceleration: mean daily spend of the last 3 days over the last 7
+    from_end = lengths[group] - 1 - position
+    daily_7 = np.bincount(group, np.where(from_end < 7, spend, 0.0), groups) / np.minimum(count, 7)
+    daily_3 = np.bincount(group, np.where(from_end < 3, spend, 0.0), groups) / np.minimum(count, 3)
+    spend_acceleration = np.divide(daily_3, daily_7, out=np.ones(groups), where=daily_7 != 0)
+
+    last = starts + lengths - 1
+    previous = np.maximum(last - 1, starts)
+    dod_roas_change = np.divide(
+        roas[last] - roas[previous], roas[previous],
+        out=np.zeros(groups), where=(lengths >= 2) & (roas[previous] != 0),
+    )
+
+    result = {}
+    for audience_id, days, slope, volatility, acceleration, dod in zip(
+        ids[starts].tolist(), lengths.tolist(), roas_slope.tolist(), cpa_volatility.tolist(),
+        spend_acceleration.tolist(), dod_roas_change.tolist(),
+    ):
+        if days < 2:
+            result[audience_id] = _no_trend_metrics()
+            continue
+        result[audience_id] = {
+            "roas_slope": round(slope, 6),
+            "cpa_volatility": round(volatility, 4),
+            "spend_acceleration": round(acceleration, 4),
+            "dod_roas_change": round(dod, 4),
+        }
+        cache_set(PREFIX_METRICS + _make_key("timebased", audience_id), result[audience_id], TTL_METRICS)
+    return result
@@ -0,0 +1,252 @@
+"""Per-ad-account rate governor for Graph API traffic.
+
+Each ad account gets its own token bucket and rate-limit cooldown, fed by the
+per-account entries of Meta's x-business-use-case-usage header. App-level usage
+(x-app-usage, error code 4) is shared by every account. The lock is only held
+to compute a wait; callers sleep outside it, so a throttled account never
+blocks the others.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Delay thresholds based on usage %
+DELAY_MAP = [
+    (80, 15.0),   # >=80% usage → 15s between calls
+    (60, 8.0),    # >=60% → 8s
+    (40, 4.0),    # >=40% → 4s
+    (20, 2.0),    # >=20% → 2s
+    (0, 0.5),     # <20%  → 0.5s
+]
+
+# Error codes that are app-wide rather than per ad account
+APP_LEVEL_CODES = (4,)
+
+APP_KEY = "__app__"
+
+
+def _account_key(account_id: Optional[str]) -> str:
+    """Normalize an ad account ID to the form used in usage headers (no act_ prefix)."""
+    if not account_id:
+        return APP_KEY
+    return account_id[4:] if account_id.startswith("act_") else account_id
+
+
+def _delay_for_usage(usage_pct: float) -> float:
+    for threshold, delay in DELAY_MAP:
+        if usage_pct >= threshold:
+            return delay
+    return 0.5
+
+
+class _Budget:
+    """Token bucket + cooldown state for one ad account (or the app as a whole)."""
+
+    __slots__ = (
+        "usage_pct", "cputime_pct", "tokens", "last_refill", "cooldown_until", "consecutive_rate_limits", "waited",
+    )
+
+    def __init__(self, burst: int):
+        self.usage_pct = 0.0
+        self.cputime_pct = 0.0
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.cooldown_until = 0.0
+        self.consecutive_rate_limits = 0
+        self.waited = 0.0
+
+
+class RateGovernor:
+    """Hands out call slots per ad account. reserve() never sleeps."""
+
+    def __init__(self, burst: int = 3):
+        self._lock = threading.Lock()
+        self._burst = max(1, burst)
+        self._budgets: dict[str, _Budget] = {}
+
+    def _budget(self, key: str) -> _Budget:
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget(self._burst)
+        return budget
+
+    # ── Reads ────────────────────────────────────────────────────
+
+    def usage_pct(self, account_id: Optional[str] = None) -> float:
+        """Effective usage for an account: its own usage or the app's, whichever is higher."""
+        key = _account_key(account_id)
+        with self._lock:
+            app = self._budget(APP_KEY).usage_pct
+            if key == APP_KEY:
+                return app
+            return max(app, self._budget(key).usage_pct)
+
+    def cputime_pct(self, account_id: Optional[str] = None) -> float:
+        """total_cputime share of the account's (or the app's) quota, whichever is higher."""
+        key = _account_key(account_id)
+        with self._lock:
+            app = self._budget(APP_KEY).cputime_pct
+            if key == APP_KEY:
+                return app
+            return max(app, self._budget(key).cputime_pct)
+
+    def delay_for(self, account_id: Optional[str] = None) -> float:
+        """Steady-state spacing between calls for an account at its current usage."""
+        return _delay_for_usage(self.usage_pct(account_id))
+
+    # ── Reservations ─────────────────────────────────────────────
+
+    def reserve(self, account_id: Optional[str] = None) -> float:
+        """
+        Take one call slot for the account and return how long the caller must wait
+        before making the call (0 if it may go now). Tokens may go negative, so
+        concurrent callers queue up behind each other instead of all firing at once.
+        """
+        key = _account_key(account_id)
+        now_wall = time.time()
+        now = time.monotonic()
+        with self._lock:
+            app = self._budget(APP_KEY)
+            budget = self._budget(key)
+            cooldown_wait = max(app.cooldown_until, budget.cooldown_until) - now_wall
+
+            delay = _delay_for_usage(max(app.usage_pct, budget.usage_pct))
+            if delay <= 0:
+                budget.tokens = float(self._burst)
+            else:
+                budget.tokens = min(float(self._burst), budget.tokens + (now - budget.last_refill) / delay)
+            budget.last_refill = now
+            budget.tokens -= 1
+            token_wait = -budget.tokens * delay if budget.tokens < 0 else 0.0
+
+            wait = max(cooldown_wait, token_wait, 0.0)
+            budget.waited += wait
+        if cooldown_wait > 0:
+            logger.info(f"Rate-limit cooldown for {key}: waiting {cooldown_wait:.0f}s")
+        return wait
+
+    def wait(self, account_id: Optional[str] = None) -> float:
+        """Blocking wait for a call slot (only this thread sleeps). Returns seconds waited."""
+        wait = self.reserve(account_id)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def wait_async(self, account_id: Optional[str] = None) -> float:
+        """Async wait for a call slot. Returns seconds waited."""
+        wait = self.reserve(account_id)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    # ── Feedback from responses ──────────────────────────────────
+
+    def mark_rate_limited(
+        self,
+        backoff_seconds: float,
+        account_id: Optional[str] = None,
+        code: Optional[int] = None,
+    ) -> None:
+        """Start a cooldown: app-wide for app-level codes, otherwise for this account only."""
+        key = APP_KEY if code in APP_LEVEL_CODES else _account_key(account_id)
+        with self._lock:
+            budget = self._budget(key)
+            budget.usage_pct = 100.0  # Force max delay for future calls
+            budget.cooldown_until = max(budget.cooldown_until, time.time() + backoff_seconds)
+            budget.consecutive_rate_limits += 1
+            consecutive = budget.consecutive_rate_limits
+        logger.info(
+            f"Rate limit flagged for {key}: no API calls for {backoff_seconds:.0f}s "
+            f"(consecutive: {consecutive})"
+        )
+
+    def clear_rate_limit(self, account_id: Optional[str] = None) -> None:
+        """Reset the consecutive rate-limit counters after a successful call."""
+        key = _account_key(account_id)
+        with self._lock:
+            self._budget(key).consecutive_rate_limits = 0
+            self._budget(APP_KEY).consecutive_rate_limits = 0
+
+    def record_usage(self, headers: httpx.Headers) -> None:
+        """Parse Meta's x-business-use-case-usage (per account) and x-app-usage (app) headers."""
+        # x-business-use-case-usage: {"<ad_account_id>":[{"call_count":X,"total_cputime":Y,...}]}
+        biz_usage = headers.get("x-business-use-case-usage")
+        if biz_usage:
+            try:
+                data = json.loads(biz_usage)
+                for account_id, entries in data.items():
+                    max_pct = 0.0
+                    cputime = 0.0
+                    for entry in entries:
+                        for key in ("call_count", "total_cputime", "total_time"):
+                            val = entry.get(key, 0)
+                            if val > max_pct:
+                                max_pct = val
+                        cputime = max(cputime, entry.get("total_cputime", 0))
+                    self._set_usage(_account_key(str(account_id)), max_pct, cputime)
+                    if max_pct >= 40:
+                        logger.info(
+                            f"Meta API usage for {account_id}: {max_pct:.0f}% "
+                            f"(delay: {self.delay_for(str(account_id)):.1f}s)"
+                        )
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                pass
+
+        # x-app-usage: {"call_count":X,"total_cputime":Y,"total_time":Z}
+        app_usage = headers.get("x-app-usage")
+        if app_usage:
+            try:
+                data = json.loads(app_usage)
+                max_pct = max(
+                    data.get("call_count", 0),
+                    data.get("total_cputime", 0),
+                    data.get("total_time", 0),
+                )
+                self._set_usage(APP_KEY, max_pct, data.get("total_cputime", 0))
+                if max_pct >= 40:
+                    logger.info(f"Meta API usage (app): {max_pct:.0f}%")
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                pass
+
+    def _set_usage(self, key: str, pct: float, cputime_pct: float) -> None:
+        with self._lock:
+            budget = self._budget(key)
+            budget.usage_pct = max(pct, budget.usage_pct * 0.8)  # decay slowly
+            budget.cputime_pct = cputime_pct  # latest reading; batch sizing reacts to it directly
+
+    def stats(self) -> dict:
+        """Usage, cooldown and total wait time per account (for logging / diagnostics)."""
+        now = time.time()
+        with self._lock:
+            return {
+                key: {
+                    "usage_pct": round(b.usage_pct, 1),
+                    "cputime_pct": round(b.cputime_pct, 1),
+                    "cooldown_remaining": round(max(0.0, b.cooldown_until - now), 1),
+                    "consecutive_rate_limits": b.consecutive_rate_limits,
+                    "waited_seconds": round(b.waited, 2),
+                }
+                for key, b in self._budgets.items()
+            }
+
+
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> RateGovernor:
+    """Process-wide governor shared by all syncs."""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                from app.config import get_settings
+                _governor = RateGovernor(burst=get_settings().meta_rate_burst)
+    return _governor
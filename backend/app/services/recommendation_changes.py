@@ -0,0 +1,160 @@
+"""Change tracking for incremental recommendation generation.
+
+Every Recommendation stores a hash of its audience's inputs (input_hash) and the
+account benchmarks it was scored against. An audience is re-evaluated only when:
+- its inputs hash differently: the metric values of its latest snapshot in every
+  window, the trend signals of its daily facts (get_account_time_based_metrics), the
+  audience fields the rules and analysis read, or the effective settings;
+- a benchmark moved by more than recommendation_benchmark_tolerance (relative);
+- or a time-based rule input changed since the recommendation: its SCALE cooldown
+  ended, or its age crossed a day the rules and analysis read.
+Otherwise its last recommendation is carried forward as is. Dates are kept out of
+the hash, so a daily sync that brings no new numbers re-evaluates nothing.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Audience, LatestAudienceMetric, Recommendation
+from app.services.effective_settings import settings_fingerprint
+from app.services.metrics import _no_trend_metrics
+from app.services.rules import RuleContext
+
+_IN_CHUNK = 500
+
+_INPUT_METRIC_COLUMNS = (
+    "window_days", "spend", "revenue", "purchases", "impressions", "clicks", "roas", "cpa", "cvr",
+)
+
+BENCHMARK_KEYS = ("account_avg_roas", "median_spend", "account_avg_cvr", "target_cpa", "median_purchases")
+
+# analyze_one reads an audience's age up to 7 days (confidence, "only N days old" risk);
+# the noise filter reads it up to min_age_days
+_AGE_SENSITIVE_DAYS = 7
+
+
+def audience_input_hashes(
+    db: Session,
+    audiences: list[Audience],
+    settings,
+    trends: dict[str, dict],
+) -> dict[str, str]:
+    """
+    {audience_id: input hash} for the audiences, from one query per 500 audiences.
+    trends is get_account_time_based_metrics for their account.
+    """
+    ids = [a.id for a in audiences]
+    metric_rows: dict[str, list] = {audience_id: [] for audience_id in ids}
+    for i in range(0, len(ids), _IN_CHUNK):
+        for row in db.execute(
+            select(LatestAudienceMetric.audience_id, *(getattr(LatestAudienceMetric, c) for c in _INPUT_METRIC_COLUMNS))
+            .where(LatestAudienceMetric.audience_id.in_(ids[i : i + _IN_CHUNK]))
+            .order_by(LatestAudienceMetric.audience_id, LatestAudienceMetric.window_days)
+        ):
+            metric_rows[row[0]].append([str(v) for v in row[1:]])
+    shared = [settings_fingerprint(settings)]
+    hashes = {}
+    for a in audiences:
+        trend = trends.get(a.id) or _no_trend_metrics()
+        payload = shared + [
+            a.name, a.audience_type, str(a.launched_at), str(a.current_budget), metric_rows[a.id],
+            sorted([key, str(value)] for key, value in trend.items()),
+        ]
+        hashes[a.id] = hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+    return hashes
+
+
+def latest_recommendations(db: Session, audience_ids: list[str]) -> dict[str, Recommendation]:
+    """
+    {audience_id: newest Recommendation} for the audiences that have one. generated_at
+    has one-second resolution on SQLite, so ties go to the highest id.
+    """
+    latest = {}
+    for i in range(0, len(audience_ids), _IN_CHUNK):
+        chunk = audience_ids[i : i + _IN_CHUNK]
+        newest = (
+            select(Recommendation.audience_id, func.max(Recommendation.generated_at).label("generated_at"))
+            .where(Recommendation.audience_id.in_(chunk))
+            .group_by(Recommendation.audience_id)
+            .subquery()
+        )
+        for rec in db.query(Recommendation).join(
+            newest,
+            (Recommendation.audience_id == newest.c.audience_id)
+            & (Recommendation.generated_at == newest.c.generated_at),
+        ):
+            current = latest.get(rec.audience_id)
+            if current is None or rec.id > current.id:
+                latest[rec.audience_id] = rec
+    return latest
+
+
+def benchmark_values(benchmarks: dict) -> dict:
+    """The benchmarks change tracking compares, as stored on a Recommendation."""
+    return {key: benchmarks.get(key) for key in BENCHMARK_KEYS}
+
+
+def benchmarks_changed(previous: Optional[dict], current: dict, tolerance: float) -> bool:
+    """True when any benchmark differs from previous by more than tolerance (relative)."""
+    if not previous:
+        return True
+    for key in BENCHMARK_KEYS:
+        old, new = previous.get(key), current.get(key)
+        if old is None or new is None:
+            if old != new:
+                return True
+            continue
+        if abs(new - old) > tolerance * max(abs(old), abs(new)):
+            return True
+    return False
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def time_inputs_changed(rec: Recommendation, audience: Audience, context: RuleContext, now: datetime) -> bool:
+    """
+    True when a time-based rule input changed between rec and now: the audience's
+    SCALE cooldown ended, or its age in days changed while still below the ages the
+    rules and analysis compare against.
+    """
+    generated_at = _utc(rec.generated_at)
+    settings = context.settings
+    last_scale_at = context.last_scale_at.get(audience.id)
+    if last_scale_at:
+        cooldown_end = _utc(last_scale_at) + timedelta(hours=settings.scale_cooldown_hours)
+        if generated_at < cooldown_end <= now:
+            return True
+    if audience.launched_at:
+        launched_at = _utc(audience.launched_at)
+        cap = max(settings.min_age_days, _AGE_SENSITIVE_DAYS)
+        if min((generated_at - launched_at).days, cap) != min((now - launched_at).days, cap):
+            return True
+    return False
+
+
+def unchanged_recommendations(
+    db: Session,
+    context: RuleContext,
+    input_hashes: dict[str, str],
+    benchmarks: dict,
+) -> dict[str, Recommendation]:
+    """{audience_id: last Recommendation} for the context's audiences that need no re-evaluation."""
+    audiences = {a.id: a for a in context.audiences}
+    tolerance = context.settings.recommendation_benchmark_tolerance
+    now = datetime.now(timezone.utc)
+    unchanged = {}
+    for audience_id, rec in latest_recommendations(db, list(audiences)).items():
+        if rec.input_hash != input_hashes.get(audience_id):
+            continue
+        if benchmarks_changed(rec.benchmarks, benchmarks, tolerance):
+            continue
+        if time_inputs_changed(rec, audiences[audience_id], context, now):
+            continue
+        unchanged[audience_id] = rec
+    return unchanged
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
@@ -9,8 +10,11 @@ from app.models import Audience, MetricSnapshot, Recommendation
 from app.services.effective_settings import get_effective_settings
 from app.services.metrics import (
     get_account_benchmarks,
+    compute_account_metrics,
     compute_audience_metrics,
+    get_account_time_based_metrics,
     get_time_based_metrics,
+    _no_trend_metrics,
 )
 
 
@@ -73,18 +77,60 @@ def get_scale_percentage(audience_type: str, settings=None) -> int:
     return base
 
 
+class RuleContext:
+    """
+    What rule evaluation reads besides an audience's metrics, loaded once: the
+    audiences, the effective settings, and each audience's last SCALE
+    recommendation time (for the cooldown).
+    """
+
+    def __init__(self, settings, audiences: list[Audience], last_scale_at: dict[str, datetime]):
+        self.settings = settings
+        self.audiences = audiences
+        self.last_scale_at = last_scale_at
+
+    @classmethod
+    def for_account(cls, db: Session, account_id: str, audience_ids: Optional[set[str]] = None) -> "RuleContext":
+        """The account's audiences (or only audience_ids), in three queries."""
+        audiences = db.query(Audience).filter(Audience.account_id == account_id).all()
+        if audience_ids is not None:
+            audiences = [a for a in audiences if a.id in audience_ids]
+        return cls(
+            get_effective_settings(db), audiences, _last_scale_times(db, Audience.account_id == account_id),
+        )
+
+    @classmethod
+    def for_audience(cls, db: Session, audience: Audience) -> "RuleContext":
+        return cls(get_effective_settings(db), [audience], _last_scale_times(db, Audience.id == audience.id))
+
+
+def _last_scale_times(db: Session, audience_filter) -> dict[str, datetime]:
+    """{audience_id: generated_at of its newest SCALE recommendation}, one grouped query."""
+    return dict(
+        db.query(Recommendation.audience_id, func.max(Recommendation.generated_at))
+        .join(Audience, Audience.id == Recommendation.audience_id)
+        .filter(audience_filter, Recommendation.action == "SCALE")
+        .group_by(Recommendation.audience_id)
+        .all()
+    )
+
+
 def apply_guardrails(
     action: str,
     audience: Audience,
     db: Session,
     metrics: dict,
+    context: Optional[RuleContext] = None,
 ) -> tuple[str, Optional[int]]:
     """
     Apply guardrails. Returns (final_action, scale_percentage or None).
     - No PAUSE if spend < MIN_SPEND
     - SCALE capped and cooldown checked (simplified: no scale history table yet)
+    Settings and the last SCALE time come from context, or are loaded without it.
     """
-    settings = get_effective_settings(db)
+    if context is None:
+        context = RuleContext.for_audience(db, audience)
+    settings = context.settings
     spend = metrics.get("spend") or 0
     min_spend = float(settings.min_spend)
 
@@ -92,19 +138,9 @@ def apply_guardrails(
         return "HOLD", None
     if action == "SCALE":
         scale_pct = get_scale_percentage(audience.audience_type, settings)
-        # Cooldown: would need last_scale_at; skip for now or check last recommendation
-        last_scale = (
-            db.query(Recommendation)
-            .filter(
-                Recommendation.audience_id == audience.id,
-                Recommendation.action == "SCALE",
-            )
-            .order_by(Recommendation.generated_at.desc())
-            .first()
-        )
-        if last_scale and last_scale.generated_at:
-            from datetime import datetime, timezone
-            then = last_scale.generated_at
+        # Cooldown: time since the audience's last SCALE recommendation
+        then = context.last_scale_at.get(audience.id)
+        if then:
             if then.tzinfo is None:
                 then = then.replace(tzinfo=timezone.utc)
             delta = (datetime.now(timezone.utc) - then).total_seconds()
@@ -118,30 +154,48 @@ def run_rules_for_audience(
     db: Session,
     audience_id: str,
     account_id: str,
+    account_benchmarks: Optional[dict] = None,
 ) -> Optional[dict]:
     """
     Run rule engine for one audience. Returns dict with action, bucket, trend_state,
     scale_percentage, composite_score, metrics, or None if filtered by noise.
+    account_benchmarks: the account's get_account_benchmarks(), when the caller
+    scores several audiences of it.
     """
-    settings = get_effective_settings(db)
     audience = db.query(Audience).filter(Audience.id == audience_id).first()
     if not audience:
         return None
-    metrics = compute_audience_metrics(db, audience_id, account_id=account_id)
+    metrics = compute_audience_metrics(db, audience_id, account_benchmarks, account_id=account_id)
     if not metrics:
         return None
+    return _run_rules(db, audience, metrics, RuleContext.for_audience(db, audience))
+
+
+def _run_rules(
+    db: Session,
+    audience: Audience,
+    metrics: dict,
+    context: RuleContext,
+    time_metrics: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Noise filters, bucket, trend, decision and guardrails for one scored audience.
+    time_metrics are read with get_time_based_metrics unless given.
+    """
+    settings = context.settings
+    audience_id = audience.id
     spend = metrics.get("spend") or 0
     purchases = metrics.get("purchases") or 0
     # Noise filter
     if spend < settings.min_spend or purchases < settings.min_purchases:
         return None
     if audience.launched_at:
-        from datetime import datetime, timezone
         age_days = (datetime.now(timezone.utc) - audience.launched_at.replace(tzinfo=timezone.utc)).days
         if age_days < settings.min_age_days:
             return None
 
-    time_metrics = get_time_based_metrics(db, audience_id)
+    if time_metrics is None:
+        time_metrics = get_time_based_metrics(db, audience_id)
     bucket = classify_performance(
         metrics.get("normalized_roas") or 0,
         audience.audience_type,
@@ -154,7 +208,7 @@ def run_rules_for_audience(
         settings,
     )
     action = DECISION_MATRIX.get((bucket, trend_state), "HOLD")
-    action, scale_pct = apply_guardrails(action, audience, db, metrics)
+    action, scale_pct = apply_guardrails(action, audience, db, metrics, context)
 
     return {
         "audience_id": audience_id,
@@ -171,12 +225,33 @@ def run_rules_for_audience(
     }
 
 
-def run_rules_for_account(db: Session, account_id: str) -> list[dict]:
-    """Run rule engine for all eligible audiences in the account."""
-    audiences = db.query(Audience).filter(Audience.account_id == account_id).all()
+def run_rules_for_account(
+    db: Session,
+    account_id: str,
+    audience_ids: Optional[set[str]] = None,
+    account_benchmarks: Optional[dict] = None,
+    trends: Optional[dict[str, dict]] = None,
+) -> list[dict]:
+    """
+    Run rule engine for all eligible audiences in the account (or only audience_ids),
+    with a constant number of queries: audiences, settings and last SCALE times are
+    loaded once (RuleContext), all audiences are scored at once
+    (compute_account_metrics) against benchmarks computed once, and their trends come
+    from one query (get_account_time_based_metrics) unless given.
+    """
+    context = RuleContext.for_account(db, account_id, audience_ids)
+    if not context.audiences:
+        return []
+    account_benchmarks = account_benchmarks or get_account_benchmarks(db, account_id)
+    metrics_by_audience = compute_account_metrics(db, account_id, account_benchmarks)
+    if trends is None:
+        trends = get_account_time_based_metrics(db, account_id)
     results = []
-    for a in audiences:
-        r = run_rules_for_audience(db, a.id, account_id)
+    for a in context.audiences:
+        metrics = metrics_by_audience.get(a.id)
+        if not metrics:
+            continue
+        r = _run_rules(db, a, metrics, context, trends.get(a.id) or _no_trend_metrics())
         if r:
             results.append(r)
     return results
@@ -1,32 +1,74 @@
 """APScheduler: periodic sync and outcome logging."""
 import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 
+from app.config import get_settings
 from app.database import SessionLocal, init_db
 from app.models import Account, ActionLog, Audience, MetricSnapshot
-from app.services.ingestion import sync_account
 from app.services.metrics import compute_audience_metrics, get_account_benchmarks
+from app.services.sync_jobs import invalidate_sync_caches, run_sync
 
 logger = logging.getLogger(__name__)
 
 
 def _sync_all_accounts() -> None:
+    """
+    Sync every account on a bounded thread pool (scheduled_sync_workers), one DB
+    session per account, each registered as a sync job. Each account draws on its own rate budget in the governor,
+    so the cycle takes roughly as long as the slowest account.
+    """
     db = SessionLocal()
     try:
-        accounts = db.query(Account).all()
-        logger.info(f"Scheduled sync: processing {len(accounts)} accounts")
-        for account in accounts:
-            try:
-                sync_account(account.id, db)
-            except Exception as e:
-                logger.error(f"Scheduled sync failed for account {account.id}: {e}", exc_info=True)
-                db.rollback()
+        account_ids = [account_id for (account_id,) in db.query(Account.id).all()]
     finally:
         db.close()
+    if not account_ids:
+        return
+
+    workers = max(1, min(get_settings().scheduled_sync_workers, len(account_ids)))
+    logger.info(f"Scheduled sync: processing {len(account_ids)} accounts on {workers} workers")
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduled-sync") as pool:
+        results = list(pool.map(_sync_one_account, account_ids))
+
+    outcomes = Counter(outcome for outcome, _ in results)
+    if outcomes["ok"] or outcomes["errors"]:
+        invalidate_sync_caches()
+    logger.info(
+        f"Scheduled sync finished in {time.monotonic() - start:.1f}s "
+        f"(account time {sum(duration for _, duration in results):.1f}s): "
+        + ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+    )
+
+
+def _sync_one_account(account_id: str) -> tuple[str, float]:
+    """
+    Sync one account as a registered job (see sync_jobs.run_sync), so an on-demand
+    sync of the account attaches to it. Returns (outcome, seconds), outcome being
+    ok, errors (finished with per-item errors), skipped (already syncing) or failed.
+    """
+    start = time.monotonic()
+    job, attached = run_sync(account_id)
+    if attached:
+        outcome, detail = "skipped", f"already syncing (job {job.id})"
+    elif job.status == "failed":
+        outcome, detail = "failed", job.error
+    elif job.result.get("errors"):
+        outcome = "errors"
+        detail = f"{len(job.result['errors'])} errors"
+    else:
+        outcome = "ok"
+        detail = f"{job.result['audiences_created']} created, {job.result['audiences_updated']} updated"
+    duration = time.monotonic() - start
+    logger.info(f"Scheduled sync {account_id}: {outcome} in {duration:.1f}s ({detail})")
+    return outcome, duration
 
 
 def _update_outcome_metrics() -> None:
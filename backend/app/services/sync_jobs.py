@@ -0,0 +1,221 @@
+"""Background sync jobs: a worker pool, a job registry and per-account attach.
+
+POST /api/ingestion/sync submits a job and returns at once; the sync runs on a pool
+thread with its own DB session. While a job for an account is queued or running,
+another submit for that account returns the same job instead of starting a second
+sync. Scheduled syncs run through the same registry (run_sync), so a submit during
+one attaches to it. Finished jobs are kept for sync_job_retention_minutes so clients can read the
+result.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.ingestion import sync_account
+from app.services.sync_progress import SyncProgress
+from app.utils.cache import (
+    cache_invalidate_prefix,
+    PREFIX_AUDIENCES, PREFIX_RECOMMENDATIONS, PREFIX_BENCHMARKS, PREFIX_METRICS,
+)
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class SyncJob:
+    """One submitted sync. status: queued → running → succeeded | failed."""
+
+    def __init__(self, account_id: str, date_preset: str, incremental: Optional[bool]):
+        self.id = str(uuid.uuid4())
+        self.account_id = account_id
+        self.date_preset = date_preset
+        self.incremental = incremental
+        self.status = "queued"
+        self.progress = SyncProgress()
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "account_id": self.account_id,
+            "date_preset": self.date_preset,
+            "status": self.status,
+            **self.progress.as_dict(),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+_jobs: dict[str, SyncJob] = {}
+_active_by_account: dict[str, str] = {}
+_jobs_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, get_settings().sync_job_workers),
+            thread_name_prefix="sync-job",
+        )
+    return _executor
+
+
+def submit_sync(
+    account_id: str,
+    date_preset: str = "last_7d",
+    incremental: Optional[bool] = None,
+) -> tuple[SyncJob, bool]:
+    """
+    Queue a sync for the account, or attach to the one already queued/running.
+    Returns (job, attached).
+    """
+    job, attached = _register(account_id, date_preset, incremental)
+    if attached:
+        return job, True
+    executor = _get_executor()
+    executor.submit(_run_job, job)
+    logger.info(f"Queued sync job {job.id} for account {account_id} (preset={date_preset})")
+    return job, False
+
+
+def run_sync(
+    account_id: str,
+    date_preset: str = "last_7d",
+    incremental: Optional[bool] = None,
+) -> tuple[SyncJob, bool]:
+    """
+    Run a sync on the calling thread (scheduled syncs), registered like a submitted
+    job so a submit for the account attaches to it. When the account already has a
+    queued/running job, returns it without syncing. Sync caches are left to the
+    caller. Returns (job, attached).
+    """
+    job, attached = _register(account_id, date_preset, incremental)
+    if not attached:
+        _run_job(job, invalidate_caches=False)
+    return job, attached
+
+
+def _register(account_id: str, date_preset: str, incremental: Optional[bool]) -> tuple[SyncJob, bool]:
+    """The account's active job (attached=True), or a new queued one."""
+    with _jobs_lock:
+        _prune_finished()
+        job_id = _active_by_account.get(account_id)
+        if job_id and _jobs[job_id].active:
+            return _jobs[job_id], True
+        job = SyncJob(account_id, date_preset, incremental)
+        _jobs[job.id] = job
+        _active_by_account[account_id] = job.id
+    return job, False
+
+
+def get_job(job_id: str) -> Optional[SyncJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def get_active_job(account_id: str) -> Optional[SyncJob]:
+    """The account's queued or running job, if any."""
+    with _jobs_lock:
+        job_id = _active_by_account.get(account_id)
+        job = _jobs.get(job_id) if job_id else None
+        return job if job and job.active else None
+
+
+def invalidate_sync_caches() -> int:
+    """Clear every cache that derives from synced data. Returns keys cleared."""
+    total = 0
+    total += cache_invalidate_prefix(PREFIX_AUDIENCES)
+    total += cache_invalidate_prefix(PREFIX_RECOMMENDATIONS)
+    total += cache_invalidate_prefix(PREFIX_BENCHMARKS)
+    total += cache_invalidate_prefix(PREFIX_METRICS)
+    return total
+
+
+def _run_job(job: SyncJob, invalidate_caches: bool = True) -> None:
+    with _jobs_lock:
+        if job.status != "queued":
+            return  # failed by shutdown_sync_jobs before it started
+        job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        result = sync_account(
+            job.account_id, db, date_preset=job.date_preset, incremental=job.incremental,
+            progress=job.progress,
+        )
+        if "error" in result:
+            job.error = result["error"]
+            job.status = "failed"
+        else:
+            job.result = result
+            job.status = "succeeded"
+            if invalidate_caches:
+                cleared = invalidate_sync_caches()
+                logger.info("Post-sync cache invalidation: %d keys cleared", cleared)
+    except Exception as e:
+        logger.error(f"Sync job {job.id} for account {job.account_id} failed: {e}", exc_info=True)
+        db.rollback()
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        db.close()
+        job.finished_at = datetime.now(timezone.utc)
+        job.progress.set_stage("done")
+        with _jobs_lock:
+            if _active_by_account.get(job.account_id) == job.id:
+                del _active_by_account[job.account_id]
+        logger.info(
+            f"Sync job {job.id} {job.status} in "
+            f"{(job.finished_at - job.started_at).total_seconds():.1f}s "
+            f"({job.progress.api_calls} API calls)"
+        )
+
+
+def _prune_finished() -> None:
+    """Drop finished jobs older than the retention window. Caller holds _jobs_lock."""
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=get_settings().sync_job_retention_minutes)
+    for job_id in [j.id for j in _jobs.values() if not j.active and j.finished_at and j.finished_at < cutoff]:
+        del _jobs[job_id]
+
+
+def shutdown_sync_jobs() -> None:
+    """
+    Stop accepting jobs; running syncs are left to finish in the background. Jobs
+    still queued are cancelled and reported as failed.
+    """
+    global _executor
+    with _jobs_lock:
+        executor, _executor = _executor, None
+    if not executor:
+        return
+    executor.shutdown(wait=False, cancel_futures=True)
+    now = datetime.now(timezone.utc)
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job.status != "queued":
+                continue
+            job.status = "failed"
+            job.error = "Cancelled: the server shut down before this sync started"
+            job.finished_at = now
+            job.progress.set_stage("done")
+            if _active_by_account.get(job.account_id) == job.id:
+                del _active_by_account[job.account_id]
@@ -0,0 +1,56 @@
+"""Progress counters for a running sync (read by the job status API)."""
+import threading
+from typing import Optional
+
+import httpx
+
+
+class SyncProgress:
+    """Stage, insight chunks and Graph HTTP calls of one sync. Safe to update from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage = "queued"
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.api_calls = 0
+
+    def set_stage(self, stage: str) -> None:
+        with self._lock:
+            self.stage = stage
+
+    def add_chunks(self, count: int = 1) -> None:
+        """Announce chunks (batch calls or result pages) that will be fetched."""
+        with self._lock:
+            self.chunks_total += count
+
+    def chunk_done(self) -> None:
+        with self._lock:
+            self.chunks_done += 1
+
+    def api_call(self) -> None:
+        with self._lock:
+            self.api_calls += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "chunks_total": self.chunks_total,
+                "chunks_done": self.chunks_done,
+                "api_calls": self.api_calls,
+            }
+
+
+def client_event_hooks(progress: Optional[SyncProgress], is_async: bool = False) -> dict:
+    """httpx event_hooks that count every request (retries included) against progress."""
+    if progress is None:
+        return {}
+    if is_async:
+        async def on_request_async(request: httpx.Request) -> None:
+            progress.api_call()
+        return {"request": [on_request_async]}
+
+    def on_request(request: httpx.Request) -> None:
+        progress.api_call()
+    return {"request": [on_request]}
@@ -0,0 +1,132 @@
+"""Sync run records and per-chunk checkpoints, so an interrupted sync resumes.
+
+Every sync opens a SyncRun. In batch fetch mode, each merged chunk adds a "done"
+checkpoint with its ad set IDs in the same transaction as the chunk's facts, so a
+checkpoint exists exactly when its data is committed. Ad sets still rate-limited
+after the batch retries get a "retry" checkpoint and the run ends "partial".
+
+A run that did not succeed (crashed while "running", "failed" or "partial") is
+resumed by the next sync of the account if it fetches the same plan: same preset,
+fetch mode, incremental flag and last complete day. The resumed run skips the ad
+sets already done and fetches only the rest, so quota already spent is not spent
+again. Any other unfinished run is abandoned. Checkpoints are deleted once a run
+succeeds.
+"""
+import logging
+import uuid
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import SyncCheckpoint, SyncRun
+
+logger = logging.getLogger(__name__)
+
+RESUMABLE_STATUSES = ("running", "failed", "partial")
+
+
+def begin_sync_run(
+    db: Session,
+    account_id: str,
+    date_preset: str,
+    fetch_mode: str,
+    incremental: bool,
+    fetch_until: date,
+    ad_sets_planned: int,
+) -> tuple[str, set[str]]:
+    """
+    Resume the account's unfinished run for the same plan, or start a new one.
+    Returns (run ID, Meta ad set IDs already merged by the run). Commits.
+    """
+    unfinished = (
+        db.query(SyncRun)
+        .filter(SyncRun.account_id == account_id, SyncRun.status.in_(RESUMABLE_STATUSES))
+        .order_by(SyncRun.started_at.desc())
+        .all()
+    )
+    resumable = next(
+        (
+            run for run in unfinished
+            if run.fetch_mode == "batch"
+            and fetch_mode == "batch"
+            and run.date_preset == date_preset
+            and run.incremental == incremental
+            and run.fetch_until == fetch_until
+        ),
+        None,
+    )
+    for run in unfinished:
+        if run is not resumable:
+            run.status = "abandoned"
+            run.finished_at = run.finished_at or datetime.now(timezone.utc)
+            db.query(SyncCheckpoint).filter(SyncCheckpoint.sync_run_id == run.id).delete(synchronize_session=False)
+
+    if resumable:
+        done = set()
+        for (ad_set_ids,) in db.query(SyncCheckpoint.ad_set_ids).filter(
+            SyncCheckpoint.sync_run_id == resumable.id, SyncCheckpoint.kind == "done",
+        ):
+            done.update(ad_set_ids)
+        # Retry entries are superseded: whatever is not done is fetched again
+        db.query(SyncCheckpoint).filter(
+            SyncCheckpoint.sync_run_id == resumable.id, SyncCheckpoint.kind == "retry",
+        ).delete(synchronize_session=False)
+        resumable.status = "running"
+        resumable.attempts += 1
+        resumable.error = None
+        resumable.finished_at = None
+        run_id = resumable.id
+        logger.info(
+            f"Resuming sync run {run_id} (attempt {resumable.attempts}): "
+            f"{len(done)} ad sets already merged"
+        )
+    else:
+        done = set()
+        run_id = str(uuid.uuid4())
+        db.add(SyncRun(
+            id=run_id,
+            account_id=account_id,
+            status="running",
+            date_preset=date_preset,
+            fetch_mode=fetch_mode,
+            incremental=incremental,
+            fetch_until=fetch_until,
+            attempts=1,
+            ad_sets_planned=ad_sets_planned,
+            chunks_done=0,
+        ))
+    db.commit()
+    return run_id, done
+
+
+def add_checkpoint(db: Session, run_id: str, kind: str, ad_set_ids: list[str]) -> None:
+    """Record ad sets for the run in the current transaction (the caller commits)."""
+    if not ad_set_ids:
+        return
+    db.add(SyncCheckpoint(id=str(uuid.uuid4()), sync_run_id=run_id, kind=kind, ad_set_ids=list(ad_set_ids)))
+    if kind == "done":
+        db.query(SyncRun).filter(SyncRun.id == run_id).update(
+            {SyncRun.chunks_done: SyncRun.chunks_done + 1}, synchronize_session=False,
+        )
+
+
+def end_sync_run(
+    db: Session,
+    run_id: str,
+    status: str,
+    summary: Optional[dict] = None,
+    error: Optional[str] = None,
+) -> None:
+    """Close the run (the caller commits). A succeeded run's checkpoints are dropped."""
+    db.query(SyncRun).filter(SyncRun.id == run_id).update(
+        {
+            SyncRun.status: status,
+            SyncRun.summary: summary,
+            SyncRun.error: error,
+            SyncRun.finished_at: datetime.now(timezone.utc),
+        },
+        synchronize_session=False,
+    )
+    if status == "succeeded":
+        db.query(SyncCheckpoint).filter(SyncCheckpoint.sync_run_id == run_id).delete(synchronize_session=False)
@@ -0,0 +1,107 @@
+"""Set-based bulk writes: dialect-native INSERT ... ON CONFLICT DO UPDATE in batches."""
+import logging
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Stay well under SQLite's bound-parameter limit (32766 on modern builds)
+MAX_PARAMS_PER_STATEMENT = 30000
+
+
+def _insert_for(db: Session):
+    """Return the dialect-specific insert() that supports on_conflict_do_update, or None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
+
+def upsert_rows(
+    db: Session,
+    model,
+    rows: list[dict[str, Any]],
+    conflict_columns: Iterable[str],
+    update_columns: Optional[Iterable[str]] = None,
+    touch_updated_at: bool = False,
+    batch_size: int = 500,
+) -> int:
+    """
+    Insert rows, updating update_columns where conflict_columns already exist.
+    conflict_columns must be covered by a primary key or unique index. All rows must
+    have the same keys. With touch_updated_at, updated rows also get updated_at = now()
+    (Core upserts don't fire the ORM onupdate). Returns the number of batches executed.
+
+    Dialects without ON CONFLICT support fall back to Session.merge() per row.
+    """
+    if not rows:
+        return 0
+    conflict_columns = list(conflict_columns)
+    if update_columns is None:
+        update_columns = [k for k in rows[0] if k not in conflict_columns and k != "id"]
+    update_columns = list(update_columns)
+
+    insert = _insert_for(db)
+    if insert is None:
+        logger.warning(f"No native upsert for dialect {db.get_bind().dialect.name}; merging row by row")
+        for row in rows:
+            db.merge(model(**row))
+        return len(rows)
+
+    # One compiled statement, executed with a parameter list: SQLAlchemy's
+    # "insertmanyvalues" turns each batch into multi-row INSERTs
+    stmt = insert(model)
+    set_ = {col: stmt.excluded[col] for col in update_columns}
+    if touch_updated_at:
+        set_["updated_at"] = func.now()
+    if set_:
+        stmt = stmt.on_conflict_do_update(index_elements=conflict_columns, set_=set_)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+    per_row = max(1, len(rows[0]))
+    batch_size = max(1, min(batch_size, MAX_PARAMS_PER_STATEMENT // per_row))
+    statements = 0
+    for i in range(0, len(rows), batch_size):
+        db.execute(stmt, rows[i : i + batch_size])
+        statements += 1
+    return statements
+
+
+def upsert_from_select(
+    db: Session,
+    model,
+    columns: list[str],
+    select_stmt,
+    conflict_columns: Iterable[str],
+    update_where=None,
+) -> None:
+    """
+    INSERT INTO model (columns) SELECT ..., updating the other columns where
+    conflict_columns already exist. update_where(excluded) returns a condition on the
+    existing row (model's columns) and the proposed one (excluded) that limits which
+    existing rows are overwritten.
+
+    Dialects without ON CONFLICT support fall back to Session.merge() per selected
+    row, without update_where.
+    """
+    conflict_columns = list(conflict_columns)
+    insert = _insert_for(db)
+    if insert is None:
+        logger.warning(f"No native upsert for dialect {db.get_bind().dialect.name}; merging row by row")
+        for row in db.execute(select_stmt):
+            db.merge(model(**dict(zip(columns, row))))
+        return
+    stmt = insert(model).from_select(columns, select_stmt)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={col: stmt.excluded[col] for col in columns if col not in conflict_columns},
+        where=update_where(stmt.excluded) if update_where is not None else None,
+    )
+    db.execute(stmt)
@@ -0,0 +1,49 @@
+"""Baseline: columns and unique index added by the old hand-rolled migrations
+
+Databases created before Alembic was introduced start here. Each step is skipped
+when the schema already has it, so the revision is safe on any of those databases.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("accounts", "last_synced_at", sa.DateTime()),
+    ("audiences", "insights_synced_through", sa.Date()),
+    ("audiences", "meta_status", sa.String(32)),
+    ("audiences", "meta_updated_time", sa.DateTime()),
+    ("audiences", "targeting_hash", sa.String(64)),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, column, col_type in COLUMNS:
+        if column not in {c["name"] for c in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column(column, col_type, nullable=True))
+
+    # Unique index the snapshot upsert relies on; duplicates are removed first,
+    # keeping one row per key
+    if "uq_metric_snapshots_audience_date_window" not in {
+        ix["name"] for ix in inspector.get_indexes("metric_snapshots")
+    }:
+        op.execute(
+            "DELETE FROM metric_snapshots WHERE id NOT IN "
+            "(SELECT MIN(id) FROM metric_snapshots GROUP BY audience_id, snapshot_date, window_days)"
+        )
+        op.create_index(
+            "uq_metric_snapshots_audience_date_window", "metric_snapshots",
+            ["audience_id", "snapshot_date", "window_days"], unique=True,
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,38 @@
+"""Composite indexes for the latest-snapshot and latest-recommendation queries
+
+metric_snapshots is read by (audience_id, window_days) newest date first, and
+recommendations by generated_at (account list) and by audience newest first. The
+single-column audience_id indexes are prefixes of the new ones and are dropped.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_metric_snapshots_audience_window_date", "metric_snapshots",
+        ["audience_id", "window_days", "snapshot_date"], if_not_exists=True,
+    )
+    op.drop_index("ix_metric_snapshots_audience_id", table_name="metric_snapshots", if_exists=True)
+    op.create_index("ix_recommendations_generated_at", "recommendations", ["generated_at"], if_not_exists=True)
+    op.create_index(
+        "ix_recommendations_audience_generated", "recommendations",
+        ["audience_id", "generated_at"], if_not_exists=True,
+    )
+    op.drop_index("ix_recommendations_audience_id", table_name="recommendations", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_recommendations_audience_id", "recommendations", ["audience_id"], if_not_exists=True)
+    op.drop_index("ix_recommendations_audience_generated", table_name="recommendations", if_exists=True)
+    op.drop_index("ix_recommendations_generated_at", table_name="recommendations", if_exists=True)
+    op.create_index("ix_metric_snapshots_audience_id", "metric_snapshots", ["audience_id"], if_not_exists=True)
+    op.drop_index("ix_metric_snapshots_audience_window_date", table_name="metric_snapshots", if_exists=True)
@@ -0,0 +1,54 @@
+"""latest_audience_metrics: newest snapshot per audience and window
+
+Created (unless init_db() already did) and filled from metric_snapshots, newest
+snapshot up to today per (audience, window). Ingestion keeps it current afterwards.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+VALUE_COLUMNS = "spend, revenue, purchases, impressions, clicks, ctr, cpc, roas, cpa, cvr"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("latest_audience_metrics"):
+        op.create_table(
+            "latest_audience_metrics",
+            sa.Column("audience_id", sa.String(36), sa.ForeignKey("audiences.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("window_days", sa.Integer(), primary_key=True),
+            sa.Column("snapshot_id", sa.String(36), nullable=False),
+            sa.Column("snapshot_date", sa.Date(), nullable=False),
+            sa.Column("spend", sa.Numeric(14, 2), nullable=False),
+            sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+            sa.Column("purchases", sa.Integer(), nullable=False),
+            sa.Column("impressions", sa.Integer(), nullable=False),
+            sa.Column("clicks", sa.Integer(), nullable=False),
+            sa.Column("ctr", sa.Numeric(8, 6), nullable=True),
+            sa.Column("cpc", sa.Numeric(10, 4), nullable=True),
+            sa.Column("roas", sa.Numeric(10, 4), nullable=True),
+            sa.Column("cpa", sa.Numeric(12, 2), nullable=True),
+            sa.Column("cvr", sa.Numeric(8, 6), nullable=True),
+        )
+    if bind.execute(sa.text("SELECT COUNT(*) FROM latest_audience_metrics")).scalar():
+        return
+    op.execute(
+        f"INSERT INTO latest_audience_metrics "
+        f"(audience_id, window_days, snapshot_id, snapshot_date, {VALUE_COLUMNS}) "
+        f"SELECT audience_id, window_days, id, snapshot_date, {VALUE_COLUMNS} FROM ("
+        f"SELECT *, ROW_NUMBER() OVER (PARTITION BY audience_id, window_days ORDER BY snapshot_date DESC) AS recency "
+        f"FROM metric_snapshots WHERE snapshot_date <= CURRENT_DATE"
+        f") ranked WHERE recency = 1"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("latest_audience_metrics")
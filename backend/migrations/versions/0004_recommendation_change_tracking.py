@@ -0,0 +1,27 @@
+"""Recommendation change tracking: input_hash and benchmarks
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("recommendations")}
+    if "input_hash" not in columns:
+        op.add_column("recommendations", sa.Column("input_hash", sa.String(64), nullable=True))
+    if "benchmarks" not in columns:
+        op.add_column("recommendations", sa.Column("benchmarks", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("recommendations") as batch:
+        batch.drop_column("benchmarks")
+        batch.drop_column("input_hash")
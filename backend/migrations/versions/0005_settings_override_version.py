@@ -0,0 +1,24 @@
+"""settings_overrides.version: change counter for the effective settings snapshot
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("settings_overrides")}
+    if "version" not in columns:
+        op.add_column("settings_overrides", sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("settings_overrides") as batch:
+        batch.drop_column("version")
@@ -0,0 +1,71 @@
+"""daily_insights, sync_runs and sync_checkpoints
+
+The per-day fact table windows are derived from, and the sync run / checkpoint
+tables resumable syncs record progress in. Each table is created (with its indexes)
+unless init_db() already did. When daily_insights is new, insights_synced_through is
+cleared so every audience is backfilled into it on its next sync.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("daily_insights"):
+        op.create_table(
+            "daily_insights",
+            sa.Column("audience_id", sa.String(36), sa.ForeignKey("audiences.id", ondelete="CASCADE"), primary_key=True),
+            sa.Column("insight_date", sa.Date(), primary_key=True),
+            sa.Column("spend", sa.Numeric(14, 2), nullable=False),
+            sa.Column("revenue", sa.Numeric(14, 2), nullable=False),
+            sa.Column("purchases", sa.Integer(), nullable=False),
+            sa.Column("clicks", sa.Integer(), nullable=False),
+            sa.Column("impressions", sa.Integer(), nullable=False),
+        )
+        op.execute("UPDATE audiences SET insights_synced_through = NULL")
+    if not inspector.has_table("sync_runs"):
+        op.create_table(
+            "sync_runs",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("account_id", sa.String(36), sa.ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("status", sa.String(16), nullable=False),
+            sa.Column("date_preset", sa.String(32), nullable=False),
+            sa.Column("fetch_mode", sa.String(16), nullable=False),
+            sa.Column("incremental", sa.Boolean(), nullable=False),
+            sa.Column("fetch_until", sa.Date(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("ad_sets_planned", sa.Integer(), nullable=False),
+            sa.Column("chunks_done", sa.Integer(), nullable=False),
+            sa.Column("summary", sa.JSON(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_sync_runs_account_id", "sync_runs", ["account_id"])
+    if not inspector.has_table("sync_checkpoints"):
+        op.create_table(
+            "sync_checkpoints",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column(
+                "sync_run_id", sa.String(36), sa.ForeignKey("sync_runs.id", ondelete="CASCADE"), nullable=False,
+            ),
+            sa.Column("kind", sa.String(16), nullable=False),
+            sa.Column("ad_set_ids", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index("ix_sync_checkpoints_sync_run_id", "sync_checkpoints", ["sync_run_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("sync_checkpoints")
+    op.drop_table("sync_runs")
+    op.drop_table("daily_insights")
@@ -0,0 +1,24 @@
+"""Drop ix_recommendations_generated_at
+
+The account recommendations list joins through the account's audiences, so SQLite
+reads it from ix_recommendations_audience_generated and sorts the rows; the
+generated_at index was never used.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_recommendations_generated_at", table_name="recommendations", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_recommendations_generated_at", "recommendations", ["generated_at"], if_not_exists=True)
@@ -0,0 +1,74 @@
+"""Shared fixtures. Every test session runs against a throwaway SQLite database.
+
+The environment is set before any app module is imported, because the engine and
+get_settings() are created at import time.
+"""
+import os
+import tempfile
+
+import pytest
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='audience_tests_')}/test.db"
+os.environ["APP_ENV"] = "test"
+os.environ["ANTHROPIC_API_KEY"] = ""  # rule-based analysis only
+os.environ["META_RATE_BURST"] = "1000000000"  # never pace calls to the in-process Graph stand-in
+
+import app.models  # noqa: E402,F401 — registers every table for init_db
+from app.config import get_settings  # noqa: E402
+from app.database import Base, SessionLocal, engine, init_db  # noqa: E402
+from app.models import Account, Audience  # noqa: E402
+from app.services.effective_settings import invalidate_effective_settings  # noqa: E402
+from app.services.ingestion import sync_account  # noqa: E402
+from app.utils.cache import cache_clear  # noqa: E402
+from app.utils.crypto import encrypt_token  # noqa: E402
+from tools.graph_emulator import SyntheticGraph  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    init_db()
+
+
+@pytest.fixture
+def db():
+    """A session on an empty database; every row and cache is cleared afterwards."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
+        cache_clear()
+        invalidate_effective_settings()
+
+
+@pytest.fixture
+def account(db) -> Account:
+    account = Account(
+        id="account-1", meta_account_id="act_900001", account_name="Test account",
+        access_token=encrypt_token("token"),
+    )
+    db.add(account)
+    db.commit()
+    return account
+
+
+@pytest.fixture
+def graph() -> SyntheticGraph:
+    """Synthetic Graph API account with 200 ad sets (tools/graph_emulator.py)."""
+    return SyntheticGraph(ad_sets=200)
+
+
+@pytest.fixture
+def synced(db, account, graph) -> list[str]:
+    """The account synced from the stand-in over the last 14 days; returns its audience IDs."""
+    summary = sync_account(
+        account.id, db, date_preset="last_14d",
+        transport=graph.transport(is_async=get_settings().meta_async_fetch),
+    )
+    assert not summary.get("errors")
+    cache_clear()
+    return [audience_id for (audience_id,) in db.query(Audience.id).filter(Audience.account_id == account.id)]
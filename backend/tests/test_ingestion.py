@@ -0,0 +1,100 @@
+"""Sync runs against the in-process Graph stand-in (ingestion.py)."""
+from datetime import timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import Base
+from app.models import Audience, DailyInsight, MetricSnapshot, SyncRun
+from app.services.ingestion import _derive_window_snapshots, _last_complete_day, sync_account
+
+
+def _daily_facts(db) -> list[tuple]:
+    return sorted(
+        db.execute(
+            select(
+                Audience.meta_ad_set_id, DailyInsight.insight_date, DailyInsight.spend, DailyInsight.revenue,
+                DailyInsight.purchases, DailyInsight.clicks, DailyInsight.impressions,
+            ).join(Audience, Audience.id == DailyInsight.audience_id)
+        ).all()
+    )
+
+
+def _clear_synced_data(db) -> None:
+    """Everything but the accounts, so the next sync starts from scratch."""
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name != "accounts":
+            db.execute(table.delete())
+    db.commit()
+
+
+def _failing_transport(graph, fail_on_post: int, is_async: bool) -> httpx.MockTransport:
+    """The stand-in, except that the fail_on_post-th batch request cannot connect."""
+    posts = 0
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        nonlocal posts
+        if request.method == "POST":
+            posts += 1
+            if posts == fail_on_post:
+                raise httpx.ConnectError("connection reset", request=request)
+        return graph.handle(request)
+
+    if is_async:
+        async def handle_async(request: httpx.Request) -> httpx.Response:
+            return handle(request)
+        return httpx.MockTransport(handle_async)
+    return httpx.MockTransport(handle)
+
+
+@pytest.mark.parametrize("is_async", [False, True], ids=["blocking", "async"])
+def test_resumed_sync_stores_the_same_daily_insights(db, account, graph, monkeypatch, is_async):
+    monkeypatch.setattr(get_settings(), "meta_async_fetch", is_async)
+    monkeypatch.setattr(get_settings(), "insights_fetch_mode", "batch")
+    monkeypatch.setattr(get_settings(), "meta_batch_concurrency", 1)
+
+    uninterrupted = sync_account(account.id, db, date_preset="last_7d", transport=graph.transport(is_async))
+    assert not uninterrupted["errors"]
+    expected = _daily_facts(db)
+    _clear_synced_data(db)
+
+    failed = sync_account(
+        account.id, db, date_preset="last_7d", transport=_failing_transport(graph, 3, is_async),
+    )
+    assert any(error.startswith("Insights fetch") for error in failed["errors"])
+    assert db.get(SyncRun, failed["sync_run_id"]).status == "failed"
+    assert 0 < len(_daily_facts(db)) < len(expected)
+
+    resumed = sync_account(account.id, db, date_preset="last_7d", transport=graph.transport(is_async))
+    assert not resumed["errors"]
+    assert resumed["sync_run_id"] == failed["sync_run_id"]
+    assert resumed["ad_sets_resumed"] > 0
+    assert _daily_facts(db) == expected
+
+
+def test_idle_windows_get_no_snapshot(db, account):
+    audience = Audience(
+        id="audience-1", account_id=account.id, meta_ad_set_id="1", name="Idle lately", audience_type="BROAD",
+    )
+    db.add(audience)
+    until = _last_complete_day()
+    # Delivery 10 and 20 days ago only: the 14d and 30d windows have it, 1d/3d/7d don't
+    for days_ago in (9, 19):
+        db.add(DailyInsight(
+            audience_id=audience.id, insight_date=until - timedelta(days=days_ago),
+            spend=Decimal("40.00"), revenue=Decimal("120.00"), purchases=2, clicks=30, impressions=1500,
+        ))
+    db.commit()
+
+    summary = {"snapshots_created": 0}
+    _derive_window_snapshots(db, [audience.id], summary)
+    db.commit()
+
+    windows = {s.window_days: s for s in db.query(MetricSnapshot).filter_by(audience_id=audience.id)}
+    assert sorted(windows) == [14, 30]
+    assert windows[14].spend == Decimal("40.00")
+    assert windows[30].spend == Decimal("80.00")
+    assert summary["snapshots_created"] == 2
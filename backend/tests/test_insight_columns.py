@@ -0,0 +1,68 @@
+"""Columnar insight parsing and cumulative-sum windows (insight_columns.py)."""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.insight_columns import parse_insight_rows, trailing_window_metrics
+
+
+def _insight_rows(days: int, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(days):
+        purchases = rng.randint(0, 6)
+        rows.append({
+            "date_start": (date(2026, 1, 1) + timedelta(days=i)).isoformat(),
+            "spend": f"{rng.uniform(0, 500):.2f}" if rng.random() > 0.1 else "0",
+            "impressions": str(rng.randint(0, 20000)),
+            "clicks": str(rng.randint(0, 400)),
+            "actions": [
+                {"action_type": "purchase", "value": str(purchases)},
+                {"action_type": "link_click", "value": "11"},
+            ],
+            "action_values": [
+                {"action_type": "omni_purchase", "value": f"{purchases * rng.uniform(20, 80):.2f}"},
+                {"action_type": "add_to_cart", "value": "99.00"},
+            ],
+        })
+    return rows
+
+
+def _naive_window(rows: list[dict], window: int) -> dict:
+    """Sum the last window rows one by one, the way the baseline aggregated them."""
+    last = rows[-window:]
+    spend = sum(float(r["spend"]) for r in last)
+    revenue = sum(float(v["value"]) for r in last for v in r["action_values"] if v["action_type"] == "omni_purchase")
+    purchases = sum(int(a["value"]) for r in last for a in r["actions"] if a["action_type"] == "purchase")
+    clicks = sum(int(r["clicks"]) for r in last)
+    impressions = sum(int(r["impressions"]) for r in last)
+    return {
+        "spend": spend,
+        "revenue": revenue,
+        "purchases": purchases,
+        "clicks": clicks,
+        "impressions": impressions,
+        "ctr": clicks / impressions * 100 if impressions else None,
+        "cpc": spend / clicks if clicks else None,
+        "roas": revenue / spend if spend else None,
+        "cpa": spend / purchases if purchases else None,
+        "cvr": purchases / clicks if clicks else None,
+    }
+
+
+@pytest.mark.parametrize("days", [1, 2, 5, 30])
+def test_trailing_windows_match_naive_sums(days):
+    rows = _insight_rows(days)
+    windows = trailing_window_metrics(parse_insight_rows(rows), (1, 3, 7, 14, 30))
+
+    assert set(windows) == {1, 3, 7, 14, 30}
+    for window, metrics in windows.items():
+        expected = _naive_window(rows, min(window, days))
+        assert metrics.keys() == expected.keys()
+        for key, value in expected.items():
+            assert metrics[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (window, key)
+
+
+def test_trailing_windows_of_no_rows_are_empty():
+    assert trailing_window_metrics(parse_insight_rows([]), (1, 7)) == {}
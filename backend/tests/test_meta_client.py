@@ -0,0 +1,67 @@
+"""The blocking and async Graph clients handle the same responses the same way."""
+import asyncio
+from typing import Callable
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services.meta_client import _graph_get, _graph_get_async, _graph_post, _graph_post_async
+
+
+def _scripted(responses: list[tuple[int, dict]]) -> tuple[list[httpx.Request], Callable[[httpx.Request], httpx.Response]]:
+    """A transport handler answering with responses in turn, and the requests it got."""
+    requests: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status, body = responses[len(requests) - 1]
+        return httpx.Response(status, json=body)
+
+    return requests, handle
+
+
+def _call(method: str, is_async: bool, handler, **kwargs) -> dict:
+    if is_async:
+        async def run() -> dict:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                call = _graph_get_async if method == "get" else _graph_post_async
+                return await call(client, "token", "act_1/insights", **kwargs)
+        return asyncio.run(run())
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        call = _graph_get if method == "get" else _graph_post
+        return call(client, "token", "act_1/insights", **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(get_settings(), "meta_rate_limit_backoff_seconds", 0)
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+@pytest.mark.parametrize("is_async", [False, True], ids=["blocking", "async"])
+def test_rate_limited_call_is_retried(method, is_async):
+    requests, handler = _scripted([
+        (400, {"error": {"code": 17, "message": "User request limit reached"}}),
+        (200, {"data": [{"id": "1"}]}),
+    ])
+
+    data = _call(method, is_async, handler, account_id="act_1")
+
+    assert data == {"data": [{"id": "1"}]}
+    assert len(requests) == 2
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+@pytest.mark.parametrize("is_async", [False, True], ids=["blocking", "async"])
+def test_other_errors_and_spent_retries_raise(method, is_async):
+    rate_limited = (400, {"error": {"code": 4, "message": "Application request limit reached"}})
+    requests, handler = _scripted([(400, {"error": {"code": 100, "message": "Invalid parameter"}})])
+    with pytest.raises(Exception, match="Invalid parameter"):
+        _call(method, is_async, handler)
+    assert len(requests) == 1
+
+    requests, handler = _scripted([rate_limited] * 3)
+    with pytest.raises(Exception, match="code=4"):
+        _call(method, is_async, handler, retries=2)
+    assert len(requests) == 3
@@ -0,0 +1,48 @@
+"""Whole-account scoring and trends against their per-audience versions (metrics.py)."""
+import pytest
+
+from app.services.metrics import (
+    compute_account_metrics,
+    compute_audience_metrics,
+    get_account_benchmarks,
+    get_account_time_based_metrics,
+    get_time_based_metrics,
+)
+from app.utils.cache import cache_clear
+
+
+def _assert_same(actual: dict, expected: dict) -> None:
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-6, abs=1e-9), key
+        else:
+            assert actual[key] == value, key
+
+
+def test_account_metrics_match_audience_metrics(db, account, synced):
+    benchmarks = get_account_benchmarks(db, account.id)
+    by_audience = compute_account_metrics(db, account.id, benchmarks)
+
+    assert by_audience
+    for audience_id in synced:
+        expected = compute_audience_metrics(db, audience_id, benchmarks, account_id=account.id)
+        if expected is None:
+            assert audience_id not in by_audience
+            continue
+        _assert_same(by_audience[audience_id], expected)
+
+
+def test_account_trends_match_audience_trends(db, account, synced):
+    trends = get_account_time_based_metrics(db, account.id)
+    cache_clear()  # get_account_time_based_metrics fills the per-audience cache entries
+
+    assert trends
+    for audience_id in synced:
+        expected = get_time_based_metrics(db, audience_id)
+        actual = trends.get(audience_id)
+        if actual is None:
+            assert expected == {"roas_slope": 0, "cpa_volatility": 0, "spend_acceleration": 1.0, "dod_roas_change": 0}
+            continue
+        for key, value in expected.items():
+            assert actual[key] == pytest.approx(value, abs=1e-4), (audience_id, key)
@@ -0,0 +1,93 @@
+"""EXPLAIN QUERY PLAN checks for the snapshot and recommendation hot queries.
+
+Each query must search the index it needs, scan no whole table, and (unless noted)
+read rows in index order instead of sorting them. The schema is the one init_db()
+builds, so models and migrations are checked together.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.database import engine
+from app.models import Audience, LatestAudienceMetric, MetricSnapshot, Recommendation
+from app.services.metrics import _latest_account_snapshots
+
+# (name, statement, index the plan must search, whether an ORDER BY sort is allowed)
+CHECKS = [
+    (
+        "latest snapshot of an audience",
+        select(LatestAudienceMetric).where(
+            LatestAudienceMetric.audience_id == "audience",
+            LatestAudienceMetric.window_days == 7,
+            LatestAudienceMetric.snapshot_date <= date.today(),
+        ),
+        "sqlite_autoindex_latest_audience_metrics_1",
+        False,
+    ),
+    (
+        "latest snapshots of an account",
+        select(_latest_account_snapshots("account", 7)),
+        "sqlite_autoindex_latest_audience_metrics_1",
+        False,
+    ),
+    (
+        "snapshot history of an audience",
+        select(MetricSnapshot)
+        .where(MetricSnapshot.audience_id == "audience", MetricSnapshot.window_days == 7)
+        .order_by(MetricSnapshot.snapshot_date.desc()),
+        "ix_metric_snapshots_audience_window_date",
+        False,
+    ),
+    (
+        "last SCALE recommendation of an audience",
+        select(Recommendation)
+        .where(Recommendation.audience_id == "audience", Recommendation.action == "SCALE")
+        .order_by(Recommendation.generated_at.desc())
+        .limit(1),
+        "ix_recommendations_audience_generated",
+        False,
+    ),
+    (
+        "last recommendation per audience",
+        select(Recommendation.audience_id, func.max(Recommendation.generated_at))
+        .where(Recommendation.audience_id.in_(["audience", "other"]))
+        .group_by(Recommendation.audience_id),
+        "ix_recommendations_audience_generated",
+        False,
+    ),
+    (
+        # Rows of several audiences are merged, so SQLite sorts them (top-N, bounded by LIMIT)
+        "latest recommendations of an account",
+        select(Recommendation)
+        .join(Audience)
+        .where(Audience.account_id == "account")
+        .order_by(Recommendation.generated_at.desc())
+        .limit(100),
+        "ix_recommendations_audience_generated",
+        True,
+    ),
+]
+
+HOT_TABLES = ("metric_snapshots", "latest_audience_metrics", "recommendations")
+
+
+def _plan(statement) -> list[str]:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+@pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN output is SQLite's")
+@pytest.mark.parametrize("statement, index, sort_allowed", [c[1:] for c in CHECKS], ids=[c[0] for c in CHECKS])
+def test_query_uses_its_index(statement, index, sort_allowed):
+    plan = _plan(statement)
+
+    assert any(f"INDEX {index}" in step for step in plan), plan
+    full_scans = [
+        step for step in plan
+        if step.startswith("SCAN ") and "INDEX" not in step and step.split()[1] in HOT_TABLES
+    ]
+    assert not full_scans, plan
+    if not sort_allowed:
+        assert not any("TEMP B-TREE" in step for step in plan), plan
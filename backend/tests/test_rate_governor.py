@@ -0,0 +1,38 @@
+"""Per-account call slots and cooldowns (rate_governor.py)."""
+import pytest
+
+from app.services.rate_governor import RateGovernor
+
+
+def test_reserve_waits_out_an_account_cooldown():
+    governor = RateGovernor(burst=3)
+    assert governor.reserve("act_1") == 0
+
+    governor.mark_rate_limited(60, account_id="act_1", code=17)
+
+    assert governor.reserve("act_1") == pytest.approx(60, abs=1)
+    # The ID with and without the act_ prefix is the same account
+    assert governor.reserve("1") == pytest.approx(60, abs=1)
+
+
+def test_account_cooldown_does_not_hold_back_other_accounts():
+    governor = RateGovernor(burst=3)
+    governor.mark_rate_limited(60, account_id="act_1", code=17)
+
+    assert governor.reserve("act_2") == 0
+
+
+def test_app_level_rate_limit_holds_back_every_account():
+    governor = RateGovernor(burst=3)
+    governor.mark_rate_limited(30, account_id="act_1", code=4)
+
+    assert governor.reserve("act_2") == pytest.approx(30, abs=1)
+
+
+def test_burst_is_spent_before_calls_are_spaced():
+    governor = RateGovernor(burst=3)
+
+    waits = [governor.reserve("act_1") for _ in range(4)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] > 0
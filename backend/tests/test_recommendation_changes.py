@@ -0,0 +1,98 @@
+"""Incremental recommendation generation (recommendation_changes.py, claude_analyzer.py)."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Audience, LatestAudienceMetric, Recommendation
+from app.services.claude_analyzer import generate_recommendations_for_account
+from app.services.effective_settings import get_effective_settings
+from app.utils.cache import cache_clear
+
+
+def _generate(db, account_id: str, **kwargs) -> dict[str, dict]:
+    cache_clear()
+    return {r["audience_id"]: r for r in generate_recommendations_for_account(db, account_id, **kwargs)}
+
+
+def _reevaluated(recommendations: dict[str, dict]) -> set[str]:
+    return {audience_id for audience_id, r in recommendations.items() if not r["carried_forward"]}
+
+
+def _content(r: dict) -> tuple:
+    return r["action"], r["scale_percentage"], r["confidence"], r["composite_score"], r["reasons"], r["risks"]
+
+
+def _backdate(db, audience_id: str, by: timedelta) -> None:
+    """Move the audience's recommendations back in time, as if generated earlier."""
+    for rec in db.query(Recommendation).filter_by(audience_id=audience_id):
+        rec.generated_at = rec.generated_at - by
+    db.commit()
+
+
+@pytest.fixture
+def first(db, account, synced) -> dict[str, dict]:
+    recommendations = _generate(db, account.id)
+    assert len(recommendations) > 10
+    assert not any(r["carried_forward"] for r in recommendations.values())
+    return recommendations
+
+
+def test_unchanged_inputs_carry_every_recommendation_forward(db, account, first):
+    second = _generate(db, account.id)
+
+    assert second.keys() == first.keys()
+    assert _reevaluated(second) == set()
+    # What is carried forward is what a fresh evaluation of the same data gives (with
+    # the history cleared, so the first run's SCALEs don't start a cooldown)
+    db.query(Recommendation).delete()
+    db.commit()
+    fresh = _generate(db, account.id, incremental=False)
+    assert {a: _content(r) for a, r in fresh.items()} == {a: _content(r) for a, r in second.items()}
+
+
+def test_only_the_changed_audience_is_reevaluated(db, account, first):
+    audience_id = next(iter(first))
+    db.query(LatestAudienceMetric).filter_by(audience_id=audience_id, window_days=1).update(
+        {LatestAudienceMetric.clicks: LatestAudienceMetric.clicks + 1}
+    )
+    db.commit()
+
+    second = _generate(db, account.id)
+
+    assert _reevaluated(second) == {audience_id}
+
+
+def test_a_new_snapshot_date_with_the_same_numbers_is_not_a_change(db, account, first):
+    db.query(LatestAudienceMetric).update({LatestAudienceMetric.snapshot_date: date.today() - timedelta(days=1)})
+    db.commit()
+
+    assert _reevaluated(_generate(db, account.id)) == set()
+
+
+def test_audience_is_reevaluated_when_its_scale_cooldown_ends(db, account, first):
+    audience_id = next(iter(first))
+    cooldown = timedelta(hours=get_effective_settings(db).scale_cooldown_hours)
+    _backdate(db, audience_id, timedelta(hours=2))
+    # A SCALE whose cooldown ended an hour ago, after the last recommendation
+    db.add(Recommendation(
+        id="scale-1", audience_id=audience_id, action="SCALE", confidence="HIGH", performance_bucket="WINNER",
+        trend_state="STABLE", generated_at=datetime.now(timezone.utc) - cooldown - timedelta(hours=1),
+    ))
+    db.commit()
+
+    assert _reevaluated(_generate(db, account.id)) == {audience_id}
+
+
+def test_audience_is_reevaluated_when_its_age_crosses_min_age_days(db, account, first):
+    audience_id = next(iter(first))
+    min_age_days = get_effective_settings(db).min_age_days
+    audience = db.get(Audience, audience_id)
+    audience.launched_at = datetime.now(timezone.utc) - timedelta(days=min_age_days, hours=1)
+    db.commit()
+    assert _reevaluated(_generate(db, account.id)) == {audience_id}  # launched_at is an input
+
+    # Its last recommendation is from a day ago, when it was one day younger
+    _backdate(db, audience_id, timedelta(days=1))
+
+    assert _reevaluated(_generate(db, account.id)) == {audience_id}
+    assert _reevaluated(_generate(db, account.id)) == set()
@@ -0,0 +1 @@
+# Developer tools: benchmarks and offline stand-ins (not imported by the app)
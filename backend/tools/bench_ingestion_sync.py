@@ -0,0 +1,110 @@
+"""Benchmark: full sync_account runs against the synthetic Graph emulator.
+
+For each account size, syncs a fresh emulated account (batch fetch mode) into a
+throwaway SQLite database and reports ad sets per second, Graph requests (retries
+included), time the rate governor spent waiting for call slots and cooldowns, and
+peak traced Python memory. tracemalloc slows the run down; pass --no-memory for
+clean throughput numbers.
+
+--pacing off gives the governor an unlimited burst so only the code is measured;
+--pacing real keeps the production call spacing. Rate-limit backoffs use --backoff
+seconds (doubling per retry) instead of the production 60s.
+
+Usage (from backend/):
+    python -m tools.bench_ingestion_sync --ad-sets 100,1000,5000,20000
+    python -m tools.bench_ingestion_sync --ad-sets 2000 --latency-ms 80 --error-rate 0.02 --pacing real
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from tools.graph_emulator import add_graph_arguments, graph_from_arguments
+
+
+def _governor_waited() -> float:
+    from app.services.rate_governor import get_governor
+
+    return sum(budget["waited_seconds"] for budget in get_governor().stats().values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ad-sets", default="100,1000,5000,20000", help="comma-separated account sizes")
+    parser.add_argument("--preset", default="last_7d")
+    parser.add_argument("--runs", type=int, default=1, help="syncs per account (later runs are incremental)")
+    parser.add_argument("--fetch", choices=("async", "blocking"), default="async")
+    parser.add_argument("--pacing", choices=("off", "real"), default="off")
+    parser.add_argument("--backoff", type=float, default=1.0, help="first rate-limit backoff in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    add_graph_arguments(parser)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_sync_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    os.environ["APP_ENV"] = "benchmark"  # no SQL echo
+    os.environ["INSIGHTS_FETCH_MODE"] = "batch"
+    os.environ["META_ASYNC_FETCH"] = str(args.fetch == "async")
+    os.environ["META_RATE_LIMIT_BACKOFF_SECONDS"] = str(args.backoff)
+    if args.pacing == "off":
+        os.environ["META_RATE_BURST"] = "1000000000"
+
+    from app.database import SessionLocal, init_db
+    from app.models import Account
+    from app.services.ingestion import sync_account
+    from app.services.sync_progress import SyncProgress
+    from app.utils.crypto import encrypt_token
+
+    init_db()
+    db = SessionLocal()
+    sizes = [int(size) for size in args.ad_sets.split(",") if size]
+
+    print(
+        f"preset={args.preset} fetch={args.fetch} pacing={args.pacing} latency={args.latency_ms}ms "
+        f"error_rate={args.error_rate} seed={args.seed}"
+    )
+    print(
+        f"{'ad_sets':>8}{'run':>5}{'seconds':>10}{'ad_sets/s':>11}{'requests':>10}"
+        f"{'errors':>8}{'waited_s':>10}{'peak_mb':>9}{'days':>9}"
+    )
+    for n, size in enumerate(sizes):
+        account_id = f"bench{n}"
+        db.add(Account(
+            id=account_id, meta_account_id=f"act_{900001 + n}", account_name=f"Synthetic {size}",
+            access_token=encrypt_token("emulator-token"),
+        ))
+        db.commit()
+        graph = graph_from_arguments(args, size)
+
+        for run in range(1, args.runs + 1):
+            progress = SyncProgress()
+            errors_before = sum(graph.errors.values())
+            waited_before = _governor_waited()
+            if not args.no_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            summary = sync_account(
+                account_id, db, date_preset=args.preset,
+                transport=graph.transport(is_async=args.fetch == "async"), progress=progress,
+            )
+            elapsed = time.perf_counter() - start
+            peak_mb = "-"
+            if not args.no_memory:
+                peak_mb = f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f}"
+                tracemalloc.stop()
+            if "error" in summary:
+                print(f"{size:>8}{run:>5}  sync failed: {summary['error']}")
+                break
+            print(
+                f"{size:>8}{run:>5}{elapsed:>10.2f}{size / elapsed:>11.0f}{progress.api_calls:>10}"
+                f"{sum(graph.errors.values()) - errors_before:>8}{_governor_waited() - waited_before:>10.1f}"
+                f"{peak_mb:>9}{summary['days_merged']:>9}"
+            )
+            for error in summary["errors"]:
+                print(f"{'':>13}{error}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
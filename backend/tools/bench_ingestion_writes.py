@@ -0,0 +1,158 @@
+"""Benchmark: per-row vs bulk audience/snapshot writes in ingestion.
+
+Runs the old write pattern (one SELECT per ad set, a flush per new audience, one
+SELECT per audience/window snapshot) against the bulk upsert path on a throwaway
+SQLite database, for a first sync (inserts) and a repeat sync (updates). Round trips
+are counted with a before_cursor_execute listener; an executemany counts as one.
+
+Usage (from backend/):
+    python -m tools.bench_ingestion_writes --ad-sets 3000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date
+
+WINDOWS = (1, 3, 7)
+
+
+def _ad_sets(prefix: str, n: int, seed: int) -> list[dict]:
+    rnd = random.Random(seed)
+    return [
+        {
+            "id": f"{prefix}{i}",
+            "name": f"Ad set {i}",
+            "campaign_id": f"c{i % 20}",
+            "daily_budget": str(rnd.randint(1000, 90000)),
+            "created_time": "2024-01-01T00:00:00+0000",
+            "targeting": {"interests": [{"id": 1}]} if i % 2 else {},
+        }
+        for i in range(n)
+    ]
+
+
+def _metrics(rnd: random.Random) -> dict:
+    spend = rnd.uniform(100, 20000)
+    revenue = spend * rnd.uniform(0.5, 4)
+    purchases = rnd.randint(0, 40)
+    clicks = rnd.randint(50, 4000)
+    impressions = clicks * rnd.randint(20, 80)
+    return {
+        "spend": spend, "revenue": revenue, "purchases": purchases,
+        "impressions": impressions, "clicks": clicks,
+        "ctr": clicks / impressions * 100, "cpc": spend / clicks, "roas": revenue / spend,
+        "cpa": spend / purchases if purchases else None, "cvr": purchases / clicks,
+    }
+
+
+def _legacy_sync(db, account_id: str, ad_sets_data: list[dict], rnd: random.Random) -> None:
+    """The pre-bulk write pattern from _do_sync (steps 2 and 4)."""
+    from app.models import Audience, MetricSnapshot
+    from app.services.ingestion import _budget_from_ad_set, _parse_launched_at, _snapshot_values
+    from app.services.meta_client import infer_audience_type
+
+    today = date.today()
+    audiences = []
+    for ad_set_data in ad_sets_data:
+        audience = db.query(Audience).filter(Audience.meta_ad_set_id == ad_set_data["id"]).first()
+        if not audience:
+            audience = Audience(
+                id=str(uuid.uuid4()),
+                account_id=account_id,
+                meta_ad_set_id=ad_set_data["id"],
+                name=ad_set_data["name"],
+                audience_type=infer_audience_type(ad_set_data),
+                launched_at=_parse_launched_at(ad_set_data),
+                current_budget=_budget_from_ad_set(ad_set_data),
+                campaign_id=ad_set_data.get("campaign_id"),
+            )
+            db.add(audience)
+            db.flush()
+        else:
+            audience.name = ad_set_data["name"]
+            audience.audience_type = infer_audience_type(ad_set_data)
+            audience.launched_at = _parse_launched_at(ad_set_data)
+            audience.current_budget = _budget_from_ad_set(ad_set_data)
+            audience.campaign_id = ad_set_data.get("campaign_id")
+        audiences.append(audience)
+
+    for audience in audiences:
+        for window_days in WINDOWS:
+            values = _snapshot_values(_metrics(rnd))
+            existing = (
+                db.query(MetricSnapshot)
+                .filter(
+                    MetricSnapshot.audience_id == audience.id,
+                    MetricSnapshot.snapshot_date == today,
+                    MetricSnapshot.window_days == window_days,
+                )
+                .first()
+            )
+            if existing:
+                for column, value in values.items():
+                    setattr(existing, column, value)
+            else:
+                db.add(MetricSnapshot(
+                    id=str(uuid.uuid4()), audience_id=audience.id, snapshot_date=today,
+                    window_days=window_days, **values,
+                ))
+    db.commit()
+
+
+def _bulk_sync(db, account_id: str, ad_sets_data: list[dict], rnd: random.Random) -> None:
+    """The current bulk write path."""
+    from app.services.ingestion import _new_summary, _upsert_audiences, _upsert_snapshots
+
+    summary = _new_summary(False)
+    _, audience_ids = _upsert_audiences(db, account_id, ad_sets_data, summary)
+    windows = {
+        audience_id: {window_days: _metrics(rnd) for window_days in WINDOWS}
+        for audience_id in audience_ids.values()
+    }
+    _upsert_snapshots(db, date.today(), windows, summary)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ad-sets", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_ingestion_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/bench.db"
+    os.environ["APP_ENV"] = "benchmark"  # no SQL echo
+
+    from sqlalchemy import event
+
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Account
+
+    init_db()
+    counter = {"n": 0}
+    event.listen(engine, "before_cursor_execute", lambda *a, **kw: counter.__setitem__("n", counter["n"] + 1))
+
+    db = SessionLocal()
+    for account_id in ("legacy", "bulk"):
+        db.add(Account(id=account_id, meta_account_id=account_id, account_name=account_id, access_token="x"))
+    db.commit()
+
+    print(f"{args.ad_sets} ad sets x {len(WINDOWS)} windows")
+    print(f"{'path':<8}{'run':<8}{'queries':>10}{'seconds':>10}")
+    for label, fn, prefix in (("legacy", _legacy_sync, "L"), ("bulk", _bulk_sync, "B")):
+        ad_sets_data = _ad_sets(prefix, args.ad_sets, args.seed)
+        for run in ("first", "repeat"):
+            rnd = random.Random(args.seed)
+            counter["n"] = 0
+            start = time.perf_counter()
+            fn(db, label, ad_sets_data, rnd)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<8}{run:<8}{counter['n']:>10}{elapsed:>10.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
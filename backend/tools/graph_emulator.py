@@ -0,0 +1,454 @@
+"""Synthetic Graph API stand-in for load-testing ingestion without spending Meta quota.
+
+SyntheticGraph makes up ad accounts of any size, deterministically from a seed: the
+same seed, account and day always give the same ad sets and insight rows. It serves
+the endpoints the batch fetch mode uses:
+
+    GET  act_<id>/adsets                       paged by cursor
+    POST / (batch)                             {ad_set_id}/insights sub-requests
+    GET  <ad_set_id>/insights
+
+Every response carries x-business-use-case-usage and x-app-usage headers computed
+from the calls made in a rolling window, so the rate governor paces itself as it
+would against Meta. An account that uses up its window quota gets error 17 until the
+window rolls over. Latency and randomly injected rate-limit errors (codes 4, 17, 32,
+on whole requests and on batch items) exercise the retry paths. Insight rows can be
+paged (--insight-page-rows) and cost time per row (--row-ms); a batch whose items
+run past --batch-budget-ms answers null for the rest, as Meta does for sub-requests
+it did not finish, which exercises adaptive batch sizing and heavy ad set splitting.
+
+In process, pass SyntheticGraph(...).transport(is_async) to sync_account (see
+tools/bench_ingestion_sync.py). As a server, point META_GRAPH_BASE_URL at it:
+
+    python -m tools.graph_emulator serve --port 8765 --ad-sets 2000
+    META_GRAPH_BASE_URL=http://127.0.0.1:8765/v18.0 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+import httpx
+
+from tools.graph_fixtures import request_period
+
+ERROR_MESSAGES = {
+    4: "Application request limit reached",
+    17: "User request limit reached",
+    32: "Page request limit reached",
+}
+
+# Ad set IDs are the account's digits followed by a zero-padded index
+INDEX_DIGITS = 7
+
+TARGETING_KINDS = ("broad", "interest", "custom", "lookalike")
+
+
+class SyntheticGraph:
+    """
+    Serves ad_sets ad sets for any act_<id>. Counts requests per endpoint in .calls
+    and injected errors per code in .errors.
+    """
+
+    def __init__(
+        self,
+        ad_sets: int = 1000,
+        seed: int = 7,
+        latency_ms: float = 0.0,
+        batch_item_ms: float = 0.0,
+        row_ms: float = 0.0,
+        batch_budget_ms: float = 0.0,
+        insight_page_rows: int = 0,
+        error_rate: float = 0.0,
+        error_codes: tuple[int, ...] = (4, 17, 32),
+        delivering_share: float = 0.85,
+        usage_quota: int = 5000,
+        usage_window_seconds: float = 60.0,
+    ):
+        self.ad_sets = ad_sets
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.batch_item_ms = batch_item_ms
+        self.row_ms = row_ms
+        self.batch_budget_ms = batch_budget_ms
+        self.insight_page_rows = insight_page_rows
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.delivering_share = delivering_share
+        self.usage_quota = usage_quota
+        self.usage_window_seconds = usage_window_seconds
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._recent_calls: dict[str, deque] = {}
+        self._profiles: dict[str, dict] = {}
+
+    def transport(self, is_async: bool = False) -> httpx.MockTransport:
+        """Transport for httpx.Client, or httpx.AsyncClient with is_async (latency is awaited)."""
+        if is_async:
+            async def handle_async(request: httpx.Request) -> httpx.Response:
+                delay, response = self._respond(request)
+                if delay:
+                    await asyncio.sleep(delay)
+                return response
+            return httpx.MockTransport(handle_async)
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._respond(request)
+        if delay:
+            time.sleep(delay)
+        return response
+
+    # ── Request routing ──────────────────────────────────────────
+
+    def _respond(self, request: httpx.Request) -> tuple[float, httpx.Response]:
+        """(latency to apply, response) for one request."""
+        path = request.url.path.strip("/").split("/")
+        path = path[1:] if path and path[0].startswith("v") and path[0][1:2].isdigit() else path
+
+        if request.method == "POST" and not path:
+            form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+            batch = json.loads(form.get("batch", "[]"))
+            self._count("batch")
+            account_key = self._account_of_batch(batch)
+            error = self._throttle(account_key)
+            if error:
+                return self._latency(len(batch)), self._error(error, account_key)
+            responses, work_ms = self._batch(batch, str(request.url).rstrip("/"))
+            return self._latency() + work_ms / 1000, self._json(responses, account_key)
+
+        params = dict(request.url.params)
+        if request.method == "GET" and len(path) == 2 and path[1] == "adsets" and path[0].startswith("act_"):
+            self._count("adsets")
+            account_key = path[0][4:]
+            error = self._throttle(account_key)
+            if error:
+                return self._latency(), self._error(error, account_key)
+            return self._latency(), self._json(self._ad_set_page(request, account_key, params), account_key)
+        if request.method == "GET" and len(path) == 2 and path[1] == "insights" and path[0].isdigit():
+            self._count("ad_set_insights")
+            account_key = path[0][:-INDEX_DIGITS]
+            error = self._throttle(account_key)
+            if error:
+                return self._latency(), self._error(error, account_key)
+            rows = self._insight_rows(path[0], params)
+            body = self._insight_page(rows, params, str(request.url))
+            return self._latency() + self.row_ms * len(rows) / 1000, self._json(body, account_key)
+        return 0.0, httpx.Response(
+            400, json={"error": {"message": f"Unsupported {request.method} /{'/'.join(path)}", "code": 100}},
+        )
+
+    # ── Endpoints ────────────────────────────────────────────────
+
+    def _batch(self, batch: list[dict], base_url: str) -> tuple[list[Optional[dict]], float]:
+        """Sub-responses (null past batch_budget_ms) and the milliseconds they took."""
+        out: list[Optional[dict]] = []
+        work_ms = 0.0
+        for item in batch:
+            if self.batch_budget_ms and work_ms >= self.batch_budget_ms:
+                out.append(None)
+                continue
+            work_ms += self.batch_item_ms
+            relative_path, _, query = item["relative_url"].partition("?")
+            ad_set_id = relative_path.split("/")[0]
+            code = self._injected_error()
+            if code:
+                body = {"error": {"message": ERROR_MESSAGES[code], "code": code}}
+                out.append({"code": 400, "body": json.dumps(body)})
+                continue
+            params = {k: v[0] for k, v in parse_qs(query).items()}
+            rows = self._insight_rows(ad_set_id, params)
+            work_ms += self.row_ms * len(rows)
+            body = self._insight_page(rows, params, f"{base_url}/{item['relative_url']}")
+            out.append({"code": 200, "body": json.dumps(body)})
+        return out, work_ms
+
+    def _ad_set_page(self, request: httpx.Request, account_key: str, params: dict) -> dict:
+        limit = int(params.get("limit", 25))
+        after = int(params.get("after", 0))
+        end = min(after + limit, self.ad_sets)
+        body = {"data": [self._ad_set(f"{account_key}{i:0{INDEX_DIGITS}d}") for i in range(after, end)]}
+        if end < self.ad_sets:
+            body["paging"] = {
+                "cursors": {"after": str(end)},
+                "next": str(request.url.copy_set_param("after", str(end))),
+            }
+        return body
+
+    def _insight_page(self, rows: list[dict], params: dict, url: str) -> dict:
+        """rows as one insights page of insight_page_rows (all of them when 0)."""
+        if not self.insight_page_rows:
+            return {"data": rows}
+        after = int(params.get("after", 0))
+        end = after + self.insight_page_rows
+        body = {"data": rows[after:end]}
+        if end < len(rows):
+            body["paging"] = {
+                "cursors": {"after": str(end)},
+                "next": str(httpx.URL(url).copy_set_param("after", str(end))),
+            }
+        return body
+
+    # ── Synthetic data ───────────────────────────────────────────
+
+    def _profile(self, ad_set_id: str) -> dict:
+        """Fixed traits of one ad set, drawn from (seed, ad set ID)."""
+        profile = self._profiles.get(ad_set_id)
+        if profile is None:
+            rnd = random.Random(f"{self.seed}:{ad_set_id}")
+            delivering = rnd.random() < self.delivering_share
+            launched = date.today() - timedelta(days=rnd.randint(1, 400))
+            # Active ad sets were last edited after launch; the rest stopped delivering
+            # (paused or archived) on their last edit, at least a couple of weeks ago
+            if delivering:
+                updated = launched + timedelta(days=rnd.randint(0, (date.today() - launched).days))
+            else:
+                launched = date.today() - timedelta(days=rnd.randint(15, 400))
+                updated = launched + timedelta(days=rnd.randint(0, (date.today() - launched).days - 14))
+            profile = {
+                "delivering": delivering,
+                "status": "ACTIVE" if delivering else rnd.choice(("PAUSED", "ARCHIVED")),
+                "launched": launched,
+                "updated": updated,
+                "daily_spend": rnd.lognormvariate(7.5, 1.0),
+                "cpm": rnd.uniform(80, 300),
+                "ctr": rnd.uniform(0.5, 3.0),
+                "cvr": rnd.uniform(0.005, 0.05),
+                "aov": rnd.uniform(600, 3000),
+                "kind": rnd.choice(TARGETING_KINDS),
+            }
+            self._profiles[ad_set_id] = profile
+        return profile
+
+    def _ad_set(self, ad_set_id: str) -> dict:
+        profile = self._profile(ad_set_id)
+        index = int(ad_set_id[-INDEX_DIGITS:])
+        kind = profile["kind"]
+        if kind == "interest":
+            targeting = {"interests": [{"id": f"600{index % 97}", "name": f"Interest {index % 97}"}]}
+        elif kind == "custom":
+            targeting = {"custom_audiences": [{"id": f"238{index % 13}", "name": "Purchasers 180d"}]}
+        elif kind == "lookalike":
+            targeting = {"custom_audiences": [{
+                "id": f"239{index % 13}", "name": "Lookalike (IN, 1%)",
+                "lookalike_spec": {"country": "IN", "ratio": 0.01},
+            }]}
+        else:
+            targeting = {}
+        return {
+            "id": ad_set_id,
+            "name": f"Ad set {index} ({kind})",
+            "campaign_id": f"{ad_set_id[:-INDEX_DIGITS]}{index // 20:0{INDEX_DIGITS}d}",
+            "daily_budget": str(int(profile["daily_spend"] * 125)),
+            "created_time": f"{profile['launched'].isoformat()}T00:00:00+0000",
+            "updated_time": f"{profile['updated'].isoformat()}T12:00:00+0000",
+            "effective_status": profile["status"],
+            "targeting": targeting,
+        }
+
+    def _insight_rows(self, ad_set_id: str, params: dict) -> list[dict]:
+        """One row per delivering day in the requested period, drawn from (seed, ad set, day)."""
+        profile = self._profile(ad_set_id)
+        since, until = request_period(params)
+        since = max(since, profile["launched"])
+        if not profile["delivering"]:
+            until = min(until, profile["updated"])
+        rows = []
+        day = since
+        while day <= until:
+            rows.append(self._row(ad_set_id, profile, day.isoformat()))
+            day += timedelta(days=1)
+        return rows
+
+    def _row(self, ad_set_id: str, profile: dict, day: str) -> dict:
+        rnd = random.Random(f"{self.seed}:{ad_set_id}:{day}")
+        spend = profile["daily_spend"] * rnd.uniform(0.6, 1.4)
+        impressions = int(spend / profile["cpm"] * 1000)
+        clicks = int(impressions * profile["ctr"] / 100 * rnd.uniform(0.7, 1.3))
+        purchases = int(clicks * profile["cvr"] * rnd.uniform(0.5, 1.5) + rnd.random())
+        revenue = purchases * profile["aov"] * rnd.uniform(0.8, 1.2)
+        row = {
+            "spend": f"{spend:.2f}",
+            "impressions": str(impressions),
+            "clicks": str(clicks),
+            "actions": [{"action_type": "link_click", "value": str(clicks)}],
+            "date_start": day,
+            "date_stop": day,
+        }
+        if impressions:
+            row["ctr"] = f"{clicks / impressions * 100:.6f}"
+        if clicks:
+            row["cpc"] = f"{spend / clicks:.6f}"
+        if purchases:
+            row["actions"].append({"action_type": "purchase", "value": str(purchases)})
+            row["action_values"] = [{"action_type": "purchase", "value": f"{revenue:.2f}"}]
+        return row
+
+    # ── Usage, throttling and errors ─────────────────────────────
+
+    def _count(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    def _account_of_batch(self, batch: list[dict]) -> str:
+        if not batch:
+            return ""
+        return batch[0]["relative_url"].split("/")[0][:-INDEX_DIGITS]
+
+    def _usage_pct(self, account_key: str) -> float:
+        return min(100.0, len(self._recent_calls.get(account_key, ())) / self.usage_quota * 100)
+
+    def _throttle(self, account_key: str) -> Optional[int]:
+        """Record the call; the error code to answer with (quota used up or injected), if any."""
+        now = time.monotonic()
+        with self._lock:
+            recent = self._recent_calls.setdefault(account_key, deque())
+            while recent and recent[0] < now - self.usage_window_seconds:
+                recent.popleft()
+            if len(recent) >= self.usage_quota:
+                self.errors[17] += 1
+                return 17
+            recent.append(now)
+        return self._injected_error()
+
+    def _injected_error(self) -> Optional[int]:
+        with self._lock:
+            if self.error_rate and self._rng.random() < self.error_rate:
+                code = self._rng.choice(self.error_codes)
+                self.errors[code] += 1
+                return code
+        return None
+
+    def _latency(self, batch_items: int = 0) -> float:
+        if not self.latency_ms and not self.batch_item_ms:
+            return 0.0
+        with self._lock:
+            jitter = self._rng.uniform(0.5, 1.5)
+        return (self.latency_ms * jitter + self.batch_item_ms * batch_items) / 1000
+
+    def _usage_headers(self, account_key: str) -> dict:
+        with self._lock:
+            pct = round(self._usage_pct(account_key), 1)
+            app_pct = round(max((self._usage_pct(key) for key in self._recent_calls), default=0.0), 1)
+        headers = {"x-app-usage": json.dumps({"call_count": app_pct, "total_cputime": app_pct, "total_time": app_pct})}
+        if account_key:
+            headers["x-business-use-case-usage"] = json.dumps({account_key: [{
+                "type": "ads_insights", "call_count": pct, "total_cputime": round(pct * 0.6, 1),
+                "total_time": round(pct * 0.8, 1), "estimated_time_to_regain_access": 0,
+            }]})
+        return headers
+
+    def _json(self, body, account_key: str) -> httpx.Response:
+        return httpx.Response(200, json=body, headers=self._usage_headers(account_key))
+
+    def _error(self, code: int, account_key: str) -> httpx.Response:
+        return httpx.Response(
+            400, json={"error": {"message": ERROR_MESSAGES[code], "code": code}},
+            headers=self._usage_headers(account_key),
+        )
+
+
+# ── CLI ──────────────────────────────────────────────────────────
+
+
+def make_server(graph: SyntheticGraph, host: str, port: int) -> ThreadingHTTPServer:
+    """HTTP/1.1 server for the emulator (keep-alive; one thread per connection).
+    TCP connections accepted are counted in graph.calls["connections"]."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            graph._count("connections")
+
+        def _dispatch(self) -> None:
+            length = int(self.headers.get("content-length") or 0)
+            request = httpx.Request(
+                self.command, f"http://{host}:{port}{self.path}",
+                headers=dict(self.headers), content=self.rfile.read(length),
+            )
+            response = graph.handle(request)
+            self.send_response(response.status_code)
+            for key, value in response.headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(response.content)
+
+        do_GET = do_POST = _dispatch
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def serve(graph: SyntheticGraph, host: str, port: int) -> None:
+    """Serve the emulator over HTTP until interrupted."""
+    server = make_server(graph, host, port)
+    print(f"Graph emulator on http://{host}:{port}/v18.0 ({graph.ad_sets} ad sets per account, seed {graph.seed})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"requests: {dict(graph.calls)}  injected errors: {dict(graph.errors)}")
+
+
+def add_graph_arguments(parser: argparse.ArgumentParser) -> None:
+    """Emulator options shared with tools/bench_ingestion_sync.py."""
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean latency per request (±50%% jitter)")
+    parser.add_argument("--batch-item-ms", type=float, default=0.0, help="extra latency per batch sub-request")
+    parser.add_argument("--row-ms", type=float, default=0.0, help="extra latency per insight row served")
+    parser.add_argument("--batch-budget-ms", type=float, default=0.0, help="batch items past this much work answer null")
+    parser.add_argument("--insight-page-rows", type=int, default=0, help="page insight rows (0: never)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests and batch items failing")
+    parser.add_argument("--error-codes", default="4,17,32", help="codes injected errors are drawn from")
+    parser.add_argument("--delivering-share", type=float, default=0.85, help="share of ad sets still active")
+    parser.add_argument("--usage-quota", type=int, default=5000, help="calls per account per usage window")
+    parser.add_argument("--usage-window", type=float, default=60.0, help="usage window in seconds")
+
+
+def graph_from_arguments(args: argparse.Namespace, ad_sets: int) -> SyntheticGraph:
+    return SyntheticGraph(
+        ad_sets=ad_sets,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        batch_item_ms=args.batch_item_ms,
+        row_ms=args.row_ms,
+        batch_budget_ms=args.batch_budget_ms,
+        insight_page_rows=args.insight_page_rows,
+        error_rate=args.error_rate,
+        error_codes=tuple(int(code) for code in args.error_codes.split(",") if code),
+        delivering_share=args.delivering_share,
+        usage_quota=args.usage_quota,
+        usage_window_seconds=args.usage_window,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_serve = sub.add_parser("serve", help="serve the emulator over HTTP")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--ad-sets", type=int, default=1000, help="ad sets per account")
+    add_graph_arguments(p_serve)
+
+    args = parser.parse_args()
+    serve(graph_from_arguments(args, args.ad_sets), args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Recorded-fixture stand-in for the Graph API endpoints used by ingestion.
+
+A fixture is one JSON file with an ad account's ad sets and its level=adset daily
+insight rows, exactly as Graph returned them, plus the date it was recorded on.
+FixtureGraph replays it through an httpx.MockTransport, so a sync can run offline
+in either fetch mode:
+
+    GET  act_<id>/adsets                       paged by cursor
+    GET  act_<id>/insights?level=adset         paged by cursor
+    POST act_<id>/insights                     async report run
+    GET  <report_run_id>, <report_run_id>/insights
+    POST / (batch)                             {ad_set_id}/insights sub-requests
+    GET  <ad_set_id>/insights
+
+Row dates are shifted by (today - recorded_on), so the recorded "yesterday" is
+always yesterday and date_preset / time_range filtering behaves like the live API.
+
+Usage (from backend/):
+    python -m tools.graph_fixtures replay --mode account --preset last_30d
+    python -m tools.graph_fixtures record --account act_123 --token <token> --out fixture.json
+"""
+import argparse
+import json
+import os
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+import httpx
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "graph_account.json"
+
+USAGE_HEADERS = {"x-app-usage": json.dumps({"call_count": 1, "total_cputime": 1, "total_time": 1})}
+
+# Polls a report run answers "Job Running" before it completes
+REPORT_POLLS_BEFORE_DONE = 1
+
+
+def request_period(params: dict) -> tuple[date, date]:
+    """(since, until) asked for by a request's time_range or date_preset (ending yesterday)."""
+    from app.services.meta_client import PRESET_DAYS
+
+    if params.get("time_range"):
+        time_range = json.loads(params["time_range"])
+        return date.fromisoformat(time_range["since"]), date.fromisoformat(time_range["until"])
+    days = PRESET_DAYS.get(params.get("date_preset", "last_30d"), 30)
+    return date.today() - timedelta(days=days), date.today() - timedelta(days=1)
+
+
+def _shift(day: str, offset: timedelta) -> str:
+    return (date.fromisoformat(day) + offset).isoformat()
+
+
+class FixtureGraph:
+    """Replays one recorded account. Counts requests per endpoint in .calls."""
+
+    def __init__(self, fixture_path: Path = DEFAULT_FIXTURE, page_size: Optional[int] = None):
+        fixture = json.loads(Path(fixture_path).read_text())
+        self.account_id = fixture["account_id"]
+        self.ad_sets = fixture["ad_sets"]
+        self.page_size = page_size
+        offset = date.today() - date.fromisoformat(fixture["recorded_on"])
+        self.rows = [
+            {**row, "date_start": _shift(row["date_start"], offset), "date_stop": _shift(row["date_stop"], offset)}
+            for row in fixture["insights"]
+        ]
+        self.calls: Counter = Counter()
+        self._report_runs: dict[str, dict] = {}
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport for httpx.Client / httpx.AsyncClient (MockTransport serves both)."""
+        return httpx.MockTransport(self.handle)
+
+    # ── Request routing ──────────────────────────────────────────
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.strip("/").split("/")
+        path = path[1:] if path and path[0].startswith("v") and path[0][1:2].isdigit() else path
+        if request.method == "POST":
+            form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+            if not path:
+                self.calls["batch"] += 1
+                return self._json(self._batch(json.loads(form["batch"])))
+            if len(path) == 2 and path[1] == "insights":
+                self.calls["report_run"] += 1
+                return self._json(self._start_report(form))
+            return self._error(f"Unsupported POST /{'/'.join(path)}")
+
+        params = dict(request.url.params)
+        if len(path) == 2 and path[1] == "adsets":
+            self.calls["adsets"] += 1
+            return self._json(self._page(request, self.ad_sets, params))
+        if len(path) == 2 and path[1] == "insights":
+            if path[0].startswith("act_"):
+                self.calls["account_insights"] += 1
+                return self._json(self._page(request, self._filter(self.rows, params), params))
+            if path[0] in self._report_runs:
+                self.calls["report_insights"] += 1
+                run = self._report_runs[path[0]]
+                return self._json(self._page(request, self._filter(self.rows, run["params"]), params))
+            self.calls["ad_set_insights"] += 1
+            return self._json({"data": self._ad_set_rows(path[0], params)})
+        if len(path) == 1 and path[0] in self._report_runs:
+            self.calls["report_status"] += 1
+            return self._json(self._poll_report(path[0]))
+        return self._error(f"Unknown path /{'/'.join(path)}")
+
+    # ── Endpoints ────────────────────────────────────────────────
+
+    def _batch(self, batch: list[dict]) -> list[dict]:
+        out = []
+        for item in batch:
+            relative_path, _, query = item["relative_url"].partition("?")
+            params = {k: v[0] for k, v in parse_qs(query).items()}
+            rows = self._ad_set_rows(relative_path.split("/")[0], params)
+            out.append({"code": 200, "body": json.dumps({"data": rows})})
+        return out
+
+    def _start_report(self, params: dict) -> dict:
+        report_run_id = f"report_{len(self._report_runs) + 1}"
+        self._report_runs[report_run_id] = {"params": params, "polls": 0}
+        return {"report_run_id": report_run_id}
+
+    def _poll_report(self, report_run_id: str) -> dict:
+        run = self._report_runs[report_run_id]
+        run["polls"] += 1
+        done = run["polls"] > REPORT_POLLS_BEFORE_DONE
+        return {
+            "id": report_run_id,
+            "async_status": "Job Completed" if done else "Job Running",
+            "async_percent_completion": 100 if done else 50,
+        }
+
+    def _ad_set_rows(self, ad_set_id: str, params: dict) -> list[dict]:
+        rows = [r for r in self._filter(self.rows, params) if r["adset_id"] == ad_set_id]
+        return [{k: v for k, v in r.items() if k != "adset_id"} for r in rows]
+
+    # ── Helpers ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _filter(rows: list[dict], params: dict) -> list[dict]:
+        """Rows inside the request's time_range / date_preset (ending yesterday)."""
+        since, until = request_period(params)
+        return [r for r in rows if since.isoformat() <= r["date_start"] <= until.isoformat()]
+
+    def _page(self, request: httpx.Request, items: list, params: dict) -> dict:
+        limit = self.page_size or int(params.get("limit", 25))
+        after = int(params.get("after", 0))
+        body = {"data": items[after : after + limit]}
+        if after + limit < len(items):
+            body["paging"] = {
+                "cursors": {"after": str(after + limit)},
+                "next": str(request.url.copy_set_param("after", str(after + limit))),
+            }
+        return body
+
+    @staticmethod
+    def _json(body) -> httpx.Response:
+        return httpx.Response(200, json=body, headers=USAGE_HEADERS)
+
+    @staticmethod
+    def _error(message: str) -> httpx.Response:
+        return httpx.Response(400, json={"error": {"message": message, "code": 100}})
+
+
+# ── CLI ──────────────────────────────────────────────────────────
+
+
+def replay(fixture_path: Path, mode: str, date_preset: str, runs: int, page_size: Optional[int]) -> None:
+    """Sync the fixture account into a throwaway SQLite DB and print each run's summary."""
+    tmp_dir = tempfile.mkdtemp(prefix="graph_fixtures_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp_dir}/replay.db"
+    os.environ["APP_ENV"] = "fixtures"
+    os.environ["INSIGHTS_FETCH_MODE"] = mode
+    os.environ["ASYNC_REPORT_POLL_SECONDS"] = "0"
+
+    from app.database import SessionLocal, init_db
+    from app.models import Account, DailyInsight
+    from app.services.ingestion import sync_account
+    from app.utils.crypto import encrypt_token
+
+    graph = FixtureGraph(fixture_path, page_size=page_size)
+    init_db()
+    db = SessionLocal()
+    db.add(Account(
+        id="fixture", meta_account_id=graph.account_id, account_name="Fixture account",
+        access_token=encrypt_token("fixture-token"),
+    ))
+    db.commit()
+
+    for run in range(1, runs + 1):
+        graph.calls.clear()
+        summary = sync_account("fixture", db, date_preset=date_preset, transport=graph.transport())
+        print(f"run {run}: {json.dumps(summary)}")
+        print(f"  requests: {dict(graph.calls)}")
+    print(f"daily_insights rows: {db.query(DailyInsight).count()} (fixture rows: {len(graph.rows)})")
+    db.close()
+
+
+def record(account_id: str, access_token: str, date_preset: str, out: Path) -> None:
+    """Record an account's ad sets and level=adset daily insights from the live API."""
+    from app.services.meta_client import (
+        _account_insight_params,
+        _ensure_act_prefix,
+        _get_all_pages,
+        get_ad_sets,
+    )
+
+    account_id = _ensure_act_prefix(account_id)
+    with httpx.Client() as client:
+        ad_sets = get_ad_sets(client, access_token, account_id)
+        rows = _get_all_pages(
+            client, access_token, f"{account_id}/insights",
+            _account_insight_params(date_preset), account_id=account_id,
+        )
+    fixture = {
+        "account_id": account_id,
+        "recorded_on": date.today().isoformat(),
+        "ad_sets": ad_sets,
+        "insights": rows,
+    }
+    out.write_text(json.dumps(fixture, indent=1))
+    print(f"Recorded {len(ad_sets)} ad sets and {len(rows)} insight rows to {out}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_replay = sub.add_parser("replay", help="sync the fixture account offline")
+    p_replay.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    p_replay.add_argument("--mode", choices=("batch", "account"), default="account")
+    p_replay.add_argument("--preset", default="last_30d")
+    p_replay.add_argument("--runs", type=int, default=2, help="repeat syncs (later runs are incremental)")
+    p_replay.add_argument("--page-size", type=int, default=None, help="force small pages to exercise cursors")
+
+    p_record = sub.add_parser("record", help="record a fixture from the live Graph API")
+    p_record.add_argument("--account", required=True)
+    p_record.add_argument("--token", required=True)
+    p_record.add_argument("--preset", default="last_30d")
+    p_record.add_argument("--out", type=Path, default=DEFAULT_FIXTURE)
+
+    args = parser.parse_args()
+    if args.command == "replay":
+        replay(args.fixture, args.mode, args.preset, args.runs, args.page_size)
+    else:
+        record(args.account, args.token, args.preset, args.out)
+
+
+if __name__ == "__main__":
+    main()
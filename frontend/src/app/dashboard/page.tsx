@@ -5,7 +5,7 @@ import { useSearchParams } from "next/navigation";
 import Link from "next/link";
 import { Nav } from "@/components/nav";
 import { RecommendationBadge } from "@/components/recommendation-badge";
-import { api, type Account, type Recommendation, type SyncStatus } from "@/lib/api";
+import { api, waitForSyncJob, type Account, type Recommendation, type SyncJob, type SyncStatus, type SyncSummary } from "@/lib/api";
 
 export default function DashboardPage() {
   return (
@@ -26,7 +26,8 @@ function DashboardContent() {
   const [syncing, setSyncing] = useState(false);
   const [generating, setGenerating] = useState(false);
   const [expandedId, setExpandedId] = useState<string | null>(null);
-  const [syncResult, setSyncResult] = useState<{ audiences_created: number; audiences_updated: number; snapshots_created: number; errors: string[] } | null>(null);
+  const [syncResult, setSyncResult] = useState<SyncSummary | null>(null);
+  const [syncJob, setSyncJob] = useState<SyncJob | null>(null);
   const [errorMsg, setErrorMsg] = useState<string | null>(null);
   const [datePreset, setDatePreset] = useState("last_7d");
   const [syncStatus, setSyncStatus] = useState<SyncStatus | null>(null);
@@ -83,9 +84,11 @@ function DashboardContent() {
     if (!selectedAccountId) return;
     setSyncing(true);
     setSyncResult(null);
+    setSyncJob(null);
     setErrorMsg(null);
     api
       .syncAccount(selectedAccountId, datePreset)
+      .then((job) => waitForSyncJob(job.id, setSyncJob))
       .then((result) => {
         setSyncResult(result);
         if (result.errors?.length) {
@@ -95,7 +98,10 @@ function DashboardContent() {
         loadSyncStatus();
       })
       .catch((e) => setErrorMsg(`Sync failed: ${e.message}`))
-      .finally(() => setSyncing(false));
+      .finally(() => {
+        setSyncing(false);
+        setSyncJob(null);
+      });
   };
 
   const handleGenerate = () => {
@@ -163,7 +169,11 @@ function DashboardContent() {
             disabled={!selectedAccountId || syncing}
             className="rounded-lg bg-secondary px-4 py-2 text-sm font-medium text-secondary-foreground hover:bg-secondary/80 disabled:opacity-50"
           >
-            {syncing ? "Syncing…" : "Sync now"}
+            {syncing
+              ? syncJob?.status === "running" && syncJob.chunks_total > 0
+                ? `Syncing… ${syncJob.chunks_done}/${syncJob.chunks_total}`
+                : "Syncing…"
+              : "Sync now"}
           </button>
           <button
             onClick={handleGenerate}
@@ -25,15 +25,16 @@ export const api = {
   getRecommendations: (accountId: string) =>
     fetchApi<Recommendation[]>(`/api/recommendations?account_id=${encodeURIComponent(accountId)}`),
   generateRecommendations: (accountId: string) =>
-    fetchApi<{ recommendations: Recommendation[]; count: number }>(
+    fetchApi<{ recommendations: Recommendation[]; count: number; carried_forward: number }>(
       `/api/recommendations/generate?account_id=${encodeURIComponent(accountId)}`,
       { method: "POST" }
     ),
   syncAccount: (accountId: string, datePreset: string = "last_7d") =>
-    fetchApi<{ audiences_created: number; audiences_updated: number; snapshots_created: number; errors: string[] }>(
+    fetchApi<SyncJob & { attached: boolean }>(
       `/api/ingestion/sync/${accountId}?date_preset=${encodeURIComponent(datePreset)}`,
       { method: "POST" }
     ),
+  getSyncJob: (jobId: string) => fetchApi<SyncJob>(`/api/ingestion/jobs/${jobId}`),
   getSettings: () => fetchApi<SettingsResponse>("/api/settings"),
   updateSettings: (settings: Partial<SettingsResponse>) =>
     fetchApi<SettingsResponse>("/api/settings", {
@@ -46,6 +47,21 @@ export const api = {
 
 export const metaLoginUrl = () => `${API_BASE}/api/auth/meta/login`;
 
+/** Poll a sync job until it finishes; resolves with its summary, rejects if it failed. */
+export async function waitForSyncJob(
+  jobId: string,
+  onProgress?: (job: SyncJob) => void,
+  intervalMs: number = 2000
+): Promise<SyncSummary> {
+  for (;;) {
+    const job = await api.getSyncJob(jobId);
+    onProgress?.(job);
+    if (job.status === "succeeded" && job.result) return job.result;
+    if (job.status === "failed") throw new Error(job.error || "Sync failed");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 // Types used by api (import from types in components)
 export type Account = {
   id: string;
@@ -86,6 +102,7 @@ export type Recommendation = {
   risks: string[] | null;
   metrics_snapshot: Record<string, unknown> | null;
   generated_at: string;
+  carried_forward?: boolean; // generate: unchanged audience, previous recommendation returned
 };
 
 export type SyncStatus = {
@@ -96,6 +113,37 @@ export type SyncStatus = {
   can_generate: boolean;
 };
 
+export type SyncSummary = {
+  mode: string;
+  audiences_created: number;
+  audiences_updated: number;
+  audiences_unchanged: number;
+  ad_sets_idle: number;
+  ad_sets_resumed: number;
+  priority_tiers: Record<"high" | "medium" | "low", { ad_sets: number; fetched: number }>;
+  priority_tier_covered: "high" | "medium" | "low" | null;
+  sync_run_id?: string;
+  snapshots_created: number;
+  days_merged: number;
+  errors: string[];
+};
+
+export type SyncJob = {
+  id: string;
+  account_id: string;
+  date_preset: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  stage: string;
+  chunks_total: number;
+  chunks_done: number;
+  api_calls: number;
+  result: SyncSummary | null;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+};
+
 export type SettingsResponse = {
   min_spend: number;
   min_purchases: number;